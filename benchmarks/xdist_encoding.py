@@ -0,0 +1,63 @@
+"""Compare xdist worker measurement encodings.
+
+Measures the worker side (encode + execnet serialization) and the controller side
+(execnet deserialization + merge) of the packed encoding used by
+``pytest_durations.xdist`` against sending the plain nested dict.
+
+Usage::
+
+    python benchmarks/xdist_encoding.py [--workers 8] [--samples 500000] [--keys 5000]
+"""
+import random
+import sys
+from argparse import ArgumentParser
+from time import perf_counter
+
+import execnet
+
+from pytest_durations.types import Category
+from pytest_durations.xdist import dump_measurements, load_measurements, merge_measurements
+
+
+def make_measurements(samples: int, keys: int) -> dict[str, dict[str, list[float]]]:
+    """Return measurements with the given number of samples spread over keys of every category."""
+    rng = random.Random(samples)
+    categories = list(Category)
+    measurements: dict[str, dict[str, list[float]]] = {category: {} for category in categories}
+    for idx in range(samples):
+        category = categories[idx % len(categories)]
+        key = f"tests/test_module_{idx % keys // 50}.py::test_function_{idx % keys}"
+        measurements[category].setdefault(key, []).append(rng.random())
+    return measurements
+
+
+def run(name: str, workers: list, encode, decode) -> None:
+    """Time worker side encoding and controller side merging of every worker payload."""
+    started = perf_counter()
+    payloads = [execnet.dumps(encode(measurements)) for measurements in workers]
+    encoded = perf_counter()
+    destination: dict[str, dict[str, list[float]]] = {category: {} for category in Category}
+    for payload in payloads:
+        decode(execnet.loads(payload), destination)
+    merged = perf_counter()
+    size = sum(map(len, payloads))
+    sys.stdout.write(
+        f"{name:<8} worker {encoded - started:8.3f}s  controller {merged - encoded:8.3f}s"
+        f"  total {merged - started:8.3f}s  wire {size / 2**20:8.1f} MiB\n",
+    )
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--samples", type=int, default=500_000, help="Samples per worker")
+    parser.add_argument("--keys", type=int, default=5_000, help="Keys per worker")
+    args = parser.parse_args()
+    workers = [make_measurements(args.samples, args.keys) for _ in range(args.workers)]
+    run("dict", workers, encode=lambda measurements: measurements, decode=merge_measurements)
+    run("packed", workers, encode=dump_measurements, decode=load_measurements)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,10 @@
 """Pytest plugin package to measure fixture and test durations."""
 
-from pytest_durations.options import pytest_addoption, pytest_configure  # noqa: F401
+from pytest_durations.options import (  # noqa: F401
+    pytest_addoption,
+    pytest_collection_modifyitems,
+    pytest_configure,
+    pytest_load_initial_conftests,
+)
 
 __version__ = "1.9.0"
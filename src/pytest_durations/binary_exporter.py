@@ -0,0 +1,203 @@
+"""Binary columnar export for pytest-durations raw timing samples.
+
+File layout (all integers little-endian)::
+
+    header   magic (8 bytes), version (u16), compression (u8), padding (u8),
+             index offset (u64), index length (u64)
+    blocks   one block of packed float64 samples (seconds) per category/key,
+             compressed separately when compression is enabled
+    index    UTF-8 JSON with the key dictionary and per-key block offsets
+
+Every block is addressed by the index, so a reader only has to map the file and
+decode the blocks it is interested in.
+"""
+from __future__ import annotations
+
+import json
+import lzma
+import mmap
+import os
+import struct
+import zlib
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from pytest_durations.reporting import TimeValuesT
+from pytest_durations.types import Compression
+
+if TYPE_CHECKING:
+    import typing
+    from collections.abc import Callable, Iterator
+    from types import TracebackType
+
+    from pytest_durations.typing import CategoryMeasurementsT, CategoryT, DurationListT, FunctionKeyT
+
+MAGIC = b"PTDURBIN"
+VERSION = 1
+
+_HEADER = struct.Struct("<8sHBxQQ")
+_SAMPLE_SIZE = struct.calcsize("<d")
+_COMPRESSION_CODES: dict[Compression, int] = {Compression.NONE: 0, Compression.ZLIB: 1, Compression.LZMA: 2}
+_COMPRESSORS: dict[int, Callable[[bytes], bytes]] = {0: bytes, 1: zlib.compress, 2: lzma.compress}
+_DECOMPRESSORS: dict[int, Callable[[bytes], bytes]] = {0: bytes, 1: zlib.decompress, 2: lzma.decompress}
+
+
+def export_binary(
+    measurements: CategoryMeasurementsT,
+    filename: str,
+    compression: Compression = Compression.NONE,
+) -> None:
+    """Export raw timing samples to a binary columnar file.
+
+    :param measurements: Mapping of categories to name → duration list.
+    :param filename: Output path.
+    :param compression: Per-block compression codec.
+    """
+    code = _COMPRESSION_CODES[compression]
+    compress = _COMPRESSORS[code]
+    keys: dict[FunctionKeyT, int] = {}
+    categories: dict[str, list[list[int]]] = {}
+
+    with Path(filename).open("wb") as fp:
+        fp.write(bytes(_HEADER.size))
+        offset = _HEADER.size
+        for category, category_measurements in measurements.items():
+            entries = categories[str(category)] = []
+            for name, times in category_measurements.items():
+                block = compress(pack_samples(times))
+                fp.write(block)
+                key_idx = keys.setdefault(name, len(keys))
+                entries.append([key_idx, offset, len(block), len(times)])
+                offset += len(block)
+        index = json.dumps({"keys": list(keys), "categories": categories}, ensure_ascii=False).encode()
+        fp.write(index)
+        fp.seek(0)
+        fp.write(_HEADER.pack(MAGIC, VERSION, code, offset, len(index)))
+
+
+def load_binary(filename: str) -> CategoryMeasurementsT:
+    """Load every raw timing sample from a binary export."""
+    with BinaryMeasurements(filename) as reader:
+        return {
+            category: {name: list(reader.samples(category, name)) for name in reader.names(category)}
+            for category in reader.categories()
+        }
+
+
+def is_binary_export(filename: str) -> bool:
+    """Return true if a file starts with the binary export signature."""
+    with Path(filename).open("rb") as fp:
+        return fp.read(len(MAGIC)) == MAGIC
+
+
+class BinaryMeasurements:
+    """Memory-mapped reader of a binary export file.
+
+    Only the index is decoded on open; sample blocks are decoded on demand. Files which are not binary exports
+    of this version, or whose index or blocks are corrupt, raise :class:`ValueError`.
+    """
+
+    _decompress: Callable[[bytes], bytes]
+    _blocks: dict[CategoryT, dict[FunctionKeyT, tuple[int, int, int]]]
+
+    def __init__(self, filename: str):
+        self._filename = filename
+        with Path(filename).open("rb") as fp:
+            if os.fstat(fp.fileno()).st_size < _HEADER.size:
+                msg = f'"{filename}" is not a pytest-durations binary export (version {VERSION}): truncated header'
+                raise ValueError(msg)
+            self._mmap = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._read_index()
+        except ValueError as exc:
+            self._mmap.close()
+            msg = f'"{filename}" is not a pytest-durations binary export (version {VERSION}): {exc}'
+            raise ValueError(msg) from exc
+
+    def _read_index(self) -> None:
+        """Decode the header and the index, checking that the index and every block lie within the file."""
+        magic, version, code, index_offset, index_length = _HEADER.unpack_from(self._mmap)
+        if magic != MAGIC or version != VERSION:
+            msg = "unknown signature"
+            raise ValueError(msg)
+        if code not in _DECOMPRESSORS:
+            msg = f"unknown compression code {code}"
+            raise ValueError(msg)
+        if not _HEADER.size <= index_offset <= index_offset + index_length <= len(self._mmap):
+            msg = "index out of bounds"
+            raise ValueError(msg)
+        try:
+            index = json.loads(self._mmap[index_offset:index_offset + index_length])
+            keys = index["keys"]
+            self._blocks = {
+                category: {keys[key_idx]: (offset, length, count) for key_idx, offset, length, count in entries}
+                for category, entries in index["categories"].items()
+            }
+        except (AttributeError, LookupError, TypeError, ValueError) as exc:
+            msg = f"malformed index ({exc!r})"
+            raise ValueError(msg) from exc
+        for category_blocks in self._blocks.values():
+            for offset, length, count in category_blocks.values():
+                if not all(isinstance(value, int) for value in (offset, length, count)):
+                    msg = "malformed block entry"
+                    raise ValueError(msg)
+                if not _HEADER.size <= offset <= offset + length <= index_offset or count < 0:
+                    msg = "block out of bounds"
+                    raise ValueError(msg)
+        self._decompress = _DECOMPRESSORS[code]
+
+    def __enter__(self) -> typing.Self:
+        """Return the reader itself."""
+        return self
+
+    def __exit__(
+            self,
+            exc_type: type[BaseException] | None,
+            exc_val: BaseException | None,
+            exc_tb: TracebackType | None,
+    ) -> None:
+        """Release the memory map."""
+        self.close()
+
+    def close(self) -> None:
+        """Release the memory map."""
+        self._mmap.close()
+
+    def categories(self) -> Iterator[CategoryT]:
+        """Return exported categories."""
+        return iter(self._blocks)
+
+    def names(self, category: CategoryT) -> Iterator[FunctionKeyT]:
+        """Return exported keys of a category."""
+        return iter(self._blocks.get(category, ()))
+
+    def count(self, category: CategoryT, name: FunctionKeyT) -> int:
+        """Return the number of samples of a key without decoding them."""
+        return self._blocks[category][name][2]
+
+    def samples(self, category: CategoryT, name: FunctionKeyT) -> tuple[float, ...]:
+        """Decode samples of a single key."""
+        offset, length, count = self._blocks[category][name]
+        try:
+            data = self._decompress(self._mmap[offset:offset + length])
+        except (zlib.error, lzma.LZMAError) as exc:
+            msg = f'"{self._filename}": corrupt samples block of {name} ({exc})'
+            raise ValueError(msg) from exc
+        if len(data) != count * _SAMPLE_SIZE:
+            msg = f'"{self._filename}": corrupt samples block of {name} ({len(data)} bytes for {count} samples)'
+            raise ValueError(msg)
+        return unpack_samples(data)
+
+    def stats(self, category: CategoryT, name: FunctionKeyT) -> TimeValuesT:
+        """Return aggregated stats of a single key."""
+        return TimeValuesT.from_times(name=name, times=self.samples(category, name))
+
+
+def pack_samples(times: DurationListT) -> bytes:
+    """Pack samples into little-endian float64 bytes."""
+    return struct.pack(f"<{len(times)}d", *times)
+
+
+def unpack_samples(data: bytes) -> tuple[float, ...]:
+    """Unpack little-endian float64 bytes into samples."""
+    return struct.unpack(f"<{len(data) // _SAMPLE_SIZE}d", data)
@@ -0,0 +1,146 @@
+"""Per-test duration budgets of test phases, set by a marker or per directory in the ini file."""
+from __future__ import annotations
+
+import math
+import posixpath
+from typing import TYPE_CHECKING, NamedTuple
+
+import pytest
+
+from pytest_durations.options import BUDGET_INI, BUDGET_MARKER
+from pytest_durations.types import BudgetAction, Category
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping, Sequence
+
+    from _pytest.nodes import Item
+    from _pytest.reports import TestReport
+
+    from pytest_durations.typing import CategoryT, FunctionKeyT
+
+# test phases which can have a budget
+BUDGET_PHASES: dict[str, CategoryT] = {
+    "setup": Category.TEST_SETUP,
+    "call": Category.TEST_CALL,
+    "teardown": Category.TEST_TEARDOWN,
+}
+PHASE_NAMES: dict[CategoryT, str] = {category: phase for phase, category in BUDGET_PHASES.items()}
+
+
+class DurationBudgetWarning(pytest.PytestWarning):
+    """Warning issued when a test phase exceeds its duration budget."""
+
+
+class BudgetViolationT(NamedTuple):
+    """Test phase which took longer than its budget."""
+
+    category: CategoryT  # Measurement category of the phase
+    key: FunctionKeyT    # Test key
+    duration: float      # Measured duration in seconds
+    budget: float        # Duration budget in seconds
+
+    @property
+    def overrun(self) -> float:
+        """Return time spent over the budget in seconds."""
+        return self.duration - self.budget
+
+    @property
+    def message(self) -> str:
+        """Return a human readable description."""
+        return (
+            f"{PHASE_NAMES[self.category]} took {self.duration:.3f}s,"
+            f" exceeding its duration budget of {self.budget:.3f}s"
+        )
+
+
+if TYPE_CHECKING:
+    PhaseBudgetsT = dict[CategoryT, float]
+    DirectoryBudgetsT = list[tuple[str, PhaseBudgetsT]]
+
+
+def parse_budgets(phases: Mapping[str, object], origin: str) -> PhaseBudgetsT:
+    """Validate budgets in seconds by test phase name.
+
+    :param phases: Mapping of phase names to budgets.
+    :param origin: Description of the budgets source for error messages.
+    :return: Mapping of measurement categories to budgets in seconds.
+    """
+    budgets = {}
+    for phase, value in phases.items():
+        if phase not in BUDGET_PHASES:
+            message = f"{origin}: unknown phase {phase!r}; choose from: {', '.join(BUDGET_PHASES)}"
+            raise pytest.UsageError(message)
+        try:
+            budget = float(value)
+        except (TypeError, ValueError):
+            budget = math.nan
+        if not math.isfinite(budget) or budget < 0:
+            message = f"{origin}: invalid {phase} budget {value!r}; use a non-negative number of seconds"
+            raise pytest.UsageError(message)
+        budgets[BUDGET_PHASES[phase]] = budget
+    return budgets
+
+
+def parse_directory_budgets(lines: Iterable[str]) -> DirectoryBudgetsT:
+    """Parse ini lines of a directory followed by PHASE=SECONDS pairs, the most specific directory first."""
+    result = []
+    for line in lines:
+        directory, *pairs = line.split()
+        phases = dict(pair.partition("=")[::2] for pair in pairs)
+        directory = posixpath.normpath(directory)
+        budgets = parse_budgets(phases, origin=f"{BUDGET_INI} line {line!r}")
+        result.append(("" if directory == "." else directory, budgets))
+    return sorted(result, key=lambda entry: len(entry[0]), reverse=True)
+
+
+def get_item_budgets(
+    items: Sequence[Item],
+    directory_budgets: DirectoryBudgetsT,
+) -> dict[CategoryT, dict[FunctionKeyT, float]]:
+    """Resolve budgets of every item, the closest marker overrides the budgets of its directory by phase.
+
+    :param items: Collected test items.
+    :param directory_budgets: Directory budgets returned by :func:`parse_directory_budgets`.
+    :return: Mapping of measurement categories to budgets in seconds by test key.
+    """
+    budgets: dict[CategoryT, dict[FunctionKeyT, float]] = {category: {} for category in BUDGET_PHASES.values()}
+    for item in items:
+        path = item.nodeid.partition("::")[0]
+        item_budgets = next(
+            (
+                phase_budgets
+                for directory, phase_budgets in directory_budgets
+                if not directory or path == directory or path.startswith(f"{directory}/")
+            ),
+            {},
+        )
+        marker = item.get_closest_marker(BUDGET_MARKER)
+        if marker is not None:
+            origin = f"{BUDGET_MARKER} marker of {item.nodeid}"
+            item_budgets = {**item_budgets, **parse_budgets(marker.kwargs, origin=origin)}
+        for category, budget in item_budgets.items():
+            budgets[category][item.nodeid] = budget
+    return budgets
+
+
+def get_budget_action(violation: BudgetViolationT, action: BudgetAction) -> BudgetAction:
+    """Return the action applied to a violation, teardown overruns are only warned about instead of xfailed.
+
+    A test is reported as passed before its teardown, so it cannot be xfailed anymore.
+    """
+    if action is BudgetAction.XFAIL and violation.category == Category.TEST_TEARDOWN:
+        return BudgetAction.WARN
+    return action
+
+
+def enforce_budget(report: TestReport, violation: BudgetViolationT, action: BudgetAction) -> None:
+    """Turn the passed report of a phase over its budget into an xfail or a failure, as requested."""
+    if not report.passed:
+        return
+    action = get_budget_action(violation, action=action)
+    if action is BudgetAction.FAIL:
+        report.outcome = "failed"
+        report.longrepr = violation.message
+    elif action is BudgetAction.XFAIL:
+        report.outcome = "skipped"
+        report.wasxfail = violation.message
@@ -0,0 +1,232 @@
+"""Command line interface to work with pytest-durations data outside of pytest."""
+from __future__ import annotations
+
+import shutil
+import sqlite3
+import sys
+from argparse import ArgumentParser, ArgumentTypeError
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING
+
+from pytest_durations.binary_exporter import is_binary_export, load_binary
+from pytest_durations.database import DEFAULT_TREND_RUNS, get_trends
+from pytest_durations.json_exporter import load_json_measurements
+from pytest_durations.options import (
+    DEFAULT_DURATIONS,
+    DEFAULT_DURATIONS_MIN,
+    DEFAULT_GROUP_BY,
+    DEFAULT_SHOW_SECTIONS,
+    DEFAULT_TIME_FORMAT,
+)
+from pytest_durations.reporting import (
+    ReportOptionsT,
+    get_max_duration,
+    get_report_sections,
+    get_table_lines,
+    get_table_widths,
+    resolve_time_format,
+)
+from pytest_durations.types import (
+    CATEGORY_NAMES,
+    COLD_COLUMNS,
+    COMPARE_COLUMNS,
+    DEFAULT_COLUMNS,
+    PATH_GROUP_BY_PREFIX,
+    TREND_COLUMNS,
+    Category,
+    GroupBy,
+    MarkerGroupBy,
+    PathGroupBy,
+    TimeFormat,
+    parse_categories,
+    parse_columns,
+    parse_group_by,
+)
+from pytest_durations.xdist import merge_measurements
+
+if TYPE_CHECKING:
+    from argparse import Namespace
+    from collections.abc import Iterable, Sequence
+
+    from pytest_durations.typing import CategoryMeasurementsT
+
+# columns filled from data of the pytest session only: previous runs, a baseline or cold samples
+_SESSION_COLUMNS = (*TREND_COLUMNS, *COMPARE_COLUMNS, *COLD_COLUMNS)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Entry point of the ``pytest-durations`` console script."""
+    parser = _get_parser()
+    args = parser.parse_args(argv)
+    return args.command(args)
+
+
+def _get_parser() -> ArgumentParser:
+    parser = ArgumentParser(prog="pytest-durations", description=__doc__)
+    subparsers = parser.add_subparsers(required=True, metavar="COMMAND")
+
+    trend = subparsers.add_parser("trend", help="Show per-run durations of a test or fixture from a history database.")
+    trend.set_defaults(command=_trend)
+    trend.add_argument("database", metavar="DB", help="History database written by --pytest-durations-db.")
+    trend.add_argument("key", metavar="KEY", help="Test node ID or fixture key.")
+    trend.add_argument(
+        "--category",
+        choices=[*CATEGORY_NAMES],
+        default="call",
+        help='Measurement category. Default: "call"',
+    )
+    trend.add_argument(
+        "--last",
+        metavar="N",
+        type=int,
+        default=DEFAULT_TREND_RUNS,
+        help=f"Number of most recent runs to show. Default {DEFAULT_TREND_RUNS}",
+    )
+    trend.add_argument(
+        "--time-format",
+        type=TimeFormat,
+        choices=[*TimeFormat],
+        default=TimeFormat.CLOCK,
+        help='How to format durations. Default: "clock"',
+    )
+
+    report = subparsers.add_parser(
+        "report",
+        help="Merge JSON (with samples) or binary exports of several runs or shards and show the duration report.",
+    )
+    report.set_defaults(command=_report)
+    report.add_argument("files", metavar="FILE", nargs="+", help="Export written by a pytest run.")
+    report.add_argument(
+        "--durations",
+        metavar="N",
+        type=int,
+        default=DEFAULT_DURATIONS,
+        help=f"Show N slowest setup/test durations (N=0 for no limit). Default {DEFAULT_DURATIONS}",
+    )
+    report.add_argument(
+        "--durations-min",
+        metavar="N",
+        type=float,
+        default=DEFAULT_DURATIONS_MIN,
+        help=f"Minimal duration in seconds for inclusion in slowest list. Default {DEFAULT_DURATIONS_MIN}",
+    )
+    report.add_argument(
+        "--group-by",
+        metavar=f"{{{','.join(GroupBy)},{PATH_GROUP_BY_PREFIX}N}}",
+        type=_parse_group_by,
+        default=DEFAULT_GROUP_BY,
+        help=f'Group test durations by module, class, or function, or use {PATH_GROUP_BY_PREFIX}N to add up'
+             f' durations by the first N directory and file name components. Exports do not carry markers,'
+             f' so grouping by markers is not available. Default: "{DEFAULT_GROUP_BY}"',
+    )
+    report.add_argument(
+        "--time-format",
+        type=TimeFormat,
+        choices=[*TimeFormat],
+        default=DEFAULT_TIME_FORMAT,
+        help=f'How to format durations. Default: "{DEFAULT_TIME_FORMAT}"',
+    )
+    report.add_argument(
+        "--show",
+        metavar="SECTIONS",
+        type=parse_categories,
+        default=DEFAULT_SHOW_SECTIONS,
+        help='Comma-separated list of report sections to show: "fixture", "call", "setup", "teardown", "collect",'
+             ' "session", "param", "outcome". Default: "fixture,call,setup,teardown".',
+    )
+    report.add_argument(
+        "--columns",
+        metavar="COLUMNS",
+        type=_parse_columns,
+        default=DEFAULT_COLUMNS,
+        help=f'Comma-separated list of stat columns to show: "total", "num", "min", "med", "max", "p90", "p95",'
+             f' "p99". Columns of previous runs, baselines and cold samples are only available in the plugin.'
+             f' Default: {",".join(DEFAULT_COLUMNS)}.',
+    )
+    return parser
+
+
+def _parse_group_by(value: str) -> GroupBy | PathGroupBy:
+    """Parse a grouping like the plugin option, except grouping by markers, which exports have no data for."""
+    group_by = parse_group_by(value)
+    if isinstance(group_by, MarkerGroupBy):
+        message = f"invalid grouping {value!r}; exports do not carry markers"
+        raise ArgumentTypeError(message)
+    return group_by
+
+
+def _parse_columns(value: str) -> tuple[str, ...]:
+    """Parse stat columns like the plugin option, except columns filled from data of the pytest session only."""
+    columns = parse_columns(value)
+    unavailable = [name for name in columns if name in _SESSION_COLUMNS]
+    if unavailable:
+        message = f"unavailable column {unavailable[0]!r}; exports carry no previous run, baseline or cold data"
+        raise ArgumentTypeError(message)
+    return columns
+
+
+def _trend(args: Namespace) -> int:
+    try:
+        trends = get_trends(args.database, key=args.key, category=CATEGORY_NAMES[args.category], last=args.last)
+    except sqlite3.Error as exc:
+        sys.stderr.write(f"{args.database}: {exc}\n")
+        return 1
+    if not trends:
+        sys.stderr.write(f'No "{args.category}" durations recorded for "{args.key}"\n')
+        return 1
+    format_seconds = resolve_time_format(time_format=args.time_format, max_seconds=max(row.max for row in trends))
+    rows = [("run", "finished", "num", "total", "min", "med", "max")]
+    rows.extend(
+        (
+            str(row.run),
+            datetime.fromtimestamp(row.finished, tz=timezone.utc).isoformat(timespec="seconds"),
+            str(row.calls),
+            *map(format_seconds, (row.total, row.min, row.med, row.max)),
+        )
+        for row in trends
+    )
+    for line in get_table_lines(rows, get_table_widths(rows)):
+        sys.stdout.write(f"{line}\n")
+    return 0
+
+
+def _report(args: Namespace) -> int:
+    try:
+        measurements = merge_exports(args.files)
+    except (OSError, ValueError) as exc:
+        sys.stderr.write(f"{exc}\n")
+        return 1
+    options = ReportOptionsT(
+        max_rows=args.durations,
+        duration_min=args.durations_min,
+        group_by=args.group_by,
+        time_format=args.time_format,
+        columns=args.columns,
+        categories=args.show,
+    )
+    format_seconds = resolve_time_format(time_format=options.time_format, max_seconds=get_max_duration(measurements))
+    sections = get_report_sections(measurements=measurements, options=options, format_seconds=format_seconds)
+    width = max((len(line) for section in sections for line in section.lines), default=0)
+    fullwidth = max(shutil.get_terminal_size().columns, width)
+    for section in sections:
+        sys.stdout.write(f" {section.title} ".center(fullwidth, "=") + "\n")
+        for line in section.lines:
+            sys.stdout.write(f"{line}\n")
+    return 0
+
+
+def merge_exports(filenames: Iterable[str]) -> CategoryMeasurementsT:
+    """Merge raw samples of JSON (with samples) or binary exports the same way xdist worker data is merged.
+
+    Files are loaded and merged one at a time, so only the merged samples are kept in memory. Exports with
+    categories unknown to this version raise :class:`ValueError`.
+    """
+    measurements: CategoryMeasurementsT = {category: {} for category in Category}
+    for filename in filenames:
+        export = load_binary(filename) if is_binary_export(filename) else load_json_measurements(filename)
+        unknown = [name for name in export if name not in measurements]
+        if unknown:
+            message = f"unknown category {unknown[0]!r} in {filename}"
+            raise ValueError(message)
+        merge_measurements(export, measurements)
+    return measurements
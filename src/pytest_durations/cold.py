@@ -0,0 +1,148 @@
+"""Cold samples: the first samples of every key, paying for lazy imports, caches and connection pools."""
+from __future__ import annotations
+
+from collections import Counter
+from statistics import median
+from typing import TYPE_CHECKING, Any
+
+from pytest_durations.types import PRIMARY_CATEGORIES, Category
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+    from pytest_durations.typing import CategoryMeasurementsT, CategoryT, FunctionKeyT
+
+# categories of test phases, which count cold samples per module
+_TEST_CATEGORIES = frozenset((Category.TEST_SETUP, Category.TEST_CALL, Category.TEST_TEARDOWN))
+
+
+class ColdSamples:
+    """The first samples of every key recorded by the current process, kept apart as cold.
+
+    Test phases count per module rather than per test, as every test runs once: the first tests of
+    a module are cold. Likewise, function-scoped fixtures without a location are keyed by test and
+    count per module and fixture name. Derived categories repeat the time of fixtures and tests, so
+    they have no cold samples of their own. Wall times of whole tests are also kept per module, split into cold and warm
+    tests, to estimate what the first tests of a module pay on top of the steady state.
+    """
+
+    limit: int  # number of cold samples per key
+    samples: CategoryMeasurementsT  # cold samples recorded since the previous dump
+    counts: dict[tuple[CategoryT, str], int]  # samples recorded per category and counting unit
+    modules: dict[str, tuple[list[float], list[float]]]  # module → wall times of cold and warm tests
+    module_tests: dict[str, int]  # tests recorded per module
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.samples = {}
+        self.counts = {}
+        self.modules = {}
+        self.module_tests = {}
+
+    def add(self, category: CategoryT, key: FunctionKeyT, duration: float) -> None:
+        """Keep a sample of a primary category if it is one of the first samples of its key."""
+        if category not in PRIMARY_CATEGORIES:
+            return
+        unit = _get_unit(category, key)
+        count = self.counts.get((category, unit), 0)
+        if count < self.limit:
+            self.counts[category, unit] = count + 1
+            self.samples.setdefault(category, {}).setdefault(key, []).append(duration)
+
+    def add_test(self, key: FunctionKeyT, duration: float) -> None:
+        """Account the wall time of a test to its module, as a cold test if it is one of the first ones."""
+        module = key.partition("::")[0]
+        count = self.module_tests.get(module, 0)
+        self.module_tests[module] = count + 1
+        cold, warm = self.modules.setdefault(module, ([], []))
+        (cold if count < self.limit else warm).append(duration)
+
+    def discard(self, category: CategoryT, key: FunctionKeyT, duration: float) -> None:
+        """Forget the latest sample of a key if it was kept as cold, so a later sample takes its place."""
+        samples = self.samples.get(category, {}).get(key)
+        if not samples or samples[-1] != duration:
+            return
+        samples.pop()
+        if not samples:
+            del self.samples[category][key]
+        self.counts[category, _get_unit(category, key)] -= 1
+
+    def discard_test(self, key: FunctionKeyT, duration: float) -> None:
+        """Forget the wall time of the latest test of a module, accounted by :meth:`add_test`."""
+        module = key.partition("::")[0]
+        count = self.module_tests.get(module, 0) - 1
+        cold, warm = self.modules.get(module, ([], []))
+        times = cold if count < self.limit else warm
+        if not times or times[-1] != duration:
+            return
+        times.pop()
+        self.module_tests[module] = count
+
+    def dump(self) -> dict[str, Any]:
+        """Serialize cold samples and module wall times with simple types only."""
+        return {"samples": self.samples, "modules": self.modules}
+
+    def load(self, data: dict[str, Any]) -> None:
+        """Add cold samples and module wall times serialized by :meth:`dump`."""
+        for category, series in data["samples"].items():
+            for key, samples in series.items():
+                self.samples.setdefault(category, {}).setdefault(key, []).extend(samples)
+        for module, (cold, warm) in data["modules"].items():
+            module_cold, module_warm = self.modules.setdefault(module, ([], []))
+            module_cold.extend(cold)
+            module_warm.extend(warm)
+
+    def clear(self) -> None:
+        """Forget cold samples and module wall times, once they were dumped; counts are kept."""
+        self.samples = {}
+        self.modules = {}
+
+
+def _get_unit(category: CategoryT, key: FunctionKeyT) -> str:
+    """Return the unit counting cold samples of a key: the module of a test, the module and name of a fixture."""
+    module, _, name = key.partition("::")
+    if category in _TEST_CATEGORIES:
+        return module
+    if "::" not in name:
+        return key
+    return f"{module}::{name.rpartition('::')[2]}"
+
+
+def get_warm_times(times: Iterable[float], cold_times: Iterable[float]) -> list[float]:
+    """Return samples without the cold ones, wherever they are in the list."""
+    remaining = Counter(cold_times)
+    warm = []
+    for duration in times:
+        if remaining[duration]:
+            remaining[duration] -= 1
+        else:
+            warm.append(duration)
+    return warm
+
+
+def get_cold_start_rows(
+    cold: ColdSamples,
+    max_rows: int,
+    format_seconds: Callable[[float], str],
+) -> list[tuple[str, ...]]:
+    """Return table rows of modules whose first tests take longer than the steady state, including a header.
+
+    The penalty is the wall time of cold tests beyond the median wall time of warm tests of the same module,
+    the time to be saved by moving what the first tests pay for into explicit session fixtures. Modules
+    without warm tests are skipped.
+    """
+    penalties = []
+    for module, (cold_times, warm_times) in cold.modules.items():
+        if not warm_times:
+            continue
+        warm = median(warm_times)
+        penalty = sum(cold_times) - len(cold_times) * warm
+        if penalty > 0:
+            penalties.append((penalty, sum(cold_times) / len(cold_times), warm, module))
+    penalties.sort(reverse=True)
+    rows = [("penalty", "cold", "warm", "name")]
+    rows.extend(
+        (format_seconds(penalty), format_seconds(cold_mean), format_seconds(warm), module)
+        for penalty, cold_mean, warm, module in penalties[:max_rows or None]
+    )
+    return rows
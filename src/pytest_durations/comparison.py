@@ -0,0 +1,174 @@
+"""Comparison of measurements against a baseline export."""
+from __future__ import annotations
+
+from itertools import chain, groupby
+from math import erfc, sqrt
+from operator import itemgetter
+from typing import TYPE_CHECKING, NamedTuple
+
+from pytest_durations.binary_exporter import BinaryMeasurements, is_binary_export
+from pytest_durations.json_exporter import load_json
+
+if TYPE_CHECKING:
+    from collections.abc import Collection, Mapping
+
+    from pytest_durations.helpers import GroupingCbT
+    from pytest_durations.typing import CategoryT, FunctionKeyT, FunctionMeasurementsT
+
+# Minimal number of samples on each side to run the rank test
+MIN_RANK_TEST_SAMPLES = 5
+# Significance level of the rank test
+SIGNIFICANCE_LEVEL = 0.05
+
+
+class BaselineT(NamedTuple):
+    """Baseline timing data of a single key."""
+
+    calls: int                          # Number of calls (invocations)
+    total: float                        # Total (cumulative) execution time in seconds
+    samples: tuple[float, ...] | None   # Raw samples, if the baseline export carries them
+
+    @property
+    def mean(self) -> float:
+        """Return mean execution time in seconds."""
+        return self.total / self.calls if self.calls else 0.0
+
+
+class RegressionT(NamedTuple):
+    """Significant slowdown of a single key against the baseline."""
+
+    category: CategoryT  # Measurement category
+    name: FunctionKeyT   # Grouped key
+    base: float          # Baseline mean execution time in seconds
+    mean: float          # Current mean execution time in seconds
+    pvalue: float | None  # Rank test p-value, None if decided by the ratio threshold only
+    cost: float          # Extra time spent in the current run in seconds
+
+    @property
+    def ratio(self) -> float:
+        """Return current to baseline mean execution time ratio."""
+        return self.mean / self.base
+
+
+if TYPE_CHECKING:
+    BaselineMeasurementsT = dict[FunctionKeyT, BaselineT]
+    CategoryBaselineT = dict[CategoryT, BaselineMeasurementsT]
+
+
+def load_baseline(filename: str) -> CategoryBaselineT:
+    """Load baseline timing data from a JSON or binary export.
+
+    Binary exports and JSON exports written with samples carry raw samples, other JSON exports
+    carry summary statistics only.
+    """
+    if is_binary_export(filename):
+        with BinaryMeasurements(filename) as reader:
+            return {
+                category: {
+                    name: BaselineT(calls=len(samples), total=sum(samples), samples=samples)
+                    for name in reader.names(category)
+                    for samples in (reader.samples(category, name),)
+                }
+                for category in reader.categories()
+            }
+    return {
+        category: {
+            entry["name"]: BaselineT(
+                calls=entry["calls"],
+                total=entry["total"],
+                samples=tuple(entry["times"]) if "times" in entry else None,
+            )
+            for entry in entries
+        }
+        for category, entries in load_json(filename).items()
+    }
+
+
+def get_grouped_baseline(baseline: BaselineMeasurementsT, grouping_func: GroupingCbT) -> BaselineMeasurementsT:
+    """Group baseline timing data using a provided function to get grouping keys.
+
+    Samples of a group are kept only if every grouped key carries them.
+    """
+    def grouping_key(item: tuple[FunctionKeyT, BaselineT]) -> FunctionKeyT:
+        return grouping_func((item[0], []))
+
+    result = {}
+    for group, items in groupby(sorted(baseline.items(), key=grouping_key), key=grouping_key):
+        values = list(map(itemgetter(1), items))
+        has_samples = all(value.samples is not None for value in values)
+        result[group] = BaselineT(
+            calls=sum(value.calls for value in values),
+            total=sum(value.total for value in values),
+            samples=tuple(chain.from_iterable(value.samples for value in values)) if has_samples else None,
+        )
+    return result
+
+
+def find_regressions(
+    category: CategoryT,
+    measurements: FunctionMeasurementsT,
+    baseline: BaselineMeasurementsT,
+    ratio: float,
+    duration_min: float = 0.0,
+) -> list[RegressionT]:
+    """Return keys which got significantly slower than the baseline.
+
+    With raw samples on both sides a one-sided Mann-Whitney U test decides whether the slowdown is
+    significant, otherwise the mean execution time ratio threshold alone does.
+
+    :param category: Category of the compared measurements.
+    :param measurements: Grouped current measurements.
+    :param baseline: Grouped baseline timing data.
+    :param ratio: Minimal current to baseline mean execution time ratio to flag a slowdown.
+    :param duration_min: Ignore keys with total current time less than this value.
+    :return: List of regressions sorted by their cost (descending).
+    """
+    regressions = []
+    for name, times in measurements.items():
+        base = baseline.get(name)
+        total = sum(times)
+        if base is None or not base.mean or not times or total < duration_min:
+            continue
+        mean = total / len(times)
+        if mean < base.mean * ratio:
+            continue
+        pvalue = None
+        if base.samples is not None and min(len(times), len(base.samples)) >= MIN_RANK_TEST_SAMPLES:
+            pvalue = mann_whitney_u_pvalue(times, base.samples)
+            if pvalue >= SIGNIFICANCE_LEVEL:
+                continue
+        cost = total - base.mean * len(times)
+        regressions.append(
+            RegressionT(category=category, name=name, base=base.mean, mean=mean, pvalue=pvalue, cost=cost),
+        )
+    regressions.sort(key=lambda regression: regression.cost, reverse=True)
+    return regressions
+
+
+def get_baseline_means(baseline: Mapping[FunctionKeyT, BaselineT]) -> dict[FunctionKeyT, float]:
+    """Return baseline mean execution time per key."""
+    return {name: value.mean for name, value in baseline.items()}
+
+
+def mann_whitney_u_pvalue(greater: Collection[float], lesser: Collection[float]) -> float:
+    """Return one-sided Mann-Whitney U test p-value of the first sample being stochastically greater.
+
+    Uses the normal approximation with tie and continuity corrections.
+    """
+    n1, n2 = len(greater), len(lesser)
+    ranked = sorted(chain(((value, True) for value in greater), ((value, False) for value in lesser)))
+    rank_sum = 0.0
+    tie_correction = 0
+    for _, group in groupby(enumerate(ranked, start=1), key=lambda item: item[1][0]):
+        group_items = list(group)
+        ties = len(group_items)
+        rank = (group_items[0][0] + group_items[-1][0]) / 2
+        rank_sum += rank * sum(1 for _, (_, is_greater) in group_items if is_greater)
+        tie_correction += ties ** 3 - ties
+    n = n1 + n2
+    u_statistic = rank_sum - n1 * (n1 + 1) / 2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_correction / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    z_score = (u_statistic - n1 * n2 / 2 - 0.5) / sqrt(variance)
+    return erfc(z_score / sqrt(2)) / 2
@@ -0,0 +1,114 @@
+"""SQLite history database of pytest-durations runs."""
+from __future__ import annotations
+
+import sqlite3
+from contextlib import closing
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, NamedTuple
+
+from pytest_durations.reporting import TimeValuesT
+from pytest_durations.types import Category
+
+if TYPE_CHECKING:
+    from pytest_durations.typing import CategoryMeasurementsT, CategoryT, FunctionKeyT
+
+DEFAULT_TREND_RUNS = 10
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    finished REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS durations (
+    run INTEGER NOT NULL REFERENCES runs (id),
+    category TEXT NOT NULL,
+    key TEXT NOT NULL,
+    calls INTEGER NOT NULL,
+    total REAL NOT NULL,
+    min REAL NOT NULL,
+    med REAL NOT NULL,
+    max REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS durations_key_category_run ON durations (key, category, run);
+CREATE TABLE IF NOT EXISTS samples (
+    run INTEGER NOT NULL REFERENCES runs (id),
+    category TEXT NOT NULL,
+    key TEXT NOT NULL,
+    duration REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS samples_key_category_run ON samples (key, category, run);
+"""
+
+_TRENDS_QUERY = """
+SELECT runs.id, runs.finished, durations.calls, durations.total, durations.min, durations.med, durations.max
+FROM durations JOIN runs ON runs.id = durations.run
+WHERE durations.key = ? AND durations.category = ?
+ORDER BY durations.run DESC
+LIMIT ?
+"""
+
+
+class TrendRowT(NamedTuple):
+    """Aggregated timing statistics of a single key in a single run."""
+
+    run: int         # Run identifier
+    finished: float  # Run finish time as a POSIX timestamp
+    calls: int       # Number of calls (invocations)
+    total: float     # Total (cumulative) execution time in seconds
+    min: float       # Minimum execution time in seconds
+    med: float       # Median execution time in seconds
+    max: float       # Maximum execution time in seconds
+
+
+def export_database(measurements: CategoryMeasurementsT, filename: str, *, samples: bool = False) -> int:
+    """Insert per-key aggregates of a session into a SQLite database as a new run.
+
+    All rows are written in a single transaction.
+
+    :param measurements: Mapping of categories to name → duration list.
+    :param filename: Database path, created if it does not exist.
+    :param samples: Store every raw sample in addition to the aggregates.
+    :return: Identifier of the inserted run.
+    """
+    finished = datetime.now(tz=timezone.utc).timestamp()
+    with closing(sqlite3.connect(filename)) as connection:
+        connection.executescript(_SCHEMA)
+        with connection:
+            run = connection.execute("INSERT INTO runs (finished) VALUES (?)", (finished,)).lastrowid
+            connection.executemany(
+                "INSERT INTO durations VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    (run, category, name, value.calls, value.sum, value.min, value.med, value.max)
+                    for category, category_measurements in measurements.items()
+                    for name, times in category_measurements.items()
+                    if times
+                    for value in (TimeValuesT.from_times(name=name, times=times),)
+                ),
+            )
+            if samples:
+                connection.executemany(
+                    "INSERT INTO samples VALUES (?, ?, ?, ?)",
+                    (
+                        (run, category, name, duration)
+                        for category, category_measurements in measurements.items()
+                        for name, times in category_measurements.items()
+                        for duration in times
+                    ),
+                )
+    return run
+
+
+def get_trends(
+    filename: str,
+    key: FunctionKeyT,
+    category: CategoryT = Category.TEST_CALL,
+    last: int = DEFAULT_TREND_RUNS,
+) -> list[TrendRowT]:
+    """Return aggregates of a key over the last N runs it was recorded in, oldest first.
+
+    The database is opened read-only, so a missing file raises :class:`sqlite3.Error` instead of being created.
+    """
+    with closing(sqlite3.connect(f"{Path(filename).absolute().as_uri()}?mode=ro", uri=True)) as connection:
+        rows = connection.execute(_TRENDS_QUERY, (key, category, last)).fetchall()
+    return [TrendRowT(*row) for row in reversed(rows)]
@@ -0,0 +1,100 @@
+"""Prediction of the remaining run time from recorded test durations."""
+from __future__ import annotations
+
+import json
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any
+
+from pytest_durations.helpers import write_atomic
+from pytest_durations.sharding import DEFAULT_TEST_DURATION
+from pytest_durations.ticker import get_current_ticks
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from _pytest.terminal import TerminalReporter
+
+# minimal interval between status file writes in seconds
+STATUS_INTERVAL = 1.0
+# width of the progress line suffix, as long as the remaining time is below 10 hours
+ETA_WIDTH = len(" ETA 0:00:00")
+
+
+class RemainingTimeEstimator:
+    """Remaining run time predicted by recorded test durations and corrected by the observed speed.
+
+    Every finished test moves its predicted duration from the remaining to the finished sum, and
+    the remaining sum is scaled by the ratio of the elapsed time to the finished sum. The ratio also
+    accounts for pytest-xdist workers running in parallel. Each update takes constant time.
+    """
+
+    predictions: dict[str, float]  # predicted duration of every test not finished yet
+    total: int
+    finished: int
+    predicted_remaining: float
+    predicted_finished: float
+    started: float
+
+    def __init__(self, nodeids: Sequence[str], durations: Sequence[float | None], started: float):
+        known = [duration for duration in durations if duration is not None]
+        default = sum(known) / len(known) if known else DEFAULT_TEST_DURATION
+        self.predictions = {
+            nodeid: default if duration is None else duration
+            for nodeid, duration in zip(nodeids, durations, strict=True)
+        }
+        self.total = len(self.predictions)
+        self.finished = 0
+        self.predicted_remaining = sum(self.predictions.values())
+        self.predicted_finished = 0.0
+        self.started = started
+
+    def finish(self, nodeid: str) -> None:
+        """Account a finished test, reruns and tests which were not collected are ignored."""
+        predicted = self.predictions.pop(nodeid, None)
+        if predicted is None:
+            return
+        self.finished += 1
+        self.predicted_remaining -= predicted
+        self.predicted_finished += predicted
+
+    def get_remaining(self, now: float) -> float:
+        """Return the predicted remaining time in seconds."""
+        if not self.predictions:
+            return 0.0
+        if not self.predicted_finished:
+            return self.predicted_remaining
+        return max(self.predicted_remaining, 0.0) * (now - self.started) / self.predicted_finished
+
+    def get_status(self, now: float) -> dict[str, Any]:
+        """Return progress data with JSON compatible types only."""
+        return {
+            "finished": self.finished,
+            "total": self.total,
+            "elapsed": now - self.started,
+            "remaining": self.get_remaining(now),
+        }
+
+
+def format_eta(remaining: float) -> str:
+    """Return the progress line suffix for a remaining time in seconds."""
+    return f" ETA {timedelta(seconds=round(remaining))}"
+
+
+def add_eta_to_progress(terminalreporter: TerminalReporter, estimator: RemainingTimeEstimator) -> None:
+    """Append the predicted remaining time to the progress information of a terminal reporter.
+
+    The reporter has no extension point for it, so its progress message method is wrapped, and the
+    screen width it uses to break lines of test outcome letters is reduced by the suffix width.
+    """
+    get_message = terminalreporter._get_progress_information_message  # noqa: SLF001
+
+    def get_progress_message() -> str:
+        return f"{get_message()}{format_eta(estimator.get_remaining(get_current_ticks()))}"
+
+    terminalreporter._get_progress_information_message = get_progress_message  # noqa: SLF001
+    terminalreporter._screen_width -= ETA_WIDTH  # noqa: SLF001
+
+
+def write_eta_status(filename: str, estimator: RemainingTimeEstimator, now: float) -> None:
+    """Atomically replace the status file with the current progress data."""
+    write_atomic(filename, json.dumps(estimator.get_status(now)))
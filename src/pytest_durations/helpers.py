@@ -1,23 +1,43 @@
 """Internal helper functions module."""
+import os
 from collections.abc import Callable, Mapping
 from contextlib import suppress
-from functools import partial
+from functools import lru_cache, partial
 from itertools import chain, groupby
 from operator import itemgetter
+from pathlib import Path
 from typing import TYPE_CHECKING, Literal
 
-from pytest_durations.types import GroupBy
+from pytest_durations.types import Category, GroupBy, MarkerGroupBy, PathGroupBy
 
 if TYPE_CHECKING:
-    from _pytest.fixtures import FixtureDef
-    from _pytest.nodes import Item
+    from collections.abc import Iterable, Sequence
 
-    from pytest_durations.typing import DurationListT, FunctionKeyT, FunctionMeasurementsT
+    from _pytest.config import Config
+    from _pytest.fixtures import FixtureDef
+    from _pytest.nodes import Collector, Item
+    from _pytest.python import CallSpec2
+    from _pytest.reports import TestReport
+
+    from pytest_durations.typing import (
+        CategoryMeasurementsT,
+        CategoryT,
+        DurationListT,
+        FunctionKeyT,
+        FunctionMeasurementsT,
+    )
 
     MeasurementItemT = tuple[FunctionKeyT, DurationListT]
     GroupingCbT = Callable[[MeasurementItemT], FunctionKeyT]
     GroupingKindT = Literal["test", "fixture"]
 
+# parameter values shown as they are in parameter measurements dict keys
+_SCALAR_TYPES = (str, int, float, bool, type(None))
+# group key of tests without any of the markers to group by
+NO_MARKER_GROUP = "(no marker)"
+# number of split module paths kept for path grouping, more than most test suites have modules
+_PATH_CACHE_SIZE = 4096
+
 
 def is_shared_fixture(fixturedef: "FixtureDef") -> bool:
     """Return true if a fixture is shared."""
@@ -36,6 +56,99 @@ def get_test_key(item: "Item") -> "FunctionKeyT":
     return item.nodeid
 
 
+def get_param_keys(item: "Item") -> tuple["FunctionKeyT", ...]:
+    """Return parameter measurements dict keys of a test item: "NAME=VALUE" of every parametrized argument.
+
+    Values other than scalars are represented by their parametrize ID, as in the node ID.
+    """
+    callspec = getattr(item, "callspec", None)
+    if callspec is None:
+        return ()
+    ids = _get_param_ids(callspec)
+    return tuple(
+        f"{name}={value}" if isinstance(value, _SCALAR_TYPES) else f"{name}={ids[name]}"
+        for name, value in callspec.params.items()
+    )
+
+
+def _get_param_ids(callspec: "CallSpec2") -> dict[str, str]:
+    """Return the parametrize ID of every argument of a call spec.
+
+    Arguments get their own part of the node ID parameters if the parts can be told apart (one per argument),
+    otherwise all of them, e.g. for a custom ID of several arguments parametrized together.
+    """
+    names = list(callspec.params)
+    for parts in (callspec._idlist, callspec.id.split("-")):  # noqa: SLF001
+        if len(parts) == len(names):
+            return dict(zip(names, parts, strict=True))
+    return dict.fromkeys(names, callspec.id)
+
+
+def get_marker_tags(items: "Iterable[Item]", names: "Sequence[str]") -> dict["FunctionKeyT", str]:
+    """Return test keys of collected items having any of the marker names mapped to the names they have joined by "+".
+
+    Equal group keys are shared by all tests, so that the index stays compact.
+    """
+    tags: dict[FunctionKeyT, str] = {}
+    shared: dict[str, str] = {}
+    for item in items:
+        item_names = {mark.name for mark in item.iter_markers()}
+        tag = "+".join(name for name in names if name in item_names)
+        if tag:
+            tags[get_test_key(item)] = shared.setdefault(tag, tag)
+    return tags
+
+
+def get_report_outcome(report: "TestReport") -> str:
+    """Return the outcome of a test phase report, telling errors of setup and teardown and expected failures apart."""
+    if hasattr(report, "wasxfail"):
+        return "xfailed" if report.skipped else "xpassed"
+    if report.failed and report.when != "call":
+        return "error"
+    return report.outcome
+
+
+def filter_outcomes(
+    measurements: "CategoryMeasurementsT",
+    outcomes: Mapping["FunctionKeyT", str],
+    selected: "Sequence[str]",
+) -> "CategoryMeasurementsT":
+    """Return measurements without test phases and outcome keys of final test outcomes other than the selected ones.
+
+    Tests of unknown outcome, e.g. on a crashed pytest-xdist worker, are kept. Outcome keys are filtered
+    only if they were recorded, i.e. the outcome section is shown.
+    """
+    filtered = dict(measurements)
+    for category in (Category.TEST_SETUP, Category.TEST_CALL, Category.TEST_TEARDOWN):
+        filtered[category] = {
+            key: samples
+            for key, samples in measurements[category].items()
+            if (outcome := outcomes.get(key)) is None or outcome in selected
+        }
+    outcome_measurements = measurements.get(Category.OUTCOME)
+    if outcome_measurements is not None:
+        filtered[Category.OUTCOME] = {key: samples for key, samples in outcome_measurements.items() if key in selected}
+    return filtered
+
+
+def get_collect_key(collector: "Collector") -> "FunctionKeyT":
+    """Return collector measurements dict key: the path of its directory or file."""
+    return collector.nodeid.partition("::")[0] or "."
+
+
+def is_xdist_worker(config: "Config") -> bool:
+    """Return true if the current process is a pytest-xdist worker."""
+    return hasattr(config, "workerinput")
+
+
+def write_atomic(filename: str, content: str) -> None:
+    """Write a text file via rename of a temporary sibling, so readers never see a partial file."""
+    path = Path(filename)
+    temp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    temp_path.write_text(content, encoding="utf-8")
+    temp_path.replace(path)
+
+
 def _get_grouping_func(kind: "GroupingKindT", group_by: "GroupBy") -> "GroupingCbT":
     """Get fixture key grouping function based on a GroupBy enumeration value."""
     with suppress(KeyError):
@@ -48,6 +161,27 @@ get_test_grouping_func = partial(_get_grouping_func, kind="test")
 get_fixture_grouping_func = partial(_get_grouping_func, kind="fixture")
 
 
+def get_category_grouping_func(
+    category: "CategoryT",
+    group_by: "GroupBy | MarkerGroupBy | PathGroupBy",
+) -> "GroupingCbT":
+    """Get key grouping function of a measurement category based on a GroupBy enumeration value.
+
+    Grouping by markers applies to tests only, fixtures are grouped by function then. Grouping by path
+    applies to tests and fixtures alike.
+    """
+    if category in {Category.COLLECT, Category.SESSION, Category.PARAM, Category.OUTCOME}:
+        # collected files and packages, session phases, parameter values and outcomes are not grouped any further
+        return _group_by_none
+    if isinstance(group_by, PathGroupBy):
+        return partial(_group_by_path, group_by.depth)
+    if category == Category.FIXTURE_SETUP:
+        return get_fixture_grouping_func(group_by=GroupBy.FUNCTION if isinstance(group_by, MarkerGroupBy) else group_by)
+    if isinstance(group_by, MarkerGroupBy):
+        return partial(_group_by_markers, group_by.tags)
+    return get_test_grouping_func(group_by=group_by)
+
+
 def get_grouped_measurements(
     measurements: "FunctionMeasurementsT",
     grouping_func: "GroupingCbT",
@@ -95,6 +229,22 @@ def _group_by_none(item: "MeasurementItemT") -> "FunctionKeyT":
     return item[0]
 
 
+def _group_by_markers(tags: Mapping["FunctionKeyT", str], item: "MeasurementItemT") -> "FunctionKeyT":
+    # replace test key by names of its markers to group by
+    return tags.get(item[0], NO_MARKER_GROUP)
+
+
+def _group_by_path(depth: int, item: "MeasurementItemT") -> "FunctionKeyT":
+    # keep leading directory and file name components
+    return "/".join(_split_path(item[0].partition("::")[0])[:depth])
+
+
+@lru_cache(maxsize=_PATH_CACHE_SIZE)
+def _split_path(path: str) -> tuple[str, ...]:
+    # keys of a module share its path and are sorted and grouped by every grouping pass, split it once only
+    return tuple(path.split("/"))
+
+
 _GROUPING_FUNC_MAP: Mapping["GroupingKindT", Mapping["GroupBy", "GroupingCbT"]] = {
     "test": {
         GroupBy.LEGACY: _test_group_by_legacy,
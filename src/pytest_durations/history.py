@@ -0,0 +1,62 @@
+"""Per-test durations of previous runs, used to schedule the slowest tests first.
+
+Durations read from the pytest cache are the moving averages stored by :mod:`pytest_durations.trends`,
+so scheduling, sharding, ordering and the trend columns all share a single store.
+"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from pytest_durations.comparison import get_baseline_means, load_baseline
+from pytest_durations.trends import TRENDS_CACHE_DIR, TRENDS_FILENAME, load_trends
+from pytest_durations.types import Category
+
+if TYPE_CHECKING:
+    from collections.abc import Collection, Mapping
+
+    from _pytest.config import Config
+
+    from pytest_durations.trends import CategoryTrendsT
+    from pytest_durations.typing import CategoryT, FunctionKeyT
+
+# scheduling source reading durations from the pytest cache instead of an export file
+CACHE_SOURCE = "cache"
+# categories summed up into the duration of a whole test
+TEST_CATEGORIES = (Category.TEST_SETUP, Category.TEST_CALL, Category.TEST_TEARDOWN)
+
+
+def get_test_durations(means: Mapping[CategoryT, Mapping[FunctionKeyT, float]]) -> dict[FunctionKeyT, float]:
+    """Return setup, call and teardown mean durations summed up per test node ID."""
+    durations: dict[FunctionKeyT, float] = {}
+    for category in TEST_CATEGORIES:
+        for nodeid, mean in means.get(category, {}).items():
+            durations[nodeid] = durations.get(nodeid, 0.0) + mean
+    return durations
+
+
+def load_cached_trends(config: Config, categories: Collection[CategoryT] | None = None) -> CategoryTrendsT:
+    """Load timing data of previous runs from the pytest cache, empty if the cache is disabled.
+
+    :param config: Pytest configuration providing the cache.
+    :param categories: Categories to decode, all of them if None.
+    """
+    cache = getattr(config, "cache", None)
+    if cache is None:
+        return {}
+    return load_trends(cache.mkdir(TRENDS_CACHE_DIR) / TRENDS_FILENAME, categories=categories)
+
+
+def load_history(config: Config, source: str) -> dict[FunctionKeyT, float]:
+    """Load per-test durations from the pytest cache or from a JSON or binary export.
+
+    :param config: Pytest configuration providing the cache.
+    :param source: ``"cache"`` (moving averages of previous runs) or an export filename.
+    :return: Mapping of test node IDs to durations, empty if nothing was recorded yet.
+    """
+    if source != CACHE_SOURCE:
+        baseline = load_baseline(source)
+        return get_test_durations({category: get_baseline_means(values) for category, values in baseline.items()})
+    trends = load_cached_trends(config, categories=TEST_CATEGORIES)
+    return get_test_durations({
+        category: {key: trend.ewma for key, trend in values.items()} for category, values in trends.items()
+    })
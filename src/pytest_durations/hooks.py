@@ -0,0 +1,145 @@
+"""Attribution of hook call time to plugins through the plugin manager hook call monitoring."""
+from __future__ import annotations
+
+from functools import partial
+from types import ModuleType
+from typing import TYPE_CHECKING, Any
+
+from pytest_durations.ticker import get_current_ticks
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Generator, Iterable, Mapping, Sequence
+
+    from pluggy import HookImpl, PluginManager
+
+    HookKeyT = tuple[str, str]  # plugin name and hook name
+
+
+class HookTimer:
+    """Counters of calls and self time of every hook implementation by plugin and hook name.
+
+    Implementations are wrapped when their hook is called for the first time, so plugins registered
+    during the session are timed too. Time of nested hook calls is subtracted, and hook wrappers are
+    timed before and after their yield only, so the time of every call is accounted once.
+    """
+
+    calls: dict[HookKeyT, int]
+    totals: dict[HookKeyT, float]  # self time in seconds
+    nesting: list[float]  # time of nested hook calls, per running implementation
+    originals: dict[HookImpl, Callable[..., Any]]  # wrapped implementations → original functions
+    undo: Callable[[], None] | None
+
+    def __init__(self):
+        self.calls = {}
+        self.totals = {}
+        self.nesting = []
+        self.originals = {}
+        self.undo = None
+
+    def install(self, pluginmanager: PluginManager) -> None:
+        """Start timing hook implementations on their next call."""
+        self.undo = pluginmanager.add_hookcall_monitoring(before=self._before, after=self._after)
+
+    def uninstall(self) -> None:
+        """Stop the hook call monitoring and restore the original implementation functions."""
+        if self.undo is not None:
+            self.undo()
+            self.undo = None
+        for hookimpl, function in self.originals.items():
+            hookimpl.function = function
+        self.originals.clear()
+
+    def dump(self) -> list[tuple[str, str, int, float]]:
+        """Serialize counters with simple types only."""
+        return [(*key, calls, self.totals[key]) for key, calls in self.calls.items()]
+
+    def load(self, rows: Iterable[Sequence[Any]]) -> None:
+        """Add counters serialized by :meth:`dump`."""
+        for plugin, hook, calls, total in rows:
+            self._add((plugin, hook), calls=calls, duration=total)
+
+    def clear(self) -> None:
+        """Reset counters, once they were dumped."""
+        self.calls.clear()
+        self.totals.clear()
+
+    def _before(self, hook_name: str, hook_impls: Sequence[HookImpl], kwargs: Mapping[str, Any]) -> None:
+        for hookimpl in hook_impls:
+            if hookimpl not in self.originals:
+                self._wrap(hookimpl, hook_name)
+
+    def _after(
+        self,
+        outcome: object,
+        hook_name: str,
+        hook_impls: Sequence[HookImpl],
+        kwargs: Mapping[str, Any],
+    ) -> None:
+        pass
+
+    def _wrap(self, hookimpl: HookImpl, hook_name: str) -> None:
+        key = (get_plugin_name(hookimpl.plugin), hook_name)
+        function = self.originals[hookimpl] = hookimpl.function
+        timed = self._time_generator if hookimpl.hookwrapper or hookimpl.wrapper else self._time_call
+        hookimpl.function = partial(timed, key, function)
+
+    def _time_call(self, key: HookKeyT, function: Callable[..., Any], *args: Any) -> Any:
+        self.nesting.append(0.0)
+        start = get_current_ticks()
+        try:
+            return function(*args)
+        finally:
+            self._add_self_time(key, calls=1, duration=get_current_ticks() - start)
+
+    def _time_generator(self, key: HookKeyT, function: Callable[..., Any], *args: Any) -> Generator[Any, Any, Any]:
+        generator = self._time_call(key, function, *args)
+        resume: Callable[[Any], Any] = generator.send
+        value = None
+        while True:
+            self.nesting.append(0.0)
+            start = get_current_ticks()
+            try:
+                value = resume(value)
+            except StopIteration as stop:
+                return stop.value
+            finally:
+                self._add_self_time(key, calls=0, duration=get_current_ticks() - start)
+            try:
+                value = yield value
+            except GeneratorExit:
+                generator.close()
+                raise
+            except BaseException as exc:  # noqa: BLE001
+                resume, value = generator.throw, exc
+            else:
+                resume = generator.send
+
+    def _add_self_time(self, key: HookKeyT, calls: int, duration: float) -> None:
+        nested = self.nesting.pop()
+        if self.nesting:
+            self.nesting[-1] += duration
+        self._add(key, calls=calls, duration=duration - nested)
+
+    def _add(self, key: HookKeyT, calls: int, duration: float) -> None:
+        self.calls[key] = self.calls.get(key, 0) + calls
+        self.totals[key] = self.totals.get(key, 0.0) + duration
+
+
+def get_plugin_name(plugin: object) -> str:
+    """Return the module name of a module plugin, the class name of other plugins."""
+    return plugin.__name__ if isinstance(plugin, ModuleType) else type(plugin).__name__
+
+
+def get_hook_rows(
+    timer: HookTimer,
+    max_rows: int,
+    format_seconds: Callable[[float], str],
+) -> list[tuple[str, ...]]:
+    """Return table rows of the hook implementations with the highest self time, including a header."""
+    rows = [("total", "num", "name")]
+    keys = sorted(timer.totals, key=timer.totals.__getitem__, reverse=True)
+    rows.extend(
+        (format_seconds(timer.totals[key]), str(timer.calls[key]), " ".join(key))
+        for key in keys[:max_rows or None]
+    )
+    return rows
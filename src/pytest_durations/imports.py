@@ -0,0 +1,61 @@
+"""Attribution of module import time to top-level packages."""
+from __future__ import annotations
+
+import builtins
+import sys
+from typing import TYPE_CHECKING, Any
+
+from pytest_durations.ticker import get_current_ticks
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Mapping, Sequence
+    from types import ModuleType
+
+# measurement key prefix of imported packages in the collect category
+IMPORT_KEY_PREFIX = "import "
+
+
+class ImportTimer:
+    """Replacement of the built-in ``__import__`` function timing first imports of top-level packages.
+
+    Only absolute imports of packages not imported yet are timed. Each package gets its own import time:
+    the time of other packages it imports for the first time is subtracted, so the sum of all packages
+    is the total import time.
+    """
+
+    def __init__(self, record: Callable[[str, float], None]):
+        self.record = record
+        self.nested: list[float] = []  # time of nested package imports, per running import
+        self.original_import = builtins.__import__
+
+    def __call__(
+        self,
+        name: str,
+        globals: Mapping[str, Any] | None = None,  # noqa: A002
+        locals: Mapping[str, Any] | None = None,  # noqa: A002
+        fromlist: Sequence[str] = (),
+        level: int = 0,
+    ) -> ModuleType:
+        """Import a module, timing it if its top-level package is imported for the first time."""
+        package = name.partition(".")[0]
+        if level or package in sys.modules:
+            return self.original_import(name, globals, locals, fromlist, level)
+        self.nested.append(0.0)
+        start = get_current_ticks()
+        try:
+            return self.original_import(name, globals, locals, fromlist, level)
+        finally:
+            duration = get_current_ticks() - start
+            nested = self.nested.pop()
+            if self.nested:
+                self.nested[-1] += duration
+            self.record(f"{IMPORT_KEY_PREFIX}{package}", duration - nested)
+
+    def install(self) -> None:
+        """Replace the built-in import function."""
+        self.original_import = builtins.__import__
+        builtins.__import__ = self
+
+    def uninstall(self) -> None:
+        """Restore the original import function."""
+        builtins.__import__ = self.original_import
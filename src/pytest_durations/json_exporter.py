@@ -1,4 +1,4 @@
-"""JSON export for pytest-durations timing data."""
+"""JSON export and import for pytest-durations timing data."""
 from __future__ import annotations
 
 import json
@@ -6,15 +6,25 @@ import sys
 from pathlib import Path
 from typing import TYPE_CHECKING
 
+from pytest_durations.cold import get_warm_times
+
 if TYPE_CHECKING:
-    from pytest_durations.typing import CategoryMeasurementsT
+    from pytest_durations.typing import CategoryMeasurementsT, CategoryT
 
 
-def export_json(measurements: CategoryMeasurementsT, filename: str) -> None:
+def export_json(
+    measurements: CategoryMeasurementsT,
+    filename: str,
+    *,
+    samples: bool = False,
+    cold: CategoryMeasurementsT | None = None,
+) -> None:
     """Export timing measurements to a JSON file.
 
     :param measurements: Mapping of categories to name → duration list.
     :param filename: Output path or "-" for stdout.
+    :param samples: Add raw samples ("times") to every entry, so exports can be merged losslessly.
+    :param cold: Mapping of categories to name → cold samples, adds "cold" and "warm" stats to every entry.
     """
     data: dict[str, dict] = {
         "version": "1.0",
@@ -33,6 +43,17 @@ def export_json(measurements: CategoryMeasurementsT, filename: str) -> None:
                 "max": max(times) if times else 0.0,
                 "med": sorted(times)[len(times) // 2] if times else 0.0,
             }
+            if samples:
+                entry["times"] = times
+            if cold is not None:
+                cold_times = cold.get(category, {}).get(name, [])
+                warm_times = get_warm_times(times, cold_times)
+                entry["cold"] = {"calls": len(cold_times), "total": sum(cold_times)}
+                entry["warm"] = {
+                    "calls": len(warm_times),
+                    "total": sum(warm_times),
+                    "med": sorted(warm_times)[len(warm_times) // 2] if warm_times else 0.0,
+                }
             entries.append(entry)
         data["categories"][category_key] = entries
 
@@ -42,3 +63,31 @@ def export_json(measurements: CategoryMeasurementsT, filename: str) -> None:
         sys.stdout.write(json_str + "\n")
     else:
         Path(filename).write_text(json_str, encoding="utf-8")
+
+
+def load_json(filename: str) -> dict[CategoryT, list[dict]]:
+    """Load per-key summary entries of every category from a JSON export.
+
+    :param filename: Path of a file written by :func:`export_json`.
+    :return: Mapping of categories to lists of summary entries.
+    """
+    data = json.loads(Path(filename).read_text(encoding="utf-8"))
+    return data["categories"]
+
+
+def load_json_measurements(filename: str) -> CategoryMeasurementsT:
+    """Load raw timing samples from a JSON export written with samples.
+
+    :param filename: Path of a file written by :func:`export_json` with ``samples=True``.
+    :return: Mapping of categories to name → duration list.
+    :raises ValueError: If the export carries summary statistics only.
+    """
+    measurements: CategoryMeasurementsT = {}
+    for category, entries in load_json(filename).items():
+        category_measurements = measurements[category] = {}
+        for entry in entries:
+            if "times" not in entry:
+                msg = f'"{filename}" has no raw samples, export it with --pytest-durations-json-samples'
+                raise ValueError(msg)
+            category_measurements[entry["name"]] = entry["times"]
+    return measurements
@@ -0,0 +1,125 @@
+"""OpenMetrics (Prometheus text format) export of duration histograms.
+
+Histograms are updated as every sample is recorded, so the export only sums up
+bucket counts of grouped keys instead of rescanning raw samples.
+"""
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import TYPE_CHECKING
+
+from pytest_durations.helpers import get_category_grouping_func, write_atomic
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Sequence
+
+    from pytest_durations.types import GroupBy
+    from pytest_durations.typing import CategoryT, FunctionKeyT
+
+METRIC_NAME = "pytest_durations_seconds"
+
+
+class DurationHistograms:
+    """Duration histograms per category and key.
+
+    Bucket counts are not cumulative: the last count collects samples above the highest bound.
+    """
+
+    buckets: tuple[float, ...]
+    counts: dict[CategoryT, dict[FunctionKeyT, list[int]]]
+    sums: dict[CategoryT, dict[FunctionKeyT, float]]
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = {}
+        self.sums = {}
+
+    def observe(self, category: CategoryT, key: FunctionKeyT, duration: float) -> None:
+        """Count a single sample."""
+        category_counts = self.counts.setdefault(category, {})
+        category_sums = self.sums.setdefault(category, {})
+        try:
+            counts = category_counts[key]
+        except KeyError:
+            counts = category_counts[key] = [0] * (len(self.buckets) + 1)
+        counts[bisect_left(self.buckets, duration)] += 1
+        category_sums[key] = category_sums.get(key, 0.0) + duration
+
+    def discard(self, category: CategoryT, key: FunctionKeyT, duration: float) -> None:
+        """Uncount a single sample counted before, samples of keys not counted are ignored."""
+        counts = self.counts.get(category, {}).get(key)
+        if counts is None:
+            return
+        counts[bisect_left(self.buckets, duration)] -= 1
+        self.sums[category][key] -= duration
+
+    def dump(self) -> dict[str, dict]:
+        """Serialize histograms with simple types only."""
+        return {"counts": self.counts, "sums": self.sums}
+
+    def clear(self) -> None:
+        """Forget every counted sample."""
+        self.counts = {}
+        self.sums = {}
+
+    def load(self, histograms: dict[str, dict]) -> None:
+        """Merge serialized histograms with the same buckets into this object."""
+        for category, src_counts in histograms["counts"].items():
+            dst_counts = self.counts.setdefault(category, {})
+            dst_sums = self.sums.setdefault(category, {})
+            for key, counts in src_counts.items():
+                dst_counts[key] = list(map(sum, zip(dst_counts.get(key, [0] * len(counts)), counts, strict=True)))
+                dst_sums[key] = dst_sums.get(key, 0.0) + histograms["sums"][category][key]
+
+    def get_grouped(
+        self,
+        category: CategoryT,
+        group_by: GroupBy,
+    ) -> dict[FunctionKeyT, tuple[list[int], float]]:
+        """Return bucket counts and sums of a category merged by grouping keys."""
+        grouping_func = get_category_grouping_func(category=category, group_by=group_by)
+        grouped: dict[FunctionKeyT, tuple[list[int], float]] = {}
+        for key, counts in self.counts.get(category, {}).items():
+            group = grouping_func((key, []))
+            group_counts, group_sum = grouped.get(group, ([0] * len(counts), 0.0))
+            grouped[group] = (
+                list(map(sum, zip(group_counts, counts, strict=True))),
+                group_sum + self.sums[category][key],
+            )
+        return grouped
+
+
+def export_openmetrics(histograms: DurationHistograms, filename: str, group_by: GroupBy) -> None:
+    """Atomically write duration histograms in the OpenMetrics text format.
+
+    :param histograms: Incrementally updated histograms.
+    :param filename: Output path, replaced by rename.
+    :param group_by: Grouping of keys into the ``group`` label.
+    """
+    write_atomic(filename, "".join(f"{line}\n" for line in get_openmetrics_lines(histograms, group_by)))
+
+
+def get_openmetrics_lines(histograms: DurationHistograms, group_by: GroupBy) -> Iterator[str]:
+    """Render duration histograms as OpenMetrics text format lines."""
+    yield f"# TYPE {METRIC_NAME} histogram"
+    yield f"# UNIT {METRIC_NAME} seconds"
+    yield f"# HELP {METRIC_NAME} Duration of pytest tests and fixtures."
+    bounds = [*map(_format_value, histograms.buckets), "+Inf"]
+    for category in histograms.counts:
+        for group, (counts, total) in sorted(histograms.get_grouped(category, group_by=group_by).items()):
+            labels = f'category="{_escape_label(category)}",group="{_escape_label(group)}"'
+            cumulative = 0
+            for bound, count in zip(bounds, counts, strict=True):
+                cumulative += count
+                yield f'{METRIC_NAME}_bucket{{{labels},le="{bound}"}} {cumulative}'
+            yield f"{METRIC_NAME}_count{{{labels}}} {cumulative}"
+            yield f"{METRIC_NAME}_sum{{{labels}}} {_format_value(total)}"
+    yield "# EOF"
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value))
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n")
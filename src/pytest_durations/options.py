@@ -1,13 +1,26 @@
 """Plugin command line arguments parsing module."""
 from typing import TYPE_CHECKING
 
+import pytest
+
+from pytest_durations.ticker import get_current_ticks
 from pytest_durations.types import (
-    ALL_CATEGORIES,
     DEFAULT_COLUMNS,
+    MARKER_GROUP_BY_PREFIX,
+    OUTCOMES,
+    PATH_GROUP_BY_PREFIX,
+    PRIMARY_CATEGORIES,
+    BudgetAction,
+    Compression,
     GroupBy,
+    RunOrder,
     TimeFormat,
+    parse_buckets,
     parse_categories,
     parse_columns,
+    parse_group_by,
+    parse_outcomes,
+    parse_shard,
 )
 
 if TYPE_CHECKING:
@@ -19,7 +32,42 @@ DEFAULT_DURATIONS_MIN = 0.005
 DEFAULT_RESULT_LOG = "-"
 DEFAULT_GROUP_BY = GroupBy.FUNCTION
 DEFAULT_TIME_FORMAT = TimeFormat.CLOCK
-DEFAULT_SHOW_SECTIONS = ALL_CATEGORIES
+DEFAULT_SHOW_SECTIONS = PRIMARY_CATEGORIES
+DEFAULT_COLD_SAMPLES = 0
+DEFAULT_BINARY_COMPRESSION = Compression.NONE
+DEFAULT_COMPARE_RATIO = 1.2
+DEFAULT_XDIST_FLUSH = 1.0
+DEFAULT_OPENMETRICS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+DEFAULT_OPENMETRICS_GROUP_BY = GroupBy.MODULE
+DEFAULT_SHARD_GROUP_BY = GroupBy.NONE
+DEFAULT_SHARD_HISTORY = "cache"
+DEFAULT_TREND_ALPHA = 0.3
+DEFAULT_BUDGET_ACTION = BudgetAction.WARN
+
+BUDGET_MARKER = "duration_budget"
+BUDGET_INI = "pytest_durations_budgets"
+
+# ticks of the initial conftest loading, the start of the session timeline
+STARTED_KEY = pytest.StashKey[float]()
+# whether the measuring plugin is registered
+REGISTERED_KEY = pytest.StashKey[bool]()
+
+# any of these options enables the plugin even if the terminal report is disabled
+EXPORT_OPTIONS = (
+    "--pytest-durations-json",
+    "--pytest-durations-binary",
+    "--pytest-durations-db",
+    "--pytest-durations-openmetrics",
+    "--pytest-durations-schedule",
+    "--pytest-durations-shard",
+    "--pytest-durations-order",
+    "--pytest-durations-eta",
+    "--pytest-durations-eta-file",
+    "--pytest-durations-compare",
+    "--pytest-durations-compare-budget",
+    "--pytest-durations-collect-imports",
+    "--pytest-durations-hooks",
+)
 
 
 def pytest_addoption(parser: "Parser", pluginmanager: "PytestPluginManager") -> None:
@@ -52,11 +100,15 @@ def pytest_addoption(parser: "Parser", pluginmanager: "PytestPluginManager") ->
     )
     group.addoption(
         "--pytest-durations-group-by",
-        type=GroupBy,
+        metavar=f"{{{','.join(GroupBy)},{MARKER_GROUP_BY_PREFIX}NAMES,{PATH_GROUP_BY_PREFIX}N}}",
+        type=parse_group_by,
         default=DEFAULT_GROUP_BY,
-        choices=[*GroupBy],
         help=f'Group test durations by module, class, or function.'
              f' Use legacy grouping for backward compatibility.'
+             f' Use {MARKER_GROUP_BY_PREFIX}NAME[,NAME...] to group tests by the listed markers they have,'
+             f' e.g. "{MARKER_GROUP_BY_PREFIX}unit,integration,slow".'
+             f' Use {PATH_GROUP_BY_PREFIX}N to add up durations by the first N directory and file name components,'
+             f' e.g. "{PATH_GROUP_BY_PREFIX}2" for "tests/api".'
              f' Default: "{DEFAULT_GROUP_BY}"',
     )
     group.addoption(
@@ -74,8 +126,29 @@ def pytest_addoption(parser: "Parser", pluginmanager: "PytestPluginManager") ->
         metavar="SECTIONS",
         type=parse_categories,
         default=DEFAULT_SHOW_SECTIONS,
-        help='Comma-separated list of report sections to show: "fixture", "call",'
-             ' "setup", "teardown". Default: show all sections.',
+        help='Comma-separated list of report sections to show: "fixture", "call", "setup", "teardown",'
+             ' "collect", "session", "param", "outcome". Only the shown sections of the last four are recorded'
+             ' and exported. Default: "fixture,call,setup,teardown"',
+    )
+    group.addoption(
+        "--pytest-durations-outcomes",
+        metavar="OUTCOMES",
+        type=parse_outcomes,
+        default=OUTCOMES,
+        help='Comma-separated list of final test outcomes to report test setup, call and teardown durations of:'
+             ' "passed", "failed", "error", "skipped", "xfailed", "xpassed". Durations of every outcome are also'
+             ' added up in the outcome section. Default: all outcomes.',
+    )
+    group.addoption(
+        "--pytest-durations-cold",
+        metavar="K",
+        type=int,
+        default=DEFAULT_COLD_SAMPLES,
+        help=f"Keep the first K samples of every key apart as cold, for test phases those of the first K tests"
+             f' of every module. Adds "cold" (total of cold samples) and "warm" (median of the other samples)'
+             f' columns to the report and stats to the JSON export, and a "cold start by module" section with'
+             f" the time the first tests of a module take beyond the steady state."
+             f" Default: {DEFAULT_COLD_SAMPLES} (disabled)",
     )
     group.addoption(
         "--pytest-durations-columns",
@@ -83,10 +156,123 @@ def pytest_addoption(parser: "Parser", pluginmanager: "PytestPluginManager") ->
         type=parse_columns,
         default=DEFAULT_COLUMNS,
         help='Comma-separated list of stat columns to show: "total", "num", "min",'
-             ' "med", "max", "p90", "p95", "p99". The test/fixture name is always shown second, and the'
-             ' first listed column is used to sort the report.'
+             ' "med", "max", "p90", "p95", "p99", "prev", "delta", "trend" (against previous runs),'
+             ' "base", "diff", "ratio" with --pytest-durations-compare, and "cold", "warm" with'
+             ' --pytest-durations-cold.'
+             ' The test/fixture name is always shown second, and the first listed column is used to sort'
+             ' the report.'
              f' Default: {",".join(DEFAULT_COLUMNS)}.',
     )
+    group.addoption(
+        "--pytest-durations-trend-alpha",
+        metavar="A",
+        type=float,
+        default=DEFAULT_TREND_ALPHA,
+        help=f"Weight of the latest run in the moving average of durations stored in the pytest cache"
+             f' for the "prev", "delta" and "trend" columns, run ordering, scheduling and sharding'
+             f' (0 to stop storing them). Sharded runs only read them.'
+             f" Default {DEFAULT_TREND_ALPHA}",
+    )
+    group.addoption(
+        "--pytest-durations-collect-imports",
+        action="store_true",
+        default=False,
+        help='Also record the import time of every top-level package first imported during the collection'
+             ' as "import PACKAGE" in the "collect" section, excluded from the collection time of the file'
+             ' or directory importing it. Requires the "collect" section in --pytest-durations-show.',
+    )
+    group.addoption(
+        "--pytest-durations-hooks",
+        action="store_true",
+        default=False,
+        help="Time every hook implementation through the plugin manager hook call monitoring and report"
+             " the self time of every plugin and hook name in a separate section.",
+    )
+    group.addoption(
+        "--pytest-durations-order",
+        type=RunOrder,
+        default=None,
+        choices=[*RunOrder],
+        help="Reorder collected tests by their moving average durations stored in the pytest cache,"
+             " keeping tests of the same shared fixture parameters, directory, module and class together."
+             ' "slowest-first" shortens the tail of pytest-xdist runs, "fastest-first" gives faster feedback with -x.',
+    )
+    group.addoption(
+        "--pytest-durations-eta",
+        action="store_true",
+        default=False,
+        help="Show the predicted remaining time in the progress line, based on test durations stored in the"
+             " pytest cache and corrected by the ratio of elapsed to predicted time of finished tests.",
+    )
+    group.addoption(
+        "--pytest-durations-eta-file",
+        metavar="FILE",
+        default=None,
+        help="Write the number of finished and total tests, the elapsed and the predicted remaining time"
+             " as JSON to FILE, replaced at most once per second, e.g. for CI dashboards.",
+    )
+    group.addoption(
+        "--pytest-durations-budget-action",
+        type=BudgetAction,
+        default=DEFAULT_BUDGET_ACTION,
+        choices=[*BudgetAction],
+        help=f"What to do when a test phase exceeds its budget, set by the @pytest.mark.{BUDGET_MARKER}"
+             f" marker or per directory by the {BUDGET_INI} ini option: warn, mark the test as xfailed"
+             f" (teardown overruns are only warned about), or fail it."
+             f' Default: "{DEFAULT_BUDGET_ACTION}"',
+    )
+    group.addoption(
+        "--pytest-durations-xdist-flush",
+        metavar="SECONDS",
+        type=float,
+        default=DEFAULT_XDIST_FLUSH,
+        help=f"Minimal interval between pytest-xdist workers sending recorded measurements to the controller"
+             f" (0 to send them after every test). Default {DEFAULT_XDIST_FLUSH}",
+    )
+    group.addoption(
+        "--pytest-durations-xdist-spool",
+        action="store_true",
+        default=False,
+        help="Let pytest-xdist workers also write measurements not sent yet to files in a local temporary"
+             " directory, flushed after every test, to recover them if a worker crashes."
+             " Remote workers without access to the directory skip it.",
+    )
+    group.addoption(
+        "--pytest-durations-schedule",
+        metavar="SOURCE",
+        type=str,
+        default=None,
+        help='Schedule pytest-xdist tests longest first using their durations in previous runs, read from'
+             ' "cache" (moving averages, see --pytest-durations-trend-alpha) or from a JSON or binary export.'
+             ' Tests without known durations are load-scheduled after them. Overrides --dist.',
+    )
+    group.addoption(
+        "--pytest-durations-shard",
+        metavar="K/N",
+        type=parse_shard,
+        default=None,
+        help="Split the collected tests into N shards with roughly equal predicted durations and run only"
+             " the K-th one. Run every shard with the same options; shards do not update the recorded"
+             " durations, so all of them are split alike.",
+    )
+    group.addoption(
+        "--pytest-durations-shard-group-by",
+        type=GroupBy,
+        default=DEFAULT_SHARD_GROUP_BY,
+        choices=[*GroupBy],
+        help=f'Keep tests of the same module, class, or function in the same shard.'
+             f' Default: "{DEFAULT_SHARD_GROUP_BY}"',
+    )
+    group.addoption(
+        "--pytest-durations-shard-history",
+        metavar="SOURCE",
+        type=str,
+        default=DEFAULT_SHARD_HISTORY,
+        help=f'Test durations to split shards by: "cache" (moving averages recorded by unsharded runs, see'
+             f' --pytest-durations-trend-alpha) or a JSON or binary export.'
+             f' Tests without known durations are predicted to take the mean duration.'
+             f' Default: "{DEFAULT_SHARD_HISTORY}"',
+    )
     group.addoption(
         "--pytest-durations-json",
         metavar="FILE",
@@ -95,13 +281,124 @@ def pytest_addoption(parser: "Parser", pluginmanager: "PytestPluginManager") ->
         help='Export timing data as JSON to FILE (use "-" for stdout).'
              ' Written in addition to the terminal report unless --pytest-durations=0.',
     )
+    group.addoption(
+        "--pytest-durations-json-samples",
+        action="store_true",
+        default=False,
+        help="Add raw timing samples to the JSON export, so exports of several runs or shards can be"
+             " merged by the `pytest-durations report` command.",
+    )
+    group.addoption(
+        "--pytest-durations-binary",
+        metavar="FILE",
+        type=str,
+        default=None,
+        help="Export raw timing samples to FILE in a compact binary columnar format."
+             " Written in addition to the terminal report unless --pytest-durations=0.",
+    )
+    group.addoption(
+        "--pytest-durations-binary-compression",
+        type=Compression,
+        default=DEFAULT_BINARY_COMPRESSION,
+        choices=[*Compression],
+        help=f'Compression of the binary export sample blocks.'
+             f' Default: "{DEFAULT_BINARY_COMPRESSION}"',
+    )
+    group.addoption(
+        "--pytest-durations-db",
+        metavar="PATH",
+        type=str,
+        default=None,
+        help="Append per-test aggregates of the session to a SQLite history database at PATH."
+             " Use the `pytest-durations trend` command to query it.",
+    )
+    group.addoption(
+        "--pytest-durations-db-samples",
+        action="store_true",
+        default=False,
+        help="Store every raw timing sample in the history database in addition to the aggregates.",
+    )
+    group.addoption(
+        "--pytest-durations-openmetrics",
+        metavar="FILE",
+        type=str,
+        default=None,
+        help="Atomically write duration histograms to FILE in the OpenMetrics text format, e.g. for the"
+             " node_exporter textfile collector.",
+    )
+    group.addoption(
+        "--pytest-durations-openmetrics-buckets",
+        metavar="SECONDS",
+        type=parse_buckets,
+        default=DEFAULT_OPENMETRICS_BUCKETS,
+        help=f"Comma-separated histogram bucket upper bounds in seconds."
+             f' Default: {",".join(map(str, DEFAULT_OPENMETRICS_BUCKETS))}',
+    )
+    group.addoption(
+        "--pytest-durations-openmetrics-group-by",
+        type=GroupBy,
+        default=DEFAULT_OPENMETRICS_GROUP_BY,
+        choices=[*GroupBy],
+        help=f'Group keys into the histogram "group" label by module, class, or function.'
+             f' Default: "{DEFAULT_OPENMETRICS_GROUP_BY}"',
+    )
+    group.addoption(
+        "--pytest-durations-compare",
+        metavar="FILE",
+        type=str,
+        default=None,
+        help="Compare durations against a baseline JSON or binary export of a previous run."
+             " Adds base, diff and ratio columns and a regressions section to the report.",
+    )
+    group.addoption(
+        "--pytest-durations-compare-ratio",
+        metavar="R",
+        type=float,
+        default=DEFAULT_COMPARE_RATIO,
+        help=f"Minimal ratio of mean to baseline mean duration to flag a regression. Raw baseline"
+             f" samples (binary export or JSON export with samples) are also required to pass a rank test."
+             f" Default {DEFAULT_COMPARE_RATIO}",
+    )
+    group.addoption(
+        "--pytest-durations-compare-budget",
+        metavar="SECONDS",
+        type=float,
+        default=None,
+        help="Fail the run when flagged regressions add more than SECONDS in total.",
+    )
+    parser.addini(
+        BUDGET_INI,
+        type="linelist",
+        default=[],
+        help="Default duration budgets of tests per directory, one directory per line followed by"
+             ' PHASE=SECONDS pairs of setup, call or teardown, e.g. "tests/unit call=0.5 setup=2".',
+    )
+
+
+def pytest_load_initial_conftests(early_config: "Config") -> None:
+    """Remember when the initial conftest files start loading, before the plugin is configured."""
+    early_config.stash[STARTED_KEY] = get_current_ticks()
 
 
 def pytest_configure(config: "Config") -> None:
     """Configure plugin options using command line arguments."""
-    if not config.getoption("--pytest-durations") and not config.getoption("--pytest-durations-json"):
-        return
+    config.addinivalue_line(
+        "markers",
+        f"{BUDGET_MARKER}(setup=None, call=None, teardown=None): duration budgets of test phases in seconds.",
+    )
+    budgets = config.getoption("--pytest-durations-budget-action") is not BudgetAction.WARN or config.getini(BUDGET_INI)
+    if config.getoption("--pytest-durations") or any(map(config.getoption, EXPORT_OPTIONS)) or budgets:
+        _register_plugin(config)
+
+
+def pytest_collection_modifyitems(config: "Config", items: list["pytest.Item"]) -> None:
+    """Register the plugin with the terminal report disabled as well, if a collected test has a duration budget."""
+    if not config.stash.get(REGISTERED_KEY, False) and any(item.get_closest_marker(BUDGET_MARKER) for item in items):
+        _register_plugin(config)
+
 
+def _register_plugin(config: "Config") -> None:
+    """Register the measuring plugin, combined with the pytest-xdist support if available."""
     from pytest_durations.plugin import PytestDurationPlugin  # noqa: PLC0415
 
     pluginmanager = config.pluginmanager
@@ -111,4 +408,5 @@ def pytest_configure(config: "Config") -> None:
 
         PytestDurationPlugin = type("PytestDurationPlugin", (PytestDurationPlugin, PytestDurationXdistMixin), {})  # noqa: N806
 
-    pluginmanager.register(PytestDurationPlugin())
+    pluginmanager.register(PytestDurationPlugin(started=config.stash.get(STARTED_KEY, None)))
+    config.stash[REGISTERED_KEY] = True
@@ -0,0 +1,130 @@
+"""Ordering of collected tests by their recorded durations."""
+from __future__ import annotations
+
+from itertools import repeat
+from operator import add, attrgetter, or_
+from typing import TYPE_CHECKING
+
+from pytest_durations.helpers import is_shared_fixture
+from pytest_durations.types import RunOrder
+
+if TYPE_CHECKING:
+    from collections.abc import Hashable, Iterable, Mapping, Sequence
+
+    from _pytest.nodes import Item
+
+    from pytest_durations.trends import KeyTrends
+    from pytest_durations.typing import CategoryT
+
+# scopes of fixtures shared across modules, which must not be split by the module blocks
+_WIDE_SCOPES = frozenset(("session", "package"))
+
+
+class _Block:
+    """Items sharing the same outer blocks, with nested blocks gathered in the order of first occurrence."""
+
+    __slots__ = ("children", "indices", "total")
+
+    children: dict[Hashable, _Block]  # block name → nested block
+    indices: list[int]                # items of the block itself
+    total: float                      # total duration of all items in the block and nested blocks
+
+    def __init__(self):
+        self.children = {}
+        self.indices = []
+        self.total = 0.0
+
+    def add_ordered_indices(self, result: list[int], weights: Sequence[float], *, reverse: bool) -> None:
+        """Append item indices of the block, then of nested blocks ordered by their totals, to a list.
+
+        Sorting is stable also in reverse, so blocks and items of equal durations keep the collection order.
+        """
+        result.extend(sorted(self.indices, key=weights.__getitem__, reverse=reverse))
+        for child in sorted(self.children.values(), key=attrgetter("total"), reverse=reverse):
+            child.add_ordered_indices(result, weights, reverse=reverse)
+
+
+def get_ordered_items(
+    items: Sequence[Item],
+    durations: Sequence[float | None],
+    order: RunOrder,
+) -> list[Item]:
+    """Return items ordered by their durations while keeping fixture-scope locality.
+
+    Items are ordered in nested blocks: groups of the same parameters of session and package
+    scoped fixtures, directories, modules, classes, and groups of the same parameters of module
+    and class scoped fixtures, each ordered by their total duration, then the items of a block
+    by their own. So every shared fixture instance is still set up once per block. Items without
+    a recorded duration are predicted to take the mean duration of the recorded ones, ties keep
+    the collection order.
+
+    :param items: Collected test items.
+    :param durations: Recorded duration of every item, None if unknown.
+    :param order: Requested order.
+    :return: Reordered items.
+    """
+    known = [duration for duration in durations if duration is not None]
+    default = sum(known) / len(known) if known else 0.0
+    weights = [default if duration is None else duration for duration in durations]
+    root = _Block()
+    for index, item in enumerate(items):
+        weight = weights[index]
+        block = root
+        for name in _get_blocks(item):
+            child = block.children.get(name)
+            if child is None:
+                child = block.children[name] = _Block()
+            child.total += weight
+            block = child
+        block.indices.append(index)
+    indices: list[int] = []
+    root.add_ordered_indices(indices, weights, reverse=order is RunOrder.SLOWEST_FIRST)
+    return [items[index] for index in indices]
+
+
+def get_trend_durations(
+    nodeids: Sequence[str],
+    trends: Mapping[CategoryT, KeyTrends],
+    categories: Sequence[CategoryT],
+) -> list[float | None]:
+    """Return moving average durations of tests summed up over categories, None if unknown.
+
+    Columns of every category are combined by built-in maps, so lookups do not loop in Python per category.
+    """
+    totals: Iterable[float] = repeat(0.0, len(nodeids))
+    known: Iterable[bool] = [False] * len(nodeids)
+    for category in categories:
+        if category not in trends:
+            continue
+        ewmas = trends[category].get_ewmas()
+        totals = list(map(add, totals, map(ewmas.get, nodeids, repeat(0.0))))
+        known = list(map(or_, known, map(ewmas.__contains__, nodeids)))
+    return [total if is_known else None for total, is_known in zip(totals, known, strict=True)]
+
+
+def _get_blocks(item: Item) -> tuple[Hashable, ...]:
+    """Return the blocks of an item, from outer to inner.
+
+    Parameters of session and package scoped fixtures come first, then the directories, module
+    and classes of the item, and parameters of module and class scoped fixtures last. Blocks are
+    told apart from their siblings only, so names of the directories, module and classes suffice.
+    """
+    path, *classes = item.nodeid.rpartition("::")[0].split("::")
+    if getattr(item, "callspec", None) is None:
+        return (), *path.split("/"), *classes, ()
+    wide_params, narrow_params = _get_shared_params(item)
+    return wide_params, *path.split("/"), *classes, narrow_params
+
+
+def _get_shared_params(item: Item) -> tuple[tuple[tuple[str, int], ...], tuple[tuple[str, int], ...]]:
+    """Return parameter indices of session or package scoped and of other shared fixtures of an item."""
+    name2fixturedefs = item._fixtureinfo.name2fixturedefs  # noqa: SLF001
+    shared = [
+        (name2fixturedefs[name][-1].scope, (name, index))
+        for name, index in sorted(item.callspec.indices.items())
+        if name in name2fixturedefs and is_shared_fixture(name2fixturedefs[name][-1])
+    ]
+    return (
+        tuple(param for scope, param in shared if scope in _WIDE_SCOPES),
+        tuple(param for scope, param in shared if scope not in _WIDE_SCOPES),
+    )
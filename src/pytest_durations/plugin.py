@@ -1,39 +1,106 @@
 """Plugin main implementation logic."""
+import math
 from collections.abc import Iterable
 from contextlib import ExitStack, contextmanager
-from itertools import count
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
 import pytest
 
+from pytest_durations.binary_exporter import export_binary
+from pytest_durations.budgets import (
+    BudgetViolationT,
+    DurationBudgetWarning,
+    enforce_budget,
+    get_budget_action,
+    get_item_budgets,
+    parse_directory_budgets,
+)
+from pytest_durations.cold import ColdSamples, get_cold_start_rows
+from pytest_durations.comparison import (
+    find_regressions,
+    get_baseline_means,
+    get_grouped_baseline,
+    load_baseline,
+)
+from pytest_durations.database import export_database
+from pytest_durations.eta import STATUS_INTERVAL, RemainingTimeEstimator, add_eta_to_progress, write_eta_status
 from pytest_durations.helpers import (
-    get_fixture_grouping_func,
+    filter_outcomes,
+    get_category_grouping_func,
+    get_collect_key,
     get_fixture_key,
     get_grouped_measurements,
+    get_marker_tags,
+    get_param_keys,
+    get_report_outcome,
     get_test_grouping_func,
     get_test_key,
     is_shared_fixture,
+    is_xdist_worker,
 )
+from pytest_durations.history import TEST_CATEGORIES, load_cached_trends, load_history
+from pytest_durations.hooks import HookTimer, get_hook_rows
+from pytest_durations.imports import ImportTimer
 from pytest_durations.json_exporter import export_json
 from pytest_durations.measure import MeasureDuration
-from pytest_durations.options import DEFAULT_RESULT_LOG
+from pytest_durations.openmetrics import DurationHistograms, export_openmetrics
+from pytest_durations.options import BUDGET_INI, DEFAULT_RESULT_LOG
+from pytest_durations.ordering import get_ordered_items, get_trend_durations
+from pytest_durations.rebuilds import FixtureRebuilds, get_rebuild_rows
 from pytest_durations.reporting import (
-    get_report_rows,
-    get_selected_max_widths,
-    report_column_fields,
+    ReportOptionsT,
+    get_max_duration,
+    get_report_sections,
+    get_table_lines,
+    get_table_widths,
     resolve_time_format,
 )
+from pytest_durations.retries import RetryCosts, get_retry_rows
+from pytest_durations.sharding import select_shard
+from pytest_durations.spool import MeasurementSpool
 from pytest_durations.ticker import get_current_ticks
-from pytest_durations.types import COLUMN_NAMES, Category
+from pytest_durations.timeline import SessionTimeline
+from pytest_durations.trends import (
+    TRENDS_CACHE_DIR,
+    TRENDS_FILENAME,
+    get_grouped_trends,
+    load_trends,
+    save_trends,
+    update_trends,
+)
+from pytest_durations.types import (
+    COLD_COLUMNS,
+    COMPARE_COLUMNS,
+    DEFAULT_COLUMNS,
+    OUTCOMES,
+    PRIMARY_CATEGORIES,
+    TREND_COLUMNS,
+    BudgetAction,
+    Category,
+    GroupBy,
+    MarkerGroupBy,
+    PathGroupBy,
+    RunOrder,
+)
+from pytest_durations.utilization import WorkerStats, get_utilization, get_utilization_rows
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
+
     from _pytest.config import Config, ExitCode
     from _pytest.fixtures import FixtureDef, SubRequest
-    from _pytest.nodes import Item
+    from _pytest.main import Session
+    from _pytest.nodes import Collector, Item
+    from _pytest.runner import CallInfo
     from _pytest.terminal import TerminalReporter
 
-    from pytest_durations.typing import CategoryMeasurementsT, FunctionKeyT
+    from pytest_durations.comparison import CategoryBaselineT, RegressionT
+    from pytest_durations.trends import TrendT
+    from pytest_durations.typing import CategoryMeasurementsT, CategoryT, FunctionKeyT
+
+# outcomes of test attempts which rerun plugins retry
+_RETRIED_OUTCOMES = frozenset(("failed", "error"))
 
 
 class PytestDurationPlugin:
@@ -42,12 +109,179 @@ class PytestDurationPlugin:
     measurements: "CategoryMeasurementsT"
     shared_fixture_duration: float
     last_fixture_teardown_start: float
+    baseline_export: "CategoryBaselineT | None"  # baseline export loaded at session start, if comparing
+    baseline: dict["CategoryT", dict["FunctionKeyT", float]] | None  # grouped baseline means
+    regressions: list["RegressionT"]
+    trends: dict["CategoryT", dict["FunctionKeyT", "TrendT"]] | None  # grouped timing data of previous runs
+    histograms: DurationHistograms | None  # updated on every sample if the OpenMetrics export is requested
+    workers: dict[str, WorkerStats]  # pytest-xdist worker utilization, filled on the controller
+    spool: MeasurementSpool | None  # every sample is spooled on pytest-xdist workers
+    eta: RemainingTimeEstimator | None  # remaining time prediction, if requested
+    eta_file: str | None
+    eta_written: float  # ticks of the latest status file write
+    budgets: dict["CategoryT", dict["FunctionKeyT", float]]  # duration budgets resolved at collection time
+    budget_violations: list[BudgetViolationT]
+    budget_violation: BudgetViolationT | None  # violation of the running test phase, until it is reported
+    collect_nesting: list[float]  # time of nested collections and timed imports, per running collection
+    timeline: SessionTimeline
+    hooks: HookTimer | None  # hook implementation counters, if requested
+    rebuilds: FixtureRebuilds  # instantiations of shared fixtures
+    running_test: "FunctionKeyT | None"  # key of the test being set up or called
+    running_item: "Item | None"  # item of the test being set up or called, to tell retries from duplicates
+    test_duration: float  # wall time of the phases of the running test, including shared fixtures
+    own_duration: float  # time of the phases of the running test, excluding shared fixtures
+    param_keys: dict["FunctionKeyT", tuple["FunctionKeyT", ...]]  # test key → keys of its parameter values
+    marker_tags: dict["FunctionKeyT", str]  # test key → group key, if tests are grouped by markers
+    retries: RetryCosts  # retried attempts of flaky tests
+    attempt_samples: list[tuple["CategoryT", "FunctionKeyT", float]]  # samples recorded by the running test attempt
+    test_outcome: str  # outcome of the first phase of the running test which did not pass
+    outcomes: dict["FunctionKeyT", str]  # test key → final outcome
+    cold: ColdSamples | None  # first samples of every key, if requested
 
-    def __init__(self):
+    def __init__(self, started: float | None = None):
         super().__init__()
-        self.measurements = {category: {} for category in Category}
+        self.measurements = {category: {} for category in PRIMARY_CATEGORIES}
         self.shared_fixture_duration = 0.0
         self.last_fixture_teardown_start = 0.0
+        self.baseline_export = None
+        self.baseline = None
+        self.regressions = []
+        self.trends = None
+        self.histograms = None
+        self.workers = {}
+        self.spool = None
+        self.eta = None
+        self.eta_file = None
+        self.eta_written = 0.0
+        self.budgets = {category: {} for category in Category}
+        self.budget_violations = []
+        self.budget_violation = None
+        self.collect_nesting = []
+        self.timeline = SessionTimeline(started=get_current_ticks() if started is None else started)
+        self.hooks = None
+        self.rebuilds = FixtureRebuilds()
+        self.running_test = None
+        self.running_item = None
+        self.test_duration = 0.0
+        self.own_duration = 0.0
+        self.param_keys = {}
+        self.marker_tags = {}
+        self.retries = RetryCosts()
+        self.attempt_samples = []
+        self.test_outcome = "passed"
+        self.outcomes = {}
+        self.cold = None
+
+    def pytest_sessionstart(self, session: "Session") -> None:
+        """Prepare categories of shown sections, the baseline and OpenMetrics histograms, and start timing hooks.
+
+        A baseline export which cannot be read is a usage error, reported before any test runs.
+        """
+        self.timeline.session_started = get_current_ticks()
+        config = session.config
+        shown = config.getoption("--pytest-durations-show")
+        self.measurements = {
+            category: {} for category in Category if category in PRIMARY_CATEGORIES or category in shown
+        }
+        baseline_file = config.getoption("--pytest-durations-compare")
+        if baseline_file and not is_xdist_worker(config):
+            try:
+                self.baseline_export = load_baseline(baseline_file)
+            except (OSError, ValueError) as exc:
+                message = f"--pytest-durations-compare: {exc}"
+                raise pytest.UsageError(message) from exc
+        if config.getoption("--pytest-durations-openmetrics"):
+            self.histograms = DurationHistograms(buckets=config.getoption("--pytest-durations-openmetrics-buckets"))
+        cold_samples = config.getoption("--pytest-durations-cold")
+        if cold_samples > 0:
+            self.cold = ColdSamples(limit=cold_samples)
+        if config.getoption("--pytest-durations-hooks"):
+            self.hooks = HookTimer()
+            self.hooks.install(config.pluginmanager)
+            config.add_cleanup(self.hooks.uninstall)
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_collection_modifyitems(self, session: "Session", config: "Config", items: list["Item"]) -> None:
+        """Deselect tests outside of the requested duration-balanced shard and order the rest by duration."""
+        shard = config.getoption("--pytest-durations-shard")
+        if shard is not None:
+            self._select_shard(config=config, items=items, shard=shard)
+        order = config.getoption("--pytest-durations-order")
+        if order is not None:
+            self._order_items(config=config, items=items, order=order)
+
+    def pytest_collection_finish(self, session: "Session") -> None:
+        """Resolve duration budgets and parameter keys of collected tests and start predicting their remaining time."""
+        self.param_keys = {get_test_key(item): keys for item in session.items if (keys := get_param_keys(item))}
+        group_by = session.config.getoption("--pytest-durations-group-by")
+        if isinstance(group_by, MarkerGroupBy):
+            self.marker_tags.update(get_marker_tags(session.items, names=group_by.names))
+        directory_budgets = parse_directory_budgets(session.config.getini(BUDGET_INI))
+        self.budgets.update(get_item_budgets(session.items, directory_budgets=directory_budgets))
+        if not is_xdist_worker(session.config):
+            self._start_eta(config=session.config, nodeids=[item.nodeid for item in session.items])
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_logfinish(self, nodeid: str, location: tuple[str, int | None, str]) -> None:
+        """Update the remaining time prediction with a finished test."""
+        if self.eta is None:
+            return
+        self.eta.finish(nodeid)
+        now = get_current_ticks()
+        if self.eta_file and (now - self.eta_written >= STATUS_INTERVAL or not self.eta.predictions):
+            self.eta_written = now
+            write_eta_status(self.eta_file, estimator=self.eta, now=now)
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item: "Item", call: "CallInfo[None]") -> None:
+        """Apply the configured action to a test phase which exceeded its duration budget.
+
+        Records the wall time of a test by its final outcome once its teardown is reported. Failed phases
+        of retried tests are remembered as the outcome of their final attempt.
+        """
+        outcome = yield
+        report = outcome.get_result()
+        violation = self.budget_violation
+        if violation is not None:
+            self.budget_violation = None
+            action = item.config.getoption("--pytest-durations-budget-action")
+            enforce_budget(report, violation=violation, action=action)
+        if report.failed:
+            self.retries.add_failure(get_test_key(item))
+        if self.test_outcome == "passed":
+            self.test_outcome = get_report_outcome(report)
+        if report.when == "teardown":
+            self.outcomes[get_test_key(item)] = self.test_outcome
+            self._record(Category.OUTCOME, self.test_outcome, self.test_duration)
+            if self.cold is not None:
+                self.cold.add_test(get_test_key(item), self.test_duration)
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_collection(self, session: "Session") -> None:
+        """Measure the collection phase and time first imports of top-level packages, if requested."""
+        self.timeline.collection_started = get_current_ticks()
+        import_timer = None
+        if session.config.getoption("--pytest-durations-collect-imports"):
+            import_timer = ImportTimer(record=self._record_import)
+            import_timer.install()
+        yield
+        if import_timer is not None:
+            import_timer.uninstall()
+        self.timeline.collection_finished = get_current_ticks()
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_make_collect_report(self, collector: "Collector") -> None:
+        """Measure collection of a directory or a file, including imports of conftest and test modules.
+
+        Excludes time taken by nested collections and timed package imports, so that durations add up.
+        """
+        with self._measure(Category.COLLECT, get_collect_key(collector)) as measurement:
+            self.collect_nesting.append(0.0)
+            yield
+            nested = self.collect_nesting.pop()
+            measurement.duration -= nested
+        if self.collect_nesting:
+            self.collect_nesting[-1] += measurement.duration + nested
 
     @pytest.hookimpl(hookwrapper=True)
     def pytest_fixture_setup(self, fixturedef: "FixtureDef", request: "SubRequest") -> Any | None:
@@ -60,6 +294,13 @@ class PytestDurationPlugin:
         if is_shared_fixture(fixturedef):
             # for shared fixtures, store their last setup duration
             self.shared_fixture_duration += measurement.duration
+            self.rebuilds.add_setup(
+                fixture_key,
+                scope_id=request.node.nodeid,
+                param_index=request.param_index,
+                test_id=self.running_test,
+                duration=measurement.duration,
+            )
 
     def pytest_fixture_post_finalizer(self, fixturedef: "FixtureDef", request: "SubRequest") -> None:
         """Calculate fixture teardown execution duration."""
@@ -68,26 +309,43 @@ class PytestDurationPlugin:
             # for shared scope fixture teardowns, store their last duration
             duration = teardown_end - self.last_fixture_teardown_start
             self.shared_fixture_duration += duration
+            self.rebuilds.add_teardown(get_fixture_key(fixturedef=fixturedef, item=request.node), duration)
         # last fixture duration should always be updated
         self.last_fixture_teardown_start = teardown_end
 
     @pytest.hookimpl(hookwrapper=True)
     def pytest_runtest_call(self, item: "Item") -> None:
         """Measure test execution duration."""
-        with self._measure(Category.TEST_CALL, get_test_key(item)):
+        with self._measure(Category.TEST_CALL, get_test_key(item)) as measurement:
             yield
+        self._add_phase_time(measurement)
+        self._warn_budget(item)
 
     @pytest.hookimpl(hookwrapper=True)
     def pytest_runtest_setup(self, item: "Item") -> None:
         """Measure test fixtures preparing time.
 
-        Excludes time taken by setting up of shared fixtures.
+        Excludes time taken by setting up of shared fixtures. The same item set up again right after a
+        failed attempt is retried, samples of its previous attempt are moved out of the measurements into
+        its retry cost. Duplicates of a test (``--keep-duplicates``) are separate items with the same key.
         """
+        key = get_test_key(item)
+        if item is self.running_item and self.test_outcome in _RETRIED_OUTCOMES:
+            self._discard_attempt(key)
+        self.rebuilds.start_attempt()
+        self.running_test = key
+        self.running_item = item
+        self.test_duration = 0.0
+        self.own_duration = 0.0
+        self.test_outcome = "passed"
+        self.attempt_samples = []
         with self._measure(Category.TEST_SETUP, get_test_key(item)) as measurement:
             yield
             # subtract time taken by shared fixture initializations (if any)
             measurement.duration -= self.shared_fixture_duration
+        self._add_phase_time(measurement)
         self.shared_fixture_duration = 0.0
+        self._warn_budget(item)
 
     @pytest.hookimpl(hookwrapper=True)
     def pytest_runtest_teardown(self, item: "Item") -> None:
@@ -100,7 +358,28 @@ class PytestDurationPlugin:
             yield
             # subtract time taken by shared fixture finalizations (if any)
             measurement.duration -= self.shared_fixture_duration
+        self._add_phase_time(measurement)
         self.shared_fixture_duration = 0.0
+        self._warn_budget(item)
+        for param_key in self.param_keys.get(get_test_key(item), ()):
+            self._record(Category.PARAM, param_key, self.own_duration)
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtestloop(self, session: "Session") -> None:
+        """Measure the test loop and compare measurements against a baseline once all tests have run.
+
+        Fails the session if flagged regressions exceed the configured budget.
+        """
+        self.timeline.loop_started = get_current_ticks()
+        yield
+        self.timeline.loop_finished = get_current_ticks()
+        if self.baseline_export is None:
+            return
+        config = session.config
+        self._compare(config=config, baseline=self.baseline_export)
+        budget = config.getoption("--pytest-durations-compare-budget")
+        if budget is not None and sum(regression.cost for regression in self.regressions) > budget:
+            session.testsfailed += 1
 
     def pytest_terminal_summary(
         self,
@@ -111,77 +390,490 @@ class PytestDurationPlugin:
         """Write the measured time to a terminal reporter or to a file."""
         durations = config.getoption("--pytest-durations")
         result_log = config.getoption("--pytest-durations-log")
+        if is_xdist_worker(config):
+            # workers send their measurements to the controller, which exports and reports them
+            return
+        self._record_timeline()
+        self._update_trends(config=config)
+        self._export(config=config)
+        if durations:
+            with ExitStack() as stack:
+                reporter = terminalreporter
+                if result_log != DEFAULT_RESULT_LOG:
+                    result_log_fp = stack.enter_context(Path(result_log).open(mode="a"))
+                    reporter = type(terminalreporter)(config=config, file=result_log_fp)
+                self._report_summary(terminalreporter=reporter, config=config)
+        self._report_regression_budget(terminalreporter=terminalreporter, config=config)
+
+    def _export(self, config: "Config") -> None:
+        """Write the measured time to the requested export files."""
         json_output = config.getoption("--pytest-durations-json")
         if json_output:
-            export_json(measurements=self.measurements, filename=json_output)
-        if not durations:
+            samples = config.getoption("--pytest-durations-json-samples")
+            cold = self.cold.samples if self.cold is not None else None
+            export_json(measurements=self.measurements, filename=json_output, samples=samples, cold=cold)
+        binary_output = config.getoption("--pytest-durations-binary")
+        if binary_output:
+            compression = config.getoption("--pytest-durations-binary-compression")
+            export_binary(measurements=self.measurements, filename=binary_output, compression=compression)
+        database = config.getoption("--pytest-durations-db")
+        if database:
+            samples = config.getoption("--pytest-durations-db-samples")
+            export_database(measurements=self.measurements, filename=database, samples=samples)
+        openmetrics_output = config.getoption("--pytest-durations-openmetrics")
+        if openmetrics_output:
+            group_by = config.getoption("--pytest-durations-openmetrics-group-by")
+            export_openmetrics(histograms=self.histograms, filename=openmetrics_output, group_by=group_by)
+
+    def _select_shard(self, config: "Config", items: list["Item"], shard: tuple[int, int]) -> None:
+        """Deselect tests outside of a duration-balanced shard."""
+        durations = load_history(config=config, source=config.getoption("--pytest-durations-shard-history"))
+        grouping_func = get_test_grouping_func(group_by=config.getoption("--pytest-durations-shard-group-by"))
+        items[:], deselected = select_shard(items, shard=shard, durations=durations, grouping_func=grouping_func)
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+
+    def _order_items(self, config: "Config", items: list["Item"], order: RunOrder) -> None:
+        """Order tests by their moving average durations stored in the pytest cache."""
+        durations = self._get_recorded_durations(config=config, nodeids=[item.nodeid for item in items])
+        items[:] = get_ordered_items(items, durations=durations, order=order)
+
+    def _get_recorded_durations(self, config: "Config", nodeids: list[str]) -> list[float | None]:
+        """Return moving average test durations stored in the pytest cache, None for unknown tests."""
+        trends = load_cached_trends(config, categories=TEST_CATEGORIES)
+        return get_trend_durations(nodeids, trends=trends, categories=TEST_CATEGORIES)
+
+    def _warn_budget(self, item: "Item") -> None:
+        """Warn about a test phase which exceeded its duration budget, if requested.
+
+        The warning is issued within the phase, so warnings turned into errors fail the phase.
+        """
+        violation = self.budget_violation
+        if violation is None:
             return
-        with ExitStack() as stack:
-            if result_log != DEFAULT_RESULT_LOG:
-                result_log_fp = stack.enter_context(Path(result_log).open(mode="a"))
-                terminalreporter = type(terminalreporter)(config=config, file=result_log_fp)
-            self._report_summary(terminalreporter=terminalreporter, config=config)
+        action = get_budget_action(violation, action=item.config.getoption("--pytest-durations-budget-action"))
+        if action is BudgetAction.WARN:
+            item.warn(DurationBudgetWarning(violation.message))
+
+    def _start_eta(self, config: "Config", nodeids: list[str]) -> None:
+        """Predict the remaining time by test durations stored in the pytest cache, if requested."""
+        show = config.getoption("--pytest-durations-eta")
+        self.eta_file = config.getoption("--pytest-durations-eta-file")
+        if not show and not self.eta_file:
+            return
+        now = get_current_ticks()
+        durations = self._get_recorded_durations(config=config, nodeids=nodeids)
+        self.eta = RemainingTimeEstimator(nodeids, durations=durations, started=now)
+        terminalreporter = config.pluginmanager.get_plugin("terminalreporter")
+        if show and terminalreporter is not None:
+            add_eta_to_progress(terminalreporter, estimator=self.eta)
+        if self.eta_file:
+            self.eta_written = now
+            write_eta_status(self.eta_file, estimator=self.eta, now=now)
+
+    def _get_group_by(self, config: "Config") -> GroupBy | MarkerGroupBy | PathGroupBy:
+        """Return the configured test grouping, along with the group keys of tests grouped by markers."""
+        group_by = config.getoption("--pytest-durations-group-by")
+        if isinstance(group_by, MarkerGroupBy):
+            return group_by._replace(tags=self.marker_tags)
+        return group_by
+
+    def _update_trends(self, config: "Config") -> None:
+        """Load timing data of previous runs from the pytest cache and store it updated with this session.
+
+        Only fixture and test categories are stored, derived ones are not comparable across runs with
+        other sections shown. Shards only read it: every shard of a run has to be split by the same durations.
+        """
+        alpha = config.getoption("--pytest-durations-trend-alpha")
+        cache = getattr(config, "cache", None)
+        if not alpha or cache is None:
+            return
+        path = cache.mkdir(TRENDS_CACHE_DIR) / TRENDS_FILENAME
+        trends = load_trends(path)
+        if any(column in TREND_COLUMNS for column in config.getoption("--pytest-durations-columns")):
+            # group the previous run data before this session updates it
+            group_by = self._get_group_by(config)
+            self.trends = {
+                category: get_grouped_trends(
+                    values,
+                    grouping_func=get_category_grouping_func(category=category, group_by=group_by),
+                )
+                for category, values in trends.items()
+            }
+        if config.getoption("--pytest-durations-shard") is None:
+            measurements = {category: self.measurements[category] for category in PRIMARY_CATEGORIES}
+            update_trends(trends, measurements=measurements, alpha=alpha)
+            save_trends(path, trends)
+
+    def _compare(self, config: "Config", baseline: "CategoryBaselineT") -> None:
+        """Join grouped measurements with a baseline export and find regressions.
+
+        Regressions are found in the primary categories only, the derived ones count the same time again.
+        """
+        group_by = self._get_group_by(config)
+        ratio = config.getoption("--pytest-durations-compare-ratio")
+        durations_min = config.getoption("--pytest-durations-min")
+        self.baseline = {}
+        self.regressions = []
+        for category, measurements in self.measurements.items():
+            grouping_func = get_category_grouping_func(category=category, group_by=group_by)
+            grouped_baseline = get_grouped_baseline(baseline.get(category, {}), grouping_func=grouping_func)
+            self.baseline[category] = get_baseline_means(grouped_baseline)
+            if category not in PRIMARY_CATEGORIES:
+                continue
+            self.regressions.extend(
+                find_regressions(
+                    category=category,
+                    measurements=get_grouped_measurements(measurements=measurements, grouping_func=grouping_func),
+                    baseline=grouped_baseline,
+                    ratio=ratio,
+                    duration_min=durations_min,
+                ),
+            )
+        self.regressions.sort(key=lambda regression: regression.cost, reverse=True)
 
     def _report_summary(self, terminalreporter: "TerminalReporter", config: "Config") -> None:
         """Write time report to the specified terminal reporter."""
-        fullwidth = terminalreporter._tw.fullwidth  # noqa: SLF001
-        durations = config.getoption("--pytest-durations")
-        durations_min = config.getoption("--pytest-durations-min")
-        reports = []
-        group_by = config.getoption("--pytest-durations-group-by")
-        time_format = config.getoption("--pytest-durations-time-format")
-        test_grouping_func = get_test_grouping_func(group_by=group_by)
-        fixture_grouping_func = get_fixture_grouping_func(group_by=group_by)
-        selected_columns = config.getoption("--pytest-durations-columns")
-        sort_by = COLUMN_NAMES[selected_columns[0]]
-        max_duration = max(
-            (
-                max(times)
-                for measurements in self.measurements.values()
-                for times in measurements.values()
-                if times
-            ),
-            default=0.0,
+        options = ReportOptionsT(
+            max_rows=config.getoption("--pytest-durations"),
+            duration_min=config.getoption("--pytest-durations-min"),
+            group_by=self._get_group_by(config),
+            time_format=config.getoption("--pytest-durations-time-format"),
+            columns=config.getoption("--pytest-durations-columns"),
+            categories=config.getoption("--pytest-durations-show"),
+        )
+        if options.columns == DEFAULT_COLUMNS:
+            options = options._replace(columns=self._get_default_columns())
+        measurements = self._get_report_measurements(config)
+        format_seconds = resolve_time_format(
+            time_format=options.time_format,
+            max_seconds=get_max_duration(measurements),
+        )
+        sections = get_report_sections(
+            measurements=measurements,
+            options=options,
+            format_seconds=format_seconds,
+            baseline=self.baseline,
+            trends=self.trends,
+            cold=self.cold.samples if self.cold is not None else None,
+        )
+        width = max((len(line) for section in sections for line in section.lines), default=0)
+        fullwidth = max(terminalreporter._tw.fullwidth, width)  # noqa: SLF001
+        for section in sections:
+            terminalreporter.write_sep(sep="=", title=section.title, fullwidth=fullwidth)
+            for content in section.lines:
+                terminalreporter.line(content)
+        self._report_analyses(
+            terminalreporter=terminalreporter,
+            config=config,
+            max_rows=options.max_rows,
+            format_seconds=format_seconds,
+            fullwidth=fullwidth,
         )
-        format_seconds = resolve_time_format(time_format=time_format, max_seconds=max_duration)
-        selected_categories = config.getoption("--pytest-durations-show")
-        for category in selected_categories:
-            grouping_func = test_grouping_func if category is not Category.FIXTURE_SETUP else fixture_grouping_func
-            category_measurements = get_grouped_measurements(
-                grouping_func=grouping_func,
-                measurements=self.measurements[category],
+
+    def _report_analyses(
+        self,
+        terminalreporter: "TerminalReporter",
+        config: "Config",
+        max_rows: int,
+        format_seconds: "Callable[[float], str]",
+        fullwidth: int,
+    ) -> None:
+        """Write the sections of analyses following the duration tops, each if it has anything to show."""
+        if self.baseline is not None:
+            self._report_regressions(
+                terminalreporter=terminalreporter,
+                config=config,
+                format_seconds=format_seconds,
+                fullwidth=fullwidth,
             )
-            category_report_rows = get_report_rows(
-                measurements=category_measurements,
-                duration_min=durations_min,
-                max_rows=durations,
-                sort_by=sort_by,
+        if self.budget_violations:
+            self._report_budget_violations(
+                terminalreporter=terminalreporter,
                 format_seconds=format_seconds,
+                fullwidth=fullwidth,
             )
-            reports.append((f"{category} duration top", category_report_rows))
-        rendered_columns = report_column_fields(selected_columns)
-        all_rows = [row for _, rows in reports for row in rows]
-        widths = get_selected_max_widths(all_rows, selected_columns)
-        fullwidth = max(fullwidth, sum(widths) + len(widths) - 1)
-        for section_name, category_report_rows in reports:
-            terminalreporter.write_sep(sep="=", title=section_name, fullwidth=fullwidth)
-            for idx, row in enumerate(category_report_rows):
-                # align columns right except test name column
-                content = " ".join(
-                    f"{getattr(row, col):{'>' if idx and c else '<'}{width}}"
-                    for col, width, c in zip(rendered_columns, widths, count(-1))
-                )
-                terminalreporter.line(content)
+        if any(stats.setups > 1 for stats in self.rebuilds.fixtures.values()):
+            self._report_rebuilds(
+                terminalreporter=terminalreporter,
+                max_rows=max_rows,
+                format_seconds=format_seconds,
+                fullwidth=fullwidth,
+            )
+        if self.retries.tests:
+            self._report_retries(
+                terminalreporter=terminalreporter,
+                max_rows=max_rows,
+                format_seconds=format_seconds,
+                fullwidth=fullwidth,
+            )
+        if self.cold is not None:
+            self._report_cold_starts(
+                terminalreporter=terminalreporter,
+                max_rows=max_rows,
+                format_seconds=format_seconds,
+                fullwidth=fullwidth,
+            )
+        if self.hooks is not None:
+            self._report_hooks(
+                terminalreporter=terminalreporter,
+                max_rows=max_rows,
+                format_seconds=format_seconds,
+                fullwidth=fullwidth,
+            )
+        if self.workers:
+            self._report_workers(
+                terminalreporter=terminalreporter,
+                max_rows=max_rows,
+                format_seconds=format_seconds,
+                fullwidth=fullwidth,
+            )
+
+    def _get_default_columns(self) -> tuple[str, ...]:
+        """Return the default columns, along with comparison and cold sample columns if they are filled."""
+        columns = DEFAULT_COLUMNS
+        if self.baseline is not None:
+            columns = (*columns, *COMPARE_COLUMNS)
+        if self.cold is not None:
+            columns = (*columns, *COLD_COLUMNS)
+        return columns
+
+    def _get_report_measurements(self, config: "Config") -> "CategoryMeasurementsT":
+        """Return measurements to report, restricted to tests of the selected final outcomes."""
+        outcomes = config.getoption("--pytest-durations-outcomes")
+        if outcomes == OUTCOMES:
+            return self.measurements
+        return filter_outcomes(self.measurements, outcomes=self.outcomes, selected=outcomes)
+
+    def _report_regressions(
+        self,
+        terminalreporter: "TerminalReporter",
+        config: "Config",
+        format_seconds: "Callable[[float], str]",
+        fullwidth: int,
+    ) -> None:
+        """Write flagged regressions against the baseline sorted by their cost."""
+        cost = sum(regression.cost for regression in self.regressions)
+        rows = [("cost", "name", "base", "mean", "ratio", "pvalue")]
+        rows.extend(
+            (
+                format_seconds(regression.cost),
+                f"{regression.name} ({regression.category})",
+                format_seconds(regression.base),
+                format_seconds(regression.mean),
+                f"{regression.ratio:.2f}x",
+                f"{regression.pvalue:.4f}" if regression.pvalue is not None else "-",
+            )
+            for regression in self.regressions
+        )
+        rows.append((format_seconds(cost), "grand total", "", "", "", ""))
+        terminalreporter.write_sep(sep="=", title="duration regressions", fullwidth=fullwidth)
+        for content in get_table_lines(rows, get_table_widths(rows)):
+            terminalreporter.line(content)
+
+    def _report_regression_budget(self, terminalreporter: "TerminalReporter", config: "Config") -> None:
+        """Write why the session failed if regressions exceed their budget, whether the report is shown or not."""
+        budget = config.getoption("--pytest-durations-compare-budget")
+        if self.baseline is None or budget is None:
+            return
+        cost = sum(regression.cost for regression in self.regressions)
+        if cost <= budget:
+            return
+        format_seconds = resolve_time_format(
+            time_format=config.getoption("--pytest-durations-time-format"),
+            max_seconds=cost,
+        )
+        terminalreporter.line(
+            f"Regressions cost {format_seconds(cost)} exceeds the budget of {format_seconds(budget)}",
+            red=True,
+        )
+
+    def _report_budget_violations(
+        self,
+        terminalreporter: "TerminalReporter",
+        format_seconds: "Callable[[float], str]",
+        fullwidth: int,
+    ) -> None:
+        """Write test phases which exceeded their duration budgets sorted by the overrun."""
+        rows = [("overrun", "name", "duration", "budget")]
+        rows.extend(
+            (
+                format_seconds(violation.overrun),
+                f"{violation.key} ({violation.category})",
+                format_seconds(violation.duration),
+                format_seconds(violation.budget),
+            )
+            for violation in sorted(self.budget_violations, key=lambda violation: violation.overrun, reverse=True)
+        )
+        terminalreporter.write_sep(sep="=", title="duration budget violations", fullwidth=fullwidth)
+        for content in get_table_lines(rows, get_table_widths(rows)):
+            terminalreporter.line(content)
+
+    def _report_rebuilds(
+        self,
+        terminalreporter: "TerminalReporter",
+        max_rows: int,
+        format_seconds: "Callable[[float], str]",
+        fullwidth: int,
+    ) -> None:
+        """Write shared fixtures set up more than once sorted by their cost, with the time to be saved."""
+        rows = get_rebuild_rows(self.rebuilds, max_rows=max_rows, format_seconds=format_seconds)
+        terminalreporter.write_sep(sep="=", title="shared fixture instantiations", fullwidth=fullwidth)
+        for content in get_table_lines(rows, get_table_widths(rows), name_column=4):
+            terminalreporter.line(content)
+
+    def _report_retries(
+        self,
+        terminalreporter: "TerminalReporter",
+        max_rows: int,
+        format_seconds: "Callable[[float], str]",
+        fullwidth: int,
+    ) -> None:
+        """Write retried tests sorted by the time of their retried attempts."""
+        rows = get_retry_rows(self.retries, max_rows=max_rows, format_seconds=format_seconds)
+        terminalreporter.write_sep(sep="=", title="retry cost", fullwidth=fullwidth)
+        for content in get_table_lines(rows, get_table_widths(rows), name_column=3):
+            terminalreporter.line(content)
+
+    def _report_cold_starts(
+        self,
+        terminalreporter: "TerminalReporter",
+        max_rows: int,
+        format_seconds: "Callable[[float], str]",
+        fullwidth: int,
+    ) -> None:
+        """Write modules whose first tests take longer than the steady state sorted by the excess time."""
+        rows = get_cold_start_rows(self.cold, max_rows=max_rows, format_seconds=format_seconds)
+        terminalreporter.write_sep(sep="=", title="cold start by module", fullwidth=fullwidth)
+        for content in get_table_lines(rows, get_table_widths(rows), name_column=3):
+            terminalreporter.line(content)
+
+    def _report_hooks(
+        self,
+        terminalreporter: "TerminalReporter",
+        max_rows: int,
+        format_seconds: "Callable[[float], str]",
+        fullwidth: int,
+    ) -> None:
+        """Write hook implementations sorted by their self time."""
+        rows = get_hook_rows(self.hooks, max_rows=max_rows, format_seconds=format_seconds)
+        terminalreporter.write_sep(sep="=", title="hook duration top", fullwidth=fullwidth)
+        for content in get_table_lines(rows, get_table_widths(rows), name_column=2):
+            terminalreporter.line(content)
+
+    def _report_workers(
+        self,
+        terminalreporter: "TerminalReporter",
+        max_rows: int,
+        format_seconds: "Callable[[float], str]",
+        fullwidth: int,
+    ) -> None:
+        """Write pytest-xdist worker utilization and the slowest tests of the most loaded worker."""
+        utilization = get_utilization(self.workers)
+        terminalreporter.write_sep(sep="=", title="xdist worker utilization", fullwidth=fullwidth)
+        rows = get_utilization_rows(self.workers, format_seconds=format_seconds)
+        for content in get_table_lines(rows, get_table_widths(rows), name_column=0):
+            terminalreporter.line(content)
+        terminalreporter.line(
+            f"makespan {format_seconds(utilization.makespan)} ({utilization.critical}),"
+            f" average load {format_seconds(utilization.average)}, imbalance {utilization.ratio:.2f}x",
+        )
+        crashed = [worker_id for worker_id, stats in self.workers.items() if stats.crashed]
+        if crashed:
+            terminalreporter.line(
+                f"Measurements are partial: recovered from the spool of crashed workers {', '.join(crashed)},"
+                f" samples of the tests they were running are lost",
+                yellow=True,
+            )
+        critical_tests = sorted(
+            self.workers[utilization.critical].tests.items(),
+            key=lambda item: item[1],
+            reverse=True,
+        )
+        rows = [("total", "name")]
+        rows.extend((format_seconds(duration), nodeid) for nodeid, duration in critical_tests[:max_rows or None])
+        terminalreporter.write_sep(
+            sep="=",
+            title=f"critical worker {utilization.critical} duration top",
+            fullwidth=fullwidth,
+        )
+        for content in get_table_lines(rows, get_table_widths(rows)):
+            terminalreporter.line(content)
 
     @contextmanager
     def _measure(self, category: "Category", key: "FunctionKeyT") -> Iterable["MeasureDuration"]:
         """Measure wrapping block execution time and put it into a dict."""
-        measurements = self.measurements[category]
-
         with MeasureDuration() as measurement:
             yield measurement
+        self._record(category, key, measurement.duration)
 
+    def _record(self, category: "Category", key: "FunctionKeyT", duration: float) -> None:
+        """Put a measured duration into a dict and pass it to every consumer of samples."""
+        measurements = self.measurements.get(category)
+        if measurements is None:
+            # derived category of a section which is not shown
+            return
         try:
-            measurements[key].append(measurement.duration)
+            measurements[key].append(duration)
         except KeyError:
-            measurements[key] = [measurement.duration]
+            measurements[key] = [duration]
+        if self.histograms is not None:
+            self.histograms.observe(category, key, duration)
+        self.attempt_samples.append((category, key, duration))
+        if self.cold is not None:
+            self.cold.add(category, key, duration)
+        if self.spool is not None:
+            self.spool.write(category, key, duration)
+        if duration > self.budgets[category].get(key, math.inf):
+            self.budget_violation = BudgetViolationT(category, key, duration, self.budgets[category][key])
+            self.budget_violations.append(self.budget_violation)
+
+    def _discard_attempt(self, key: "FunctionKeyT") -> None:
+        """Move samples of the previous attempt of a retried test out of the measurements into its retry cost.
+
+        Cold samples, spooled samples, budget violations and shared fixture instantiations of the attempt
+        are discarded as well, samples already sent by a pytest-xdist worker flush are kept.
+        """
+        for category, sample_key, duration in reversed(self.attempt_samples):
+            series = self.measurements[category]
+            samples = series.get(sample_key)
+            if not samples:
+                continue
+            samples.pop()
+            if not samples:
+                del series[sample_key]
+            if self.histograms is not None:
+                self.histograms.discard(category, sample_key, duration)
+            if self.cold is not None:
+                self.cold.discard(category, sample_key, duration)
+            if self.spool is not None:
+                self.spool.discard(category, sample_key, duration)
+            if duration > self.budgets[category].get(sample_key, math.inf):
+                violation = BudgetViolationT(category, sample_key, duration, self.budgets[category][sample_key])
+                if violation in self.budget_violations:
+                    self.budget_violations.remove(violation)
+        if self.cold is not None:
+            self.cold.discard_test(key, self.test_duration)
+        self.rebuilds.discard_attempt()
+        self.retries.add_retry(key, duration=self.test_duration)
+
+    def _add_phase_time(self, measurement: MeasureDuration) -> None:
+        """Account the time of a test phase to the running test, and its wall time to the session.
+
+        The wall time includes shared fixtures, the own time of the test does not.
+        """
+        duration = measurement.end - measurement.start
+        self.test_duration += duration
+        self.own_duration += measurement.duration
+        self.timeline.tests += duration
+
+    def _record_timeline(self) -> None:
+        """Record the session phases up to the terminal summary, tests of pytest-xdist workers fill the whole loop."""
+        for key, duration in self.timeline.get_phases(get_current_ticks(), distributed=bool(self.workers)).items():
+            self._record(Category.SESSION, key, duration)
+
+    def _record_import(self, key: "FunctionKeyT", duration: float) -> None:
+        """Record the import time of a package, excluding it from the running collection."""
+        self._record(Category.COLLECT, key, duration)
+        if self.collect_nesting:
+            self.collect_nesting[-1] += duration
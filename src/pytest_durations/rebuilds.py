@@ -0,0 +1,191 @@
+"""Instantiations of shared fixtures and the time to be saved by avoiding their rebuilds."""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from pytest_durations.typing import FunctionKeyT
+
+
+class SetupT(NamedTuple):
+    """Changes of a single instantiation to the stats of its fixture, to undo them if its test is retried."""
+
+    duration: float
+    rebuilt: bool  # whether its test was added to the rebuild triggers
+    new_scope: str | None  # scope node ID added by the instantiation
+    new_instance: tuple[str, str, int] | None  # instance added by the instantiation
+
+
+class FixtureStats:
+    """Instantiations of a single shared fixture.
+
+    A fixture is rebuilt when it is set up again for a scope node it was already set up for, because
+    the test order or a parameter change invalidated its cached value. The savings are estimated by
+    the mean cost of an instantiation for two alternatives: widening its scope to the session, which
+    needs a single instantiation per parameter, and ordering tests by parameter within every scope
+    node, which needs a single instantiation per scope node and parameter. Every pytest-xdist worker
+    process sets up its own instances, so both alternatives still need them once per worker.
+    """
+
+    setups: int
+    cost: float  # setup and teardown time in seconds
+    instances: set[tuple[str, str, int]]  # worker ID, scope node ID and parameter index of every instantiation
+    scopes: set[str]  # node IDs of the scope nodes
+    triggers: list[str]  # node IDs of tests which rebuilt the fixture
+
+    def __init__(self):
+        self.setups = 0
+        self.cost = 0.0
+        self.instances = set()
+        self.scopes = set()
+        self.triggers = []
+
+    def add_setup(self, scope_id: str, param_index: int, test_id: str | None, duration: float) -> SetupT:
+        """Account an instantiation, a rebuild if the fixture was already set up for the scope node."""
+        instance = ("", scope_id, param_index)
+        setup = SetupT(
+            duration=duration,
+            rebuilt=test_id is not None and scope_id in self.scopes,
+            new_scope=scope_id if scope_id not in self.scopes else None,
+            new_instance=instance if instance not in self.instances else None,
+        )
+        if setup.rebuilt:
+            self.triggers.append(test_id)
+        self.setups += 1
+        self.cost += duration
+        self.instances.add(instance)
+        self.scopes.add(scope_id)
+        return setup
+
+    def discard_setup(self, setup: SetupT) -> None:
+        """Undo the latest instantiation accounted by :meth:`add_setup`."""
+        if setup.rebuilt:
+            self.triggers.pop()
+        self.setups -= 1
+        self.cost -= setup.duration
+        self.instances.discard(setup.new_instance)
+        self.scopes.discard(setup.new_scope)
+
+    def reset(self) -> None:
+        """Forget accumulated instantiations and costs, scope nodes set up before are kept to detect rebuilds."""
+        self.setups = 0
+        self.cost = 0.0
+        self.instances = set()
+        self.triggers = []
+
+    @property
+    def mean(self) -> float:
+        """Return the mean cost of an instantiation in seconds."""
+        return self.cost / self.setups if self.setups else 0.0
+
+    @property
+    def saved_by_widening(self) -> float:
+        """Return the time saved with a session scope in seconds."""
+        params = {(worker_id, param_index) for worker_id, _, param_index in self.instances}
+        return max(self.setups - len(params), 0) * self.mean
+
+    @property
+    def saved_by_grouping(self) -> float:
+        """Return the time saved by running tests of the same parameter together in seconds."""
+        return max(self.setups - len(self.instances), 0) * self.mean
+
+
+class FixtureRebuilds:
+    """Instantiations of every shared fixture by its measurement key."""
+
+    fixtures: dict[FunctionKeyT, FixtureStats]
+    attempt: list[tuple[FunctionKeyT, SetupT]]  # instantiations of the running test attempt
+
+    def __init__(self):
+        self.fixtures = {}
+        self.attempt = []
+
+    def add_setup(
+        self,
+        key: FunctionKeyT,
+        scope_id: str,
+        param_index: int,
+        test_id: str | None,
+        duration: float,
+    ) -> None:
+        """Account an instantiation of a fixture, and remember it as one of the running test attempt."""
+        setup = self.fixtures.setdefault(key, FixtureStats()).add_setup(scope_id, param_index, test_id, duration)
+        self.attempt.append((key, setup))
+
+    def start_attempt(self) -> None:
+        """Forget instantiations of the previous test attempt, which is final."""
+        self.attempt = []
+
+    def discard_attempt(self) -> None:
+        """Undo instantiations of the previous test attempt, which was retried."""
+        for key, setup in reversed(self.attempt):
+            self.fixtures[key].discard_setup(setup)
+        self.attempt = []
+
+    def add_teardown(self, key: FunctionKeyT, duration: float) -> None:
+        """Add the teardown time of a fixture to its cost."""
+        stats = self.fixtures.get(key)
+        if stats is not None:
+            stats.cost += duration
+
+    def dump(self) -> dict[FunctionKeyT, tuple[int, float, list[tuple[str, int]], list[str]]]:
+        """Serialize instantiations and teardown costs of the current process with simple types only."""
+        return {
+            key: (
+                stats.setups,
+                stats.cost,
+                [(scope_id, param_index) for _, scope_id, param_index in stats.instances],
+                stats.triggers,
+            )
+            for key, stats in self.fixtures.items()
+            if stats.setups or stats.cost
+        }
+
+    def load(self, data: dict[FunctionKeyT, Any], worker_id: str) -> None:
+        """Add instantiations serialized by :meth:`dump` in a pytest-xdist worker process."""
+        for key, (setups, cost, instances, triggers) in data.items():
+            stats = self.fixtures.setdefault(key, FixtureStats())
+            stats.setups += setups
+            stats.cost += cost
+            stats.instances.update((worker_id, scope_id, param_index) for scope_id, param_index in instances)
+            stats.scopes.update(scope_id for scope_id, _ in instances)
+            stats.triggers.extend(triggers)
+
+    def clear(self) -> None:
+        """Forget every instantiation and cost, once they were dumped.
+
+        Fixtures and their scope nodes are kept, so the process still detects rebuilds of fixtures set up before
+        and accounts their teardown costs.
+        """
+        for stats in self.fixtures.values():
+            stats.reset()
+        self.attempt = []
+
+
+def get_rebuild_rows(
+    rebuilds: FixtureRebuilds,
+    max_rows: int,
+    format_seconds: Callable[[float], str],
+) -> list[tuple[str, ...]]:
+    """Return table rows of fixtures set up more than once sorted by their cost, each followed by its rebuild triggers.
+
+    Includes a header, at most ``max_rows`` fixtures and triggers per fixture are listed.
+    """
+    repeated = sorted(
+        ((key, stats) for key, stats in rebuilds.fixtures.items() if stats.setups > 1),
+        key=lambda item: item[1].cost,
+        reverse=True,
+    )
+    rows = [("total", "num", "widened", "grouped", "name")]
+    for key, stats in repeated[:max_rows or None]:
+        rows.append((
+            format_seconds(stats.cost),
+            str(stats.setups),
+            format_seconds(stats.saved_by_widening),
+            format_seconds(stats.saved_by_grouping),
+            key,
+        ))
+        rows.extend(("", "", "", "", f"  rebuilt by {test_id}") for test_id in stats.triggers[:max_rows or None])
+    return rows
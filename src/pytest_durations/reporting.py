@@ -1,11 +1,17 @@
 """Helper to generate formatted measurement report rows from timing data."""
-from collections.abc import Callable, Collection
+from collections.abc import Callable, Collection, Iterable, Iterator, Mapping, Sequence
 from datetime import timedelta
 from operator import attrgetter
 from statistics import median
-from typing import NamedTuple
+from typing import TYPE_CHECKING, NamedTuple
 
-from pytest_durations.types import TimeFormat
+from pytest_durations.cold import get_warm_times
+from pytest_durations.helpers import get_category_grouping_func, get_grouped_measurements
+from pytest_durations.types import COLUMN_NAMES, GroupBy, MarkerGroupBy, PathGroupBy, TimeFormat
+
+if TYPE_CHECKING:
+    from pytest_durations.trends import TrendT
+    from pytest_durations.typing import CategoryMeasurementsT, CategoryT, FunctionKeyT
 
 # Default sort field for report ordering
 _SORT_BY_DEFAULT = "sum"
@@ -86,12 +92,85 @@ def resolve_time_format(time_format: TimeFormat, max_seconds: float) -> Callable
     return formatter
 
 
-def get_report_rows(
+def get_max_duration(measurements: "CategoryMeasurementsT") -> float:
+    """Return the longest single duration of all categories."""
+    return max(
+        (
+            max(times)
+            for category_measurements in measurements.values()
+            for times in category_measurements.values()
+            if times
+        ),
+        default=0.0,
+    )
+
+
+def get_report_sections(  # noqa: PLR0913
+    measurements: "CategoryMeasurementsT",
+    options: "ReportOptionsT",
+    format_seconds: Callable[[float], str],
+    *,
+    baseline: Mapping["CategoryT", Mapping["FunctionKeyT", float]] | None = None,
+    trends: Mapping["CategoryT", Mapping["FunctionKeyT", "TrendT"]] | None = None,
+    cold: Mapping["CategoryT", Mapping["FunctionKeyT", list[float]]] | None = None,
+) -> list["ReportSectionT"]:
+    """Group measurements of the selected categories and render them as report sections.
+
+    All sections share column widths, so their lines are aligned with each other.
+
+    :param measurements: Mapping of categories to name → duration list.
+    :param options: Report settings.
+    :param format_seconds: Callable formatting a duration (seconds) into a display string.
+    :param baseline: Mapping of categories to grouped baseline mean execution times (seconds).
+    :param trends: Mapping of categories to grouped timing data of previous runs.
+    :param cold: Mapping of categories to name → cold samples, grouped like the measurements.
+    :return: List of section titles with rendered table lines.
+    """
+    reports = []
+    for category in options.categories:
+        grouping_func = get_category_grouping_func(category=category, group_by=options.group_by)
+        category_measurements = get_grouped_measurements(
+            measurements=measurements.get(category, {}),
+            grouping_func=grouping_func,
+        )
+        category_report_rows = get_report_rows(
+            measurements=category_measurements,
+            duration_min=options.duration_min,
+            max_rows=options.max_rows,
+            sort_by=COLUMN_NAMES[options.columns[0]],
+            format_seconds=format_seconds,
+            baseline=baseline.get(category, {}) if baseline is not None else None,
+            trends=trends.get(category, {}) if trends is not None else None,
+            cold=(
+                get_grouped_measurements(measurements=cold.get(category, {}), grouping_func=grouping_func)
+                if cold is not None
+                else None
+            ),
+        )
+        reports.append((f"{category} duration top", category_report_rows))
+    rendered_columns = report_column_fields(options.columns)
+    widths = get_selected_max_widths([row for _, rows in reports for row in rows], options.columns)
+    return [
+        ReportSectionT(
+            title=title,
+            lines=list(
+                get_table_lines((tuple(getattr(row, col) for col in rendered_columns) for row in rows), widths),
+            ),
+        )
+        for title, rows in reports
+    ]
+
+
+def get_report_rows(  # noqa: PLR0913
     measurements: dict[str, list[float]],
     duration_min: float = -1.0,
     max_rows: int = 0,
     sort_by: str = _SORT_BY_DEFAULT,
     format_seconds: Callable[[float], str] = format_seconds_clock,
+    *,
+    baseline: Mapping[str, float] | None = None,
+    trends: Mapping[str, "TrendT"] | None = None,
+    cold: Mapping[str, list[float]] | None = None,
 ) -> list["ReportRowT"]:
     """Generate a formatted performance report from timing measurements.
 
@@ -104,13 +183,31 @@ def get_report_rows(
                     Default: 'sum' (descending).
     :param format_seconds: Callable formatting a duration (seconds) into a display string.
                            Defaults to the clock format.
+    :param baseline: Mapping of operation names to their baseline mean execution time (seconds)
+                     used by the comparison columns. Use None (default) to leave them empty.
+    :param trends: Mapping of operation names to their timing data of previous runs used by
+                   the trend columns. Use None (default) to leave them empty.
+    :param cold: Mapping of operation names to their cold samples, which are among the execution times,
+                 used by the cold and warm columns. Use None (default) to leave them empty.
     :return: List of formatted rows including header, filtered/sorted entries, and grand total.
     """
     time_values: list[TimeValuesT] = []
-    time_values_grand = TimeValueGrandT(name=[], calls=[], min=[], med=[], p90=[], p95=[], p99=[], max=[], sum=[])
+    time_values_grand = TimeValueGrandT(
+        name=[], calls=[], min=[], med=[], p90=[], p95=[], p99=[], max=[], sum=[], base=[], prev=[], ewma=[],
+        cold=[], warm=[],
+    )
 
     for name, times in measurements.items():
         time_value = TimeValuesT.from_times(name=name, times=times)
+        if baseline is not None:
+            time_value = time_value._replace(base=baseline.get(name, 0.0))
+        trend = trends.get(name) if trends is not None else None
+        if trend is not None:
+            time_value = time_value._replace(prev=trend.mean, ewma=trend.ewma)
+        cold_times = cold.get(name) if cold is not None else None
+        if cold_times:
+            warm_times = get_warm_times(times, cold_times)
+            time_value = time_value._replace(cold=sum(cold_times), warm=median(warm_times) if warm_times else 0.0)
         for idx in range(len(TimeValuesT._fields)):
             time_values_grand[idx].append(time_value[idx])
         if time_value.sum >= duration_min:
@@ -164,6 +261,23 @@ def get_selected_max_widths(
     return tuple(max(len(getattr(row, field)) for row in report_rows) for field in fields)
 
 
+def get_table_widths(rows: Collection[Sequence[str]]) -> tuple[int, ...]:
+    """Return the maximum width for each column of plain text table rows."""
+    return tuple(max(map(len, column)) for column in zip(*rows, strict=True))
+
+
+def get_table_lines(rows: Iterable[Sequence[str]], widths: Sequence[int], name_column: int = 1) -> Iterator[str]:
+    """Render plain text table rows as lines of padded columns.
+
+    The first (header) row and the name column are aligned left, other columns are aligned right.
+    """
+    for idx, row in enumerate(rows):
+        yield " ".join(
+            f"{value:{'>' if idx and col != name_column else '<'}{width}}"
+            for col, (value, width) in enumerate(zip(row, widths, strict=True))
+        )
+
+
 def _pct(sorted_times: list[float], p: float) -> float:
     """Calculate the p-th percentile using linear interpolation."""
     n = len(sorted_times)
@@ -189,6 +303,36 @@ class TimeValuesT(NamedTuple):
     p99: float  # 99th percentile execution time in seconds
     max: float  # Maximum execution time in seconds
     sum: float  # Total (cumulative) execution time in seconds
+    base: float = 0.0  # Baseline mean execution time in seconds (zero if unknown)
+    prev: float = 0.0  # Mean execution time in the previous run in seconds (zero if unknown)
+    ewma: float = 0.0  # Moving average of mean execution time across previous runs in seconds (zero if unknown)
+    cold: float = 0.0  # Total of the first samples of every key in seconds (zero if not recorded)
+    warm: float = 0.0  # Median of the other samples in seconds (zero if there are none)
+
+    @property
+    def mean(self) -> float:
+        """Return mean execution time in seconds."""
+        return self.sum / self.calls if self.calls else 0.0
+
+    @property
+    def diff(self) -> float:
+        """Return difference between mean and baseline mean execution time (zero if unknown)."""
+        return self.mean - self.base if self.base else 0.0
+
+    @property
+    def ratio(self) -> float:
+        """Return ratio of mean to baseline mean execution time (zero if unknown)."""
+        return self.mean / self.base if self.base else 0.0
+
+    @property
+    def delta(self) -> float:
+        """Return difference between mean and previous run mean execution time (zero if unknown)."""
+        return self.mean - self.prev if self.prev else 0.0
+
+    @property
+    def trend(self) -> float:
+        """Return relative change of mean execution time against its moving average (zero if unknown)."""
+        return self.mean / self.ewma - 1 if self.ewma else 0.0
 
     @classmethod
     def from_times(cls, name: str, times: Collection[float]) -> "TimeValuesT":
@@ -225,9 +369,28 @@ class TimeValuesT(NamedTuple):
             p99=_pct(sorted(time_values_grand.p99), 99.0),
             max=max(time_values_grand.max),
             sum=sum(time_values_grand.sum),
+            cold=sum(time_values_grand.cold),
         )
 
 
+class ReportOptionsT(NamedTuple):
+    """Terminal report settings shared by the plugin and the command line tool."""
+
+    max_rows: int                   # Number of rows per section, 0 for no limit
+    duration_min: float             # Minimal total duration of a shown row in seconds
+    group_by: GroupBy | MarkerGroupBy | PathGroupBy  # Key grouping strategy
+    time_format: TimeFormat         # Duration display format
+    columns: tuple[str, ...]        # Selected stat columns, the first one sorts the report
+    categories: tuple["CategoryT", ...]  # Selected categories (sections)
+
+
+class ReportSectionT(NamedTuple):
+    """Rendered report section."""
+
+    title: str        # Section title
+    lines: list[str]  # Table lines including header and grand total
+
+
 class TimeValueGrandT(NamedTuple):
     """Aggregated timing statistics across all operations (per-field lists)."""
 
@@ -241,6 +404,11 @@ class TimeValueGrandT(NamedTuple):
     p99: list[float]
     max: list[float]
     sum: list[float]
+    base: list[float]
+    prev: list[float]
+    ewma: list[float]
+    cold: list[float]
+    warm: list[float]
 
 
 class ReportRowT(NamedTuple):
@@ -255,6 +423,14 @@ class ReportRowT(NamedTuple):
     p95: str    # Formatted 95th percentile column
     p99: str    # Formatted 99th percentile column
     max: str    # Formatted maximum column
+    base: str = ""   # Formatted baseline mean column
+    diff: str = ""   # Formatted mean minus baseline mean column
+    ratio: str = ""  # Formatted mean to baseline mean ratio column
+    prev: str = ""   # Formatted previous run mean column
+    delta: str = ""  # Formatted mean minus previous run mean column
+    trend: str = ""  # Formatted relative change of mean against its moving average column
+    cold: str = ""   # Formatted total of cold samples column
+    warm: str = ""   # Formatted median of warm samples column
 
     @classmethod
     def get_header(cls) -> "ReportRowT":
@@ -278,4 +454,17 @@ class ReportRowT(NamedTuple):
             p95=format_seconds(seconds=time_value.p95),
             p99=format_seconds(seconds=time_value.p99),
             max=format_seconds(seconds=time_value.max),
+            base=format_seconds(seconds=time_value.base) if time_value.base else "",
+            diff=_format_signed_seconds(time_value.diff, format_seconds) if time_value.base else "",
+            ratio=f"{time_value.ratio:.2f}x" if time_value.base else "",
+            prev=format_seconds(seconds=time_value.prev) if time_value.prev else "",
+            delta=_format_signed_seconds(time_value.delta, format_seconds) if time_value.prev else "",
+            trend=f"{time_value.trend:+.0%}" if time_value.ewma else "",
+            cold=format_seconds(seconds=time_value.cold) if time_value.cold else "",
+            warm=format_seconds(seconds=time_value.warm) if time_value.warm else "",
         )
+
+
+def _format_signed_seconds(seconds: float, format_seconds: Callable[[float], str]) -> str:
+    """Format a duration difference with an explicit sign."""
+    return f"{'-' if seconds < 0 else '+'}{format_seconds(abs(seconds))}"
@@ -0,0 +1,87 @@
+"""Time wasted by retried attempts of flaky tests, kept apart from the clean measurements."""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from pytest_durations.typing import FunctionKeyT
+
+
+class RetryStats:
+    """Retried attempts of a single test.
+
+    An attempt is retried when the same test is set up again right after it, as plugins like
+    pytest-rerunfailures or flaky do after a failure. The final attempt is the one which is kept.
+    """
+
+    durations: list[float]  # wall time of every retried attempt in seconds, by attempt number
+    failed: bool  # outcome of the final attempt
+
+    def __init__(self):
+        self.durations = []
+        self.failed = False
+
+    @property
+    def cost(self) -> float:
+        """Return the wall time of all retried attempts in seconds."""
+        return sum(self.durations)
+
+
+class RetryCosts:
+    """Retried attempts of every test by its measurement key."""
+
+    tests: dict[FunctionKeyT, RetryStats]
+
+    def __init__(self):
+        self.tests = {}
+
+    def add_retry(self, key: FunctionKeyT, duration: float) -> int:
+        """Account a retried attempt of a test and return the number of the next attempt."""
+        stats = self.tests.setdefault(key, RetryStats())
+        stats.durations.append(duration)
+        stats.failed = False
+        return len(stats.durations) + 1
+
+    def add_failure(self, key: FunctionKeyT) -> None:
+        """Mark the final attempt of a retried test as failed, other tests are ignored."""
+        stats = self.tests.get(key)
+        if stats is not None:
+            stats.failed = True
+
+    def dump(self) -> dict[FunctionKeyT, tuple[list[float], bool]]:
+        """Serialize retried attempts with simple types only."""
+        return {key: (stats.durations, stats.failed) for key, stats in self.tests.items()}
+
+    def load(self, data: dict[FunctionKeyT, Any]) -> None:
+        """Add retried attempts serialized by :meth:`dump`."""
+        for key, (durations, failed) in data.items():
+            stats = self.tests.setdefault(key, RetryStats())
+            stats.durations.extend(durations)
+            stats.failed = failed
+
+    def clear(self) -> None:
+        """Forget every retried attempt, once they were dumped."""
+        self.tests.clear()
+
+
+def get_retry_rows(
+    retries: RetryCosts,
+    max_rows: int,
+    format_seconds: Callable[[float], str],
+) -> list[tuple[str, ...]]:
+    """Return table rows of retried tests sorted by the time wasted on their retries, including a header and a total.
+
+    Tests which passed in the final attempt are flaky, the time of their retried attempts was wasted.
+    """
+    retried = sorted(retries.tests.items(), key=lambda item: item[1].cost, reverse=True)
+    rows = [("total", "num", "final", "name")]
+    rows.extend(
+        (format_seconds(stats.cost), str(len(stats.durations)), "failed" if stats.failed else "passed", key)
+        for key, stats in retried[:max_rows or None]
+    )
+    total = sum(stats.cost for stats in retries.tests.values())
+    attempts = sum(len(stats.durations) for stats in retries.tests.values())
+    rows.append((format_seconds(total), str(attempts), "", "grand total"))
+    return rows
@@ -0,0 +1,66 @@
+"""Duration-aware pytest-xdist scheduling."""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from xdist.scheduler import LoadScheduling
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from _pytest.config import Config
+    from xdist.remote import Producer
+    from xdist.workermanage import WorkerController
+
+    from pytest_durations.typing import FunctionKeyT
+
+# pending tests kept on a node: a worker only starts a test once it knows the next one
+NODE_QUEUE_SIZE = 2
+
+
+class DurationScheduling(LoadScheduling):
+    """Longest-processing-time-first scheduling using test durations of a previous run.
+
+    Tests with known durations are sent slowest first, the rest follows in collection order.
+    While tests with known durations are pending, every node gets a new test only when it is
+    about to run out of them, so the slowest tests are spread over all nodes instead of being
+    queued in a chunk behind each other. Tests without history are distributed in chunks by
+    the regular load scheduling.
+    """
+
+    durations: Mapping[FunctionKeyT, float]
+
+    def __init__(self, config: Config, log: Producer | None = None, *, durations: Mapping[FunctionKeyT, float]):
+        super().__init__(config, log)
+        self.durations = durations
+
+    def schedule(self) -> None:
+        """Order the collection by known durations and send the slowest tests to every node."""
+        if self.collection is not None:
+            super().schedule()
+            return
+        if not self._check_nodes_have_same_collection():
+            self.log("**Different tests collected, aborting run**")
+            return
+        self.collection = collection = next(iter(self.node2collection.values()))
+        if not collection:
+            return
+        if self.maxschedchunk is None:
+            self.maxschedchunk = len(collection)
+        # stable sort keeps tests without history in collection order
+        self.pending[:] = sorted(
+            range(len(collection)),
+            key=lambda index: (collection[index] not in self.durations, -self.durations.get(collection[index], 0.0)),
+        )
+        for _ in range(NODE_QUEUE_SIZE):
+            for node in self.nodes:
+                self.check_schedule(node)
+
+    def check_schedule(self, node: WorkerController, duration: float = 0) -> None:
+        """Keep a short queue on the node while tests with known durations are pending."""
+        if not self.pending or self.collection[self.pending[0]] not in self.durations:
+            super().check_schedule(node, duration=duration)
+            return
+        node_pending = self.node2pending[node]
+        if not node.shutting_down and len(node_pending) < NODE_QUEUE_SIZE:
+            self._send_tests(node, 1)
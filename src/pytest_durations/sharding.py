@@ -0,0 +1,64 @@
+"""Duration-balanced splitting of collected tests into shards."""
+from __future__ import annotations
+
+from heapq import heappop, heappush
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping, Sequence
+
+    from _pytest.nodes import Item
+
+    from pytest_durations.helpers import GroupingCbT
+    from pytest_durations.typing import FunctionKeyT
+
+# predicted duration of every test if none of the collected tests has a recorded one
+DEFAULT_TEST_DURATION = 1.0
+
+
+def split_shards(weights: Mapping[FunctionKeyT, float], count: int) -> list[list[FunctionKeyT]]:
+    """Partition keys into shards with roughly equal total weight.
+
+    Keys are placed from the heaviest to the lightest onto the currently lightest shard
+    (longest processing time first). Ties keep the mapping order, so every process splitting
+    the same collection gets the same shards.
+    """
+    shards: list[list[FunctionKeyT]] = [[] for _ in range(count)]
+    loads = [(0.0, index) for index in range(count)]
+    for key in sorted(weights, key=weights.__getitem__, reverse=True):
+        load, index = heappop(loads)
+        shards[index].append(key)
+        heappush(loads, (load + weights[key], index))
+    return shards
+
+
+def select_shard(
+    items: Sequence[Item],
+    shard: tuple[int, int],
+    durations: Mapping[FunctionKeyT, float],
+    grouping_func: GroupingCbT,
+) -> tuple[list[Item], list[Item]]:
+    """Split collected items into the ones of the requested shard and the deselected rest.
+
+    Items of the same group always land in the same shard. Tests without a recorded duration
+    are predicted to take the mean duration of the recorded ones.
+
+    :param items: Collected test items.
+    :param shard: 1-based shard index and the number of shards.
+    :param durations: Recorded durations per test node ID.
+    :param grouping_func: Function returning the group of a ``(node ID, samples)`` pair.
+    :return: Selected and deselected items, both in collection order.
+    """
+    index, count = shard
+    known = [durations[item.nodeid] for item in items if item.nodeid in durations]
+    default = sum(known) / len(known) if known else DEFAULT_TEST_DURATION
+    item_groups = [grouping_func((item.nodeid, [])) for item in items]
+    weights: dict[FunctionKeyT, float] = {}
+    for item, group in zip(items, item_groups, strict=True):
+        weights[group] = weights.get(group, 0.0) + durations.get(item.nodeid, default)
+    shard_groups = set(split_shards(weights, count)[index - 1])
+    selected: list[Item] = []
+    deselected: list[Item] = []
+    for item, group in zip(items, item_groups, strict=True):
+        (selected if group in shard_groups else deselected).append(item)
+    return selected, deselected
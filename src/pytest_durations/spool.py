@@ -0,0 +1,70 @@
+"""Spool files of pytest-xdist worker measurements, recovered by the controller if a worker crashes."""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from pytest_durations.typing import CategoryT, FunctionKeyT
+
+
+class MeasurementSpool:
+    """Append-only file of samples recorded by a worker, but not received by the controller yet.
+
+    Samples are kept as JSON lines in a buffer, which the worker writes to the file after every
+    test, so a killed worker loses the samples of the test it was running only.
+    """
+
+    path: Path
+    pending: list[str]  # lines of samples not written to the file yet
+
+    def __init__(self, filename: str):
+        self.path = Path(filename)
+        self.pending = []
+        self._file = self.path.open(mode="w", encoding="utf-8")
+
+    def write(self, category: CategoryT, key: FunctionKeyT, duration: float) -> None:
+        """Append a single sample to the buffer."""
+        self.pending.append(f"{json.dumps([category, key, duration])}\n")
+
+    def discard(self, category: CategoryT, key: FunctionKeyT, duration: float) -> None:
+        """Forget the latest buffered sample if it matches, samples already written are kept."""
+        if self.pending and self.pending[-1] == f"{json.dumps([category, key, duration])}\n":
+            self.pending.pop()
+
+    def flush(self) -> None:
+        """Write buffered samples to the file."""
+        self._file.writelines(self.pending)
+        self._file.flush()
+        self.pending = []
+
+    def truncate(self) -> None:
+        """Forget every sample, once they were sent to the controller."""
+        self.pending = []
+        self._file.seek(0)
+        self._file.truncate()
+
+    def close(self) -> None:
+        """Close and remove the file."""
+        self._file.close()
+        self.path.unlink(missing_ok=True)
+
+
+def load_spool(filename: str) -> Iterator[tuple[CategoryT, FunctionKeyT, float]]:
+    """Read samples from a spool file of a crashed worker.
+
+    A missing file has no samples, a partially written last line is skipped.
+    """
+    try:
+        content = Path(filename).read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return
+    for line in content.splitlines():
+        try:
+            category, key, duration = json.loads(line)
+        except json.JSONDecodeError:
+            return
+        yield category, key, duration
@@ -0,0 +1,58 @@
+"""Breakdown of the session wall time into startup, collection, test phases and reporting."""
+from __future__ import annotations
+
+# measurement keys of the session category
+STARTUP = "startup"
+COLLECTION = "collection"
+TESTS = "tests"
+GAPS = "gaps"
+FINISH = "finish"
+
+
+class SessionTimeline:
+    """Ticks of session hooks and the total wall time of test phases.
+
+    The startup phase runs from the loading of the initial conftest files to the session start, the
+    collection phase spans the ``pytest_collection`` hook, the tests phase is the wall time of test
+    setup, call and teardown phases, and the finish phase runs from the end of the test loop to the
+    terminal summary. The rest of the session is not covered by any phase and reported as gaps,
+    mostly time spent in reporting hooks between test phases.
+    """
+
+    started: float
+    session_started: float | None
+    collection_started: float | None
+    collection_finished: float | None
+    loop_started: float | None
+    loop_finished: float | None
+    tests: float
+
+    def __init__(self, started: float):
+        self.started = started
+        self.session_started = None
+        self.collection_started = None
+        self.collection_finished = None
+        self.loop_started = None
+        self.loop_finished = None
+        self.tests = 0.0
+
+    def get_phases(self, now: float, *, distributed: bool = False) -> dict[str, float]:
+        """Split the session wall time up to now into phases, phases which have not run are skipped.
+
+        :param now: Ticks of the terminal summary.
+        :param distributed: Tests ran on pytest-xdist workers, so the whole test loop is the tests phase.
+        """
+        phases: dict[str, float] = {}
+        end = self.started
+        if self.session_started is not None:
+            phases[STARTUP] = self.session_started - self.started
+            end = self.session_started
+        if self.collection_started is not None and self.collection_finished is not None:
+            phases[COLLECTION] = self.collection_finished - self.collection_started
+            end = self.collection_finished
+        if self.loop_started is not None and self.loop_finished is not None:
+            phases[TESTS] = self.loop_finished - self.loop_started if distributed else self.tests
+            end = self.loop_finished
+        phases[FINISH] = now - end
+        phases[GAPS] = now - self.started - sum(phases.values())
+        return phases
@@ -0,0 +1,177 @@
+"""Per-key duration aggregates of previous runs, stored in the pytest cache.
+
+All keys of a category are kept in parallel lists, stored in a single file as a key table
+and packed float64 values, so loading and updating hundreds of thousands of keys takes a
+single JSON decode and encode of strings. Categories are decoded on request only, and the
+key index is built on the first update only.
+"""
+from __future__ import annotations
+
+import json
+from base64 import b64decode, b64encode
+from functools import cached_property
+from itertools import groupby
+from operator import itemgetter
+from typing import TYPE_CHECKING, NamedTuple
+
+from pytest_durations.binary_exporter import pack_samples, unpack_samples
+from pytest_durations.helpers import write_atomic
+
+if TYPE_CHECKING:
+    from collections.abc import Collection, Iterable, Iterator
+    from pathlib import Path
+
+    from pytest_durations.helpers import GroupingCbT
+    from pytest_durations.typing import CategoryMeasurementsT, CategoryT, FunctionKeyT, FunctionMeasurementsT
+
+# pytest cache directory and file name of the stored aggregates
+TRENDS_CACHE_DIR = "pytest_durations"
+TRENDS_FILENAME = "trends.json"
+# stored data format version, files of other versions are ignored
+TRENDS_VERSION = 1
+
+
+class TrendT(NamedTuple):
+    """Stored timing data of a single key."""
+
+    calls: int    # Number of calls in the latest run of the key
+    total: float  # Total execution time in the latest run of the key in seconds
+    ewma: float   # Exponentially weighted moving average of the mean execution time across runs in seconds
+
+    @property
+    def mean(self) -> float:
+        """Return mean execution time of the latest run in seconds."""
+        return self.total / self.calls if self.calls else 0.0
+
+
+class KeyTrends:
+    """Stored timing data of every key of a category in parallel lists."""
+
+    keys: list[FunctionKeyT]
+    calls: list[float]
+    totals: list[float]
+    ewmas: list[float]
+
+    def __init__(
+        self,
+        keys: Iterable[FunctionKeyT] = (),
+        calls: Iterable[float] = (),
+        totals: Iterable[float] = (),
+        ewmas: Iterable[float] = (),
+    ):
+        self.keys = list(keys)
+        self.calls = list(calls)
+        self.totals = list(totals)
+        self.ewmas = list(ewmas)
+
+    def update(self, measurements: FunctionMeasurementsT, alpha: float) -> None:
+        """Replace the latest run data of measured keys and move their averages.
+
+        :param measurements: Mapping of keys to duration lists of a session.
+        :param alpha: Weight of the session mean in the moving average, between 0 and 1.
+        """
+        for key, times in measurements.items():
+            if not times:
+                continue
+            calls, total = len(times), sum(times)
+            position = self.index.get(key)
+            if position is None:
+                self.index[key] = len(self.keys)
+                self.keys.append(key)
+                self.calls.append(calls)
+                self.totals.append(total)
+                self.ewmas.append(total / calls)
+            else:
+                self.calls[position] = calls
+                self.totals[position] = total
+                self.ewmas[position] = alpha * total / calls + (1 - alpha) * self.ewmas[position]
+
+    @cached_property
+    def index(self) -> dict[FunctionKeyT, int]:
+        """Return list positions by key, built on first use."""
+        return dict(zip(self.keys, range(len(self.keys)), strict=True))
+
+    def get_ewmas(self) -> dict[FunctionKeyT, float]:
+        """Return the moving averages by key, for lookups of many keys at once."""
+        return dict(zip(self.keys, self.ewmas, strict=True))
+
+    def items(self) -> Iterator[tuple[FunctionKeyT, TrendT]]:
+        """Iterate over keys and their timing data."""
+        return zip(self.keys, map(TrendT._make, zip(self.calls, self.totals, self.ewmas, strict=True)), strict=True)
+
+    def dump(self) -> dict[str, list[FunctionKeyT] | str]:
+        """Serialize with JSON compatible types only."""
+        return {
+            "keys": self.keys,
+            "calls": b64encode(pack_samples(self.calls)).decode(),
+            "totals": b64encode(pack_samples(self.totals)).decode(),
+            "ewmas": b64encode(pack_samples(self.ewmas)).decode(),
+        }
+
+    @classmethod
+    def load(cls, data: dict) -> KeyTrends:
+        """Deserialize data written by :meth:`dump`."""
+        return cls(
+            keys=data["keys"],
+            calls=map(int, unpack_samples(b64decode(data["calls"]))),
+            totals=unpack_samples(b64decode(data["totals"])),
+            ewmas=unpack_samples(b64decode(data["ewmas"])),
+        )
+
+
+if TYPE_CHECKING:
+    CategoryTrendsT = dict[CategoryT, KeyTrends]
+
+
+def load_trends(path: Path, categories: Collection[CategoryT] | None = None) -> CategoryTrendsT:
+    """Load stored timing data, empty if the file is missing, corrupted or of another version.
+
+    :param path: Path of the stored file.
+    :param categories: Categories to decode, all of them if None.
+    """
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if data.get("version") != TRENDS_VERSION:
+        return {}
+    return {
+        category: KeyTrends.load(values)
+        for category, values in data["categories"].items()
+        if categories is None or category in categories
+    }
+
+
+def save_trends(path: Path, trends: CategoryTrendsT) -> None:
+    """Atomically store timing data of every category."""
+    categories = {category: values.dump() for category, values in trends.items()}
+    write_atomic(str(path), json.dumps({"version": TRENDS_VERSION, "categories": categories}, separators=(",", ":")))
+
+
+def update_trends(trends: CategoryTrendsT, measurements: CategoryMeasurementsT, alpha: float) -> None:
+    """Update stored timing data in place with the measurements of a session.
+
+    Keys which were not run in the session are kept as they are.
+    """
+    for category, category_measurements in measurements.items():
+        trends.setdefault(category, KeyTrends()).update(category_measurements, alpha=alpha)
+
+
+def get_grouped_trends(trends: KeyTrends, grouping_func: GroupingCbT) -> dict[FunctionKeyT, TrendT]:
+    """Group stored timing data using a provided function to get grouping keys.
+
+    The moving averages of a group are weighted by the number of calls of its keys.
+    """
+    def grouping_key(item: tuple[FunctionKeyT, TrendT]) -> FunctionKeyT:
+        return grouping_func((item[0], []))
+
+    result = {}
+    for group, items in groupby(sorted(trends.items(), key=grouping_key), key=grouping_key):
+        values = list(map(itemgetter(1), items))
+        calls = sum(value.calls for value in values)
+        result[group] = TrendT(
+            calls=calls,
+            total=sum(value.total for value in values),
+            ewma=sum(value.ewma * value.calls for value in values) / calls,
+        )
+    return result
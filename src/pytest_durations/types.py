@@ -1,7 +1,10 @@
 """Type declarations module."""
+import math
 from argparse import ArgumentTypeError
-from collections.abc import Iterator
+from collections.abc import Iterator, Mapping
 from enum import Enum
+from types import MappingProxyType
+from typing import NamedTuple
 
 
 class CategoryMeta(type):
@@ -23,6 +26,10 @@ class Category(metaclass=CategoryMeta):
     TEST_CALL = "test call"
     TEST_SETUP = "test setup"
     TEST_TEARDOWN = "test teardown"
+    COLLECT = "collect"
+    SESSION = "session"
+    PARAM = "param"
+    OUTCOME = "outcome"
 
 
 class StrEnum(str, Enum):
@@ -43,6 +50,35 @@ class GroupBy(StrEnum):
     NONE = "none"
 
 
+# prefix of the --pytest-durations-group-by value selecting the grouping by markers
+MARKER_GROUP_BY_PREFIX = "marker:"
+
+
+class MarkerGroupBy(NamedTuple):
+    """Test grouping by markers of collected tests, selected by a "marker:NAME,..." value."""
+
+    names: tuple[str, ...]  # Marker names in the order they appear in group keys
+    tags: Mapping[str, str] = MappingProxyType({})  # Test key → names of its markers joined by "+"
+
+    def __str__(self) -> str:
+        """Return the option value selecting the grouping."""
+        return f"{MARKER_GROUP_BY_PREFIX}{','.join(self.names)}"
+
+
+# prefix of the --pytest-durations-group-by value selecting the grouping by leading path components
+PATH_GROUP_BY_PREFIX = "path:"
+
+
+class PathGroupBy(NamedTuple):
+    """Grouping by the first path components of keys, selected by a "path:N" value."""
+
+    depth: int  # Number of leading directory and file name components to keep
+
+    def __str__(self) -> str:
+        """Return the option value selecting the grouping."""
+        return f"{PATH_GROUP_BY_PREFIX}{self.depth}"
+
+
 class TimeFormat(StrEnum):
     """Possible duration formatting modes for the report."""
 
@@ -51,8 +87,40 @@ class TimeFormat(StrEnum):
     AUTO = "auto"
 
 
+class Compression(StrEnum):
+    """Possible compression codecs of the binary export."""
+
+    NONE = "none"
+    ZLIB = "zlib"
+    LZMA = "lzma"
+
+
+class RunOrder(StrEnum):
+    """Possible orders of collected tests by their recorded durations."""
+
+    SLOWEST_FIRST = "slowest-first"
+    FASTEST_FIRST = "fastest-first"
+
+
+class BudgetAction(StrEnum):
+    """Possible consequences of a test phase exceeding its duration budget."""
+
+    WARN = "warn"
+    XFAIL = "xfail"
+    FAIL = "fail"
+
+
 ALL_CATEGORIES: tuple[Category, ...] = tuple(Category)
 
+# Categories measured in every session. The others are derived from them or from the session phases,
+# and are recorded only if their sections are shown.
+PRIMARY_CATEGORIES: tuple[Category, ...] = (
+    Category.FIXTURE_SETUP,
+    Category.TEST_CALL,
+    Category.TEST_SETUP,
+    Category.TEST_TEARDOWN,
+)
+
 # Selectable stat columns for --pytest-durations-columns. Each key is a selectable
 # column name (also a ReportRowT field); its value is the TimeValuesT field used for
 # sorting. The row key ("name") is always shown separately and can never be selected
@@ -66,8 +134,25 @@ COLUMN_NAMES: dict[str, str] = {
     "p90": "p90",
     "p95": "p95",
     "p99": "p99",
+    "base": "base",
+    "diff": "diff",
+    "ratio": "ratio",
+    "prev": "prev",
+    "delta": "delta",
+    "trend": "trend",
+    "cold": "cold",
+    "warm": "warm",
 }
 
+# Comparison columns appended to the default column set when a baseline is compared against.
+COMPARE_COLUMNS: tuple[str, ...] = ("base", "diff", "ratio")
+
+# Columns filled with timing data of previous runs stored in the pytest cache.
+TREND_COLUMNS: tuple[str, ...] = ("prev", "delta", "trend")
+
+# Columns appended to the default column set when cold samples are recorded.
+COLD_COLUMNS: tuple[str, ...] = ("cold", "warm")
+
 DEFAULT_COLUMNS: tuple[str, ...] = ("total", "num", "med", "max")
 
 CATEGORY_NAMES: dict[str, Category] = {
@@ -75,8 +160,16 @@ CATEGORY_NAMES: dict[str, Category] = {
     "call": Category.TEST_CALL,
     "setup": Category.TEST_SETUP,
     "teardown": Category.TEST_TEARDOWN,
+    "collect": Category.COLLECT,
+    "session": Category.SESSION,
+    "param": Category.PARAM,
+    "outcome": Category.OUTCOME,
 }
 
+# Final test outcomes, plain strings like categories, as they are passed through the pytest-xdist channel.
+# A test gets the outcome of its first phase which did not pass, like the terminal summary counts it.
+OUTCOMES: tuple[str, ...] = ("passed", "failed", "error", "skipped", "xfailed", "xpassed")
+
 
 def parse_categories(value: str) -> tuple[Category, ...]:
     """Parse a comma-separated list of section names into an ordered tuple of categories.
@@ -97,6 +190,46 @@ def parse_categories(value: str) -> tuple[Category, ...]:
     return tuple(parsed)
 
 
+def parse_outcomes(value: str) -> tuple[str, ...]:
+    """Parse a comma-separated list of final test outcomes into an ordered tuple.
+
+    An empty value selects every outcome.
+    """
+    if not value:
+        return OUTCOMES
+    parsed: list[str] = []
+    for raw_name in value.split(","):
+        name = raw_name.strip()
+        if name not in OUTCOMES:
+            choices = ", ".join(OUTCOMES)
+            message = f"unknown outcome {name!r}; choose from: {choices}"
+            raise ArgumentTypeError(message)
+        parsed.append(name)
+    return tuple(parsed)
+
+
+def parse_group_by(value: str) -> GroupBy | MarkerGroupBy | PathGroupBy:
+    """Parse a grouping strategy name, a "marker:NAME,..." list of marker names or a "path:N" path depth."""
+    if value.startswith(MARKER_GROUP_BY_PREFIX):
+        names = tuple(filter(None, (name.strip() for name in value.removeprefix(MARKER_GROUP_BY_PREFIX).split(","))))
+        if not names:
+            message = f"invalid grouping {value!r}; use {MARKER_GROUP_BY_PREFIX}NAME[,NAME...]"
+            raise ArgumentTypeError(message)
+        return MarkerGroupBy(names=names)
+    if value.startswith(PATH_GROUP_BY_PREFIX):
+        depth = value.removeprefix(PATH_GROUP_BY_PREFIX)
+        if not depth.isdigit() or int(depth) < 1:
+            message = f"invalid grouping {value!r}; use {PATH_GROUP_BY_PREFIX}N with a positive N"
+            raise ArgumentTypeError(message)
+        return PathGroupBy(depth=int(depth))
+    try:
+        return GroupBy(value)
+    except ValueError:
+        choices = ", ".join([*GroupBy, f"{MARKER_GROUP_BY_PREFIX}NAMES", f"{PATH_GROUP_BY_PREFIX}N"])
+        message = f"unknown grouping {value!r}; choose from: {choices}"
+        raise ArgumentTypeError(message) from None
+
+
 def parse_columns(value: str) -> tuple[str, ...]:
     """Parse a comma-separated list of stat column names into an ordered tuple.
 
@@ -113,3 +246,31 @@ def parse_columns(value: str) -> tuple[str, ...]:
             raise ArgumentTypeError(message)
         parsed.append(name)
     return tuple(parsed)
+
+
+def parse_buckets(value: str) -> tuple[float, ...]:
+    """Parse a comma-separated list of histogram bucket upper bounds in seconds into a sorted tuple."""
+    bounds: set[float] = set()
+    for raw_bound in value.split(","):
+        try:
+            bound = float(raw_bound)
+        except ValueError:
+            bound = math.nan
+        if not math.isfinite(bound):
+            message = f"invalid bucket {raw_bound.strip()!r}; use comma-separated finite upper bounds in seconds"
+            raise ArgumentTypeError(message)
+        bounds.add(bound)
+    return tuple(sorted(bounds))
+
+
+def parse_shard(value: str) -> tuple[int, int]:
+    """Parse a "K/N" shard specification into a 1-based shard index and the number of shards."""
+    raw_index, _, raw_count = value.partition("/")
+    try:
+        index, count = int(raw_index), int(raw_count)
+    except ValueError:
+        index = count = 0
+    if not 1 <= index <= count:
+        message = f"invalid shard {value!r}; use K/N with 1 <= K <= N"
+        raise ArgumentTypeError(message)
+    return index, count
@@ -0,0 +1,77 @@
+"""Utilization and load imbalance of pytest-xdist workers."""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Mapping
+
+
+class WorkerStats:
+    """Time spent in tests run by a single pytest-xdist worker."""
+
+    tests: dict[str, float]  # test node ID → setup, call and teardown duration in seconds
+    elapsed: float           # worker session time in seconds, from configuration to its last flush
+    crashed: bool            # measurements since the last flush were recovered from the worker spool
+
+    def __init__(self):
+        self.tests = {}
+        self.elapsed = 0.0
+        self.crashed = False
+
+    def add_report(self, nodeid: str, duration: float) -> None:
+        """Account a test phase report duration."""
+        self.tests[nodeid] = self.tests.get(nodeid, 0.0) + duration
+
+    @property
+    def busy(self) -> float:
+        """Return time spent running tests in seconds."""
+        return sum(self.tests.values())
+
+    @property
+    def idle(self) -> float:
+        """Return time spent starting up, collecting and waiting for tests in seconds."""
+        return max(self.elapsed - self.busy, 0.0)
+
+
+class UtilizationT(NamedTuple):
+    """Load balance summary of all workers."""
+
+    critical: str     # ID of the worker with the highest load
+    makespan: float   # Highest worker load in seconds
+    average: float    # Average worker load in seconds
+
+    @property
+    def ratio(self) -> float:
+        """Return makespan to average load ratio, 1.0 for perfectly balanced workers."""
+        return self.makespan / self.average if self.average else 1.0
+
+
+def get_utilization(workers: Mapping[str, WorkerStats]) -> UtilizationT:
+    """Return load balance summary of non-empty worker stats."""
+    critical = max(workers, key=lambda worker_id: workers[worker_id].busy)
+    return UtilizationT(
+        critical=critical,
+        makespan=workers[critical].busy,
+        average=sum(stats.busy for stats in workers.values()) / len(workers),
+    )
+
+
+def get_utilization_rows(
+    workers: Mapping[str, WorkerStats],
+    format_seconds: Callable[[float], str],
+) -> list[tuple[str, ...]]:
+    """Return per-worker table rows sorted by busy time (descending), including a header."""
+    rows = [("worker", "tests", "busy", "idle", "elapsed", "util")]
+    rows.extend(
+        (
+            f"{worker_id} (crashed)" if stats.crashed else worker_id,
+            str(len(stats.tests)),
+            format_seconds(stats.busy),
+            format_seconds(stats.idle),
+            format_seconds(stats.elapsed),
+            f"{stats.busy / stats.elapsed:.0%}" if stats.elapsed else "-",
+        )
+        for worker_id, stats in sorted(workers.items(), key=lambda item: item[1].busy, reverse=True)
+    )
+    return rows
@@ -1,24 +1,144 @@
 """Pytest plugin mixin to be used when xdist package is used."""
+import shutil
+import tempfile
+from itertools import chain
+from pathlib import Path
 from typing import TYPE_CHECKING, Any, Union
 
 import pytest
 
+from pytest_durations.binary_exporter import pack_samples, unpack_samples
+from pytest_durations.budgets import BudgetViolationT
+from pytest_durations.helpers import is_xdist_worker
+from pytest_durations.history import load_history
+from pytest_durations.scheduling import DurationScheduling
+from pytest_durations.spool import MeasurementSpool, load_spool
+from pytest_durations.ticker import get_current_ticks
+from pytest_durations.utilization import WorkerStats
+
 if TYPE_CHECKING:
-    from _pytest.config import ExitCode
+    from _pytest.config import Config, ExitCode
     from _pytest.main import Session
+    from _pytest.reports import TestReport
+    from xdist.remote import Producer
     from xdist.workermanage import WorkerController
 
-    from pytest_durations.typing import CategoryMeasurementsT, FunctionMeasurementsT
+    from pytest_durations.cold import ColdSamples
+    from pytest_durations.eta import RemainingTimeEstimator
+    from pytest_durations.hooks import HookTimer
+    from pytest_durations.openmetrics import DurationHistograms
+    from pytest_durations.rebuilds import FixtureRebuilds
+    from pytest_durations.retries import RetryCosts
+    from pytest_durations.typing import CategoryMeasurementsT, CategoryT, FunctionKeyT
+
+    # key table, number of samples per key and all samples packed into little-endian float64 bytes
+    EncodedMeasurementsT = tuple[list[FunctionKeyT], list[int], bytes]
 
 
 _WORKEROUTPUT_ATTR = "workeroutput"
 _PLUGIN_KEY = "pytest_durations"
+# test report attribute carrying measurements recorded by a worker since its previous flush
+_REPORT_ATTR = "pytest_durations"
+# worker input key of the directory with worker spool files
+_SPOOL_KEY = "pytest_durations_spool"
 
 
 class PytestDurationXdistMixin:
-    """Mixin to combine measurements from xdist workers."""
+    """Mixin to combine measurements from xdist workers.
+
+    Workers move measurements recorded since the previous flush into a payload attached to a test teardown
+    report at most once per flush interval, the controller merges it when the report arrives. The rest is
+    sent through the worker output at the end of the worker session, so only data of the last interval is
+    lost if a worker crashes. Payloads are tagged with the worker ID, so the controller also keeps per-worker
+    utilization stats.
+
+    On request, workers also spool every sample not sent yet to a file in a directory created by the
+    controller. If a worker crashes, the controller recovers the samples from its spool file and marks
+    the worker as crashed in the report.
+
+    On request, the controller also replaces the pytest-xdist scheduler with one sending the slowest
+    tests of a previous run first, and starts the remaining time prediction once the first worker
+    has collected the tests, as the controller collects none itself.
+    """
 
     measurements: "CategoryMeasurementsT"
+    histograms: "DurationHistograms | None"
+    workers: dict[str, WorkerStats]
+    spool: MeasurementSpool | None
+    eta: "RemainingTimeEstimator | None"
+    budget_violations: list[BudgetViolationT]
+    hooks: "HookTimer | None"
+    rebuilds: "FixtureRebuilds"
+    marker_tags: dict["FunctionKeyT", str]
+    retries: "RetryCosts"
+    outcomes: dict["FunctionKeyT", str]
+    cold: "ColdSamples | None"
+    spool_dir: str | None
+    xdist_worker: bool
+    worker_id: str
+    flush_interval: float
+    started: float
+    last_flush: float
+
+    def __init__(self):
+        super().__init__()
+        self.xdist_worker = False
+        self.worker_id = ""
+        self.flush_interval = 0.0
+        self.started = 0.0
+        self.last_flush = 0.0
+        self.spool_dir = None
+
+    def pytest_configure(self, config: "Config") -> None:
+        """Remember whether the current process is a pytest-xdist worker and how often it flushes."""
+        self.xdist_worker = is_xdist_worker(config)
+        if self.xdist_worker:
+            self.worker_id = config.workerinput["workerid"]
+            spool_dir: str | None = config.workerinput.get(_SPOOL_KEY)
+            if spool_dir is not None:
+                try:
+                    self.spool = MeasurementSpool(_get_spool_filename(spool_dir, self.worker_id))
+                except OSError:
+                    # remote workers (ssh, socket) have no access to the controller's directory
+                    self.spool = None
+        self.flush_interval = config.getoption("--pytest-durations-xdist-flush")
+        self.started = self.last_flush = get_current_ticks()
+
+    def pytest_configure_node(self, node: "WorkerController") -> None:
+        """Pass the spool directory to a worker if requested, create it for the first one."""
+        if not node.config.getoption("--pytest-durations-xdist-spool"):
+            return
+        if self.spool_dir is None:
+            self.spool_dir = tempfile.mkdtemp(prefix="pytest-durations-")
+        node.workerinput[_SPOOL_KEY] = self.spool_dir
+
+    def pytest_unconfigure(self, config: "Config") -> None:
+        """Remove the spool directory on the controller."""
+        if self.spool_dir is not None:
+            shutil.rmtree(self.spool_dir, ignore_errors=True)
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_logreport(self, report: "TestReport") -> None:
+        """Attach measurements to worker reports before they are sent, merge them on the controller."""
+        if self.xdist_worker:
+            now = get_current_ticks()
+            if report.when != "teardown" or report.outcome == "rerun":
+                # retried attempts are sent along with the final one
+                return
+            if now - self.last_flush >= self.flush_interval:
+                self.last_flush = now
+                setattr(report, _REPORT_ATTR, self._flush())
+            elif self.spool is not None:
+                self.spool.flush()
+            return
+        worker_id: str | None = getattr(report, "worker_id", None)
+        if worker_id is not None:
+            self.workers.setdefault(worker_id, WorkerStats()).add_report(report.nodeid, report.duration)
+        payload: dict[str, Any] | None = getattr(report, _REPORT_ATTR, None)
+        if payload is not None:
+            # drop the payload, so that other report consumers never see it
+            delattr(report, _REPORT_ATTR)
+            self._merge(payload)
 
     @pytest.hookimpl(tryfirst=True)
     def pytest_sessionfinish(self, session: "Session", exitstatus: Union[int, "ExitCode"]) -> None:
@@ -26,25 +146,124 @@ class PytestDurationXdistMixin:
         # for xdist, results should be added to worker output
         workeroutput: dict[str, Any] | None = getattr(session.config, _WORKEROUTPUT_ATTR, None)
         if workeroutput is not None:
-            workeroutput[_PLUGIN_KEY] = dump_measurements(self.measurements)
+            workeroutput[_PLUGIN_KEY] = self._flush()
+        if self.spool is not None:
+            self.spool.close()
+
+    def pytest_xdist_make_scheduler(self, config: "Config", log: "Producer") -> DurationScheduling | None:
+        """Schedule tests by their durations in a previous run if requested."""
+        source = config.getoption("--pytest-durations-schedule")
+        if not source:
+            return None
+        return DurationScheduling(config, log, durations=load_history(config, source))
+
+    def pytest_xdist_node_collection_finished(self, node: "WorkerController", ids: list[str]) -> None:
+        """Start predicting the remaining time of tests collected by the first worker."""
+        if self.eta is None:
+            self._start_eta(config=node.config, nodeids=ids)
 
     def pytest_testnodedown(self, node: "WorkerController", error: Any | None) -> None:
-        """Merge measurements from slave processes if the current sessions runs under pytest-xdist."""
+        """Merge measurements from slave processes if the current sessions runs under pytest-xdist.
+
+        Measurements of a crashed worker are recovered from its spool file instead.
+        """
         # for xdist, results should be accumulated from workers
         workeroutput: dict[str, Any] | None = getattr(node, _WORKEROUTPUT_ATTR, None)
         if workeroutput is not None:
-            node_measurements = node.workeroutput[_PLUGIN_KEY]
-            load_measurements(node_measurements, self.measurements)
+            self._merge(node.workeroutput[_PLUGIN_KEY])
+        elif self.spool_dir is not None:
+            self._recover(node.workerinput["workerid"])
+
+    def _flush(self) -> dict[str, Any]:
+        """Move measurements recorded since the previous flush into a payload with simple types only."""
+        payload: dict[str, Any] = {
+            "worker": (self.worker_id, get_current_ticks() - self.started),
+            "measurements": dump_measurements(self.measurements),
+            "budget_violations": list(map(tuple, self.budget_violations)),
+            "rebuilds": self.rebuilds.dump(),
+            "marker_tags": self.marker_tags,
+            "retries": self.retries.dump(),
+            "outcomes": self.outcomes,
+        }
+        self.marker_tags = {}
+        self.outcomes = {}
+        self.measurements = {category: {} for category in self.measurements}
+        self.budget_violations = []
+        self.rebuilds.clear()
+        self.retries.clear()
+        if self.histograms is not None:
+            payload["histograms"] = self.histograms.dump()
+            self.histograms.clear()
+        if self.hooks is not None:
+            payload["hooks"] = self.hooks.dump()
+            self.hooks.clear()
+        if self.cold is not None:
+            payload["cold"] = self.cold.dump()
+            self.cold.clear()
+        if self.spool is not None:
+            self.spool.truncate()
+        return payload
+
+    def _merge(self, payload: dict[str, Any]) -> None:
+        """Merge a worker payload into the controller measurements."""
+        worker_id, elapsed = payload["worker"]
+        stats = self.workers.setdefault(worker_id, WorkerStats())
+        stats.elapsed = max(stats.elapsed, elapsed)
+        load_measurements(payload["measurements"], self.measurements)
+        self.budget_violations.extend(map(BudgetViolationT._make, payload["budget_violations"]))
+        self.rebuilds.load(payload["rebuilds"], worker_id=worker_id)
+        self.marker_tags.update(payload["marker_tags"])
+        self.retries.load(payload["retries"])
+        self.outcomes.update(payload["outcomes"])
+        if self.histograms is not None:
+            self.histograms.load(payload["histograms"])
+        if self.hooks is not None:
+            self.hooks.load(payload["hooks"])
+        if self.cold is not None:
+            self.cold.load(payload["cold"])
+
+    def _recover(self, worker_id: str) -> None:
+        """Merge samples spooled by a crashed worker into the controller measurements."""
+        self.workers.setdefault(worker_id, WorkerStats()).crashed = True
+        for category, key, duration in load_spool(_get_spool_filename(self.spool_dir, worker_id)):
+            self.measurements[category].setdefault(key, []).append(duration)
+            if self.histograms is not None:
+                self.histograms.observe(category, key, duration)
+
 
+def _get_spool_filename(spool_dir: str, worker_id: str) -> str:
+    return str(Path(spool_dir) / f"{worker_id}.jsonl")
 
-def dump_measurements(measurements: "CategoryMeasurementsT") -> dict[str, "FunctionMeasurementsT"]:
-    """Serialize category measurement mapping with simple types only."""
-    return measurements
 
+def dump_measurements(measurements: "CategoryMeasurementsT") -> dict["CategoryT", "EncodedMeasurementsT"]:
+    """Serialize category measurement mapping with simple types only.
 
-def load_measurements(measurements: dict[str, "FunctionMeasurementsT"], destination: "CategoryMeasurementsT") -> None:
+    Every category is encoded as a key table, sample counts and packed samples, so that execnet
+    sends a few primitive objects instead of one object per sample.
+    """
+    return {
+        category: (list(series), list(map(len, series.values())), pack_samples([*chain(*series.values())]))
+        for category, series in measurements.items()
+    }
+
+
+def load_measurements(
+    measurements: dict["CategoryT", "EncodedMeasurementsT"],
+    destination: "CategoryMeasurementsT",
+) -> None:
     """Deserialize category measurement mapping into an existing object."""
-    for category, src_series in measurements.items():
+    for category, (keys, counts, data) in measurements.items():
+        samples = unpack_samples(data)
         dst_series = destination[category]
+        offset = 0
+        for key, count in zip(keys, counts, strict=True):
+            dst_series.setdefault(key, []).extend(samples[offset:offset + count])
+            offset += count
+
+
+def merge_measurements(measurements: "CategoryMeasurementsT", destination: "CategoryMeasurementsT") -> None:
+    """Merge category measurement mapping into an existing object, adding categories it has no series of."""
+    for category, src_series in measurements.items():
+        dst_series = destination.setdefault(category, {})
         for key, values in src_series.items():
             dst_series.setdefault(key, []).extend(values)
@@ -0,0 +1,120 @@
+"""Tests for binary exporter."""
+import json
+import struct
+
+import pytest
+
+from pytest_durations.binary_exporter import (
+    MAGIC,
+    VERSION,
+    BinaryMeasurements,
+    export_binary,
+    is_binary_export,
+    load_binary,
+)
+from pytest_durations.types import Category, Compression
+
+SAMPLE_MEASUREMENTS = {
+    Category.FIXTURE_SETUP: {
+        "fixture_foo": [0.5],
+    },
+    Category.TEST_CALL: {
+        "test_foo": [0.001, 0.002, 0.003],
+        "test_bar": [],
+    },
+}
+
+HEADER = struct.Struct("<8sHBxQQ")
+
+
+@pytest.fixture(params=[*Compression])
+def compression(request):
+    return request.param
+
+
+@pytest.fixture
+def sample_binary_file(tmp_path, compression):
+    path = tmp_path / "durations.bin"
+    export_binary(measurements=SAMPLE_MEASUREMENTS, filename=str(path), compression=compression)
+    return path
+
+
+def test_export_binary_roundtrip(sample_binary_file):
+    """load_binary should restore every raw sample."""
+    assert load_binary(str(sample_binary_file)) == SAMPLE_MEASUREMENTS
+
+
+def test_binary_measurements_single_key(sample_binary_file):
+    """A single key can be read and aggregated without loading the rest."""
+    with BinaryMeasurements(str(sample_binary_file)) as reader:
+        assert [*reader.categories()] == [Category.FIXTURE_SETUP, Category.TEST_CALL]
+        assert [*reader.names(Category.TEST_CALL)] == ["test_foo", "test_bar"]
+        assert [*reader.names("unknown")] == []
+        assert reader.count(Category.TEST_CALL, "test_foo") == 3
+        stats = reader.stats(Category.TEST_CALL, "test_foo")
+    assert stats.calls == 3
+    assert stats.sum == pytest.approx(0.006)
+    assert stats.med == 0.002
+
+
+def test_is_binary_export(tmp_path, sample_binary_file):
+    other = tmp_path / "durations.json"
+    other.write_text("{}")
+    assert is_binary_export(str(sample_binary_file)) is True
+    assert is_binary_export(str(other)) is False
+
+
+def test_binary_measurements_invalid(tmp_path):
+    path = tmp_path / "durations.json"
+    path.write_text("{}" * 32)
+    with pytest.raises(ValueError, match="is not a pytest-durations binary export"):
+        BinaryMeasurements(str(path))
+
+
+def write_export(path, index, *, code=0, blocks=b"", bounds=None):
+    """Write a binary export with a handcrafted header and index, optionally with given index offset and length."""
+    data = json.dumps(index).encode()
+    offset, length = bounds or (HEADER.size + len(blocks), len(data))
+    path.write_bytes(HEADER.pack(MAGIC, VERSION, code, offset, length) + blocks + data)
+
+
+@pytest.mark.parametrize(
+    ("export", "message"),
+    [
+        ({"index": {}, "bounds": (HEADER.size, 1000)}, "index out of bounds"),
+        ({"index": {}, "bounds": (1, 2)}, "index out of bounds"),
+        ({"index": {}, "code": 9}, "unknown compression code 9"),
+        ({"index": []}, "malformed index"),
+        ({"index": {"keys": []}}, "malformed index"),
+        ({"index": {"keys": [], "categories": {"test call": [[0, 28, 8, 1]]}}}, "malformed index"),
+        ({"index": {"keys": ["a"], "categories": {"test call": [[0, 28, 8]]}}}, "malformed index"),
+        ({"index": {"keys": ["a"], "categories": {"test call": [[0, "28", 8, 1]]}}}, "malformed block entry"),
+        ({"index": {"keys": ["a"], "categories": {"test call": [[0, 28, 8, 1]]}}}, "block out of bounds"),
+        ({"index": {"keys": ["a"], "categories": {"test call": [[0, 0, 8, 1]]}}, "blocks": bytes(8)}, "block out"),
+        ({"index": {"keys": ["a"], "categories": {"test call": [[0, 28, 8, -1]]}}, "blocks": bytes(8)}, "block out"),
+    ],
+)
+def test_binary_measurements_corrupt(tmp_path, export, message):
+    """Corrupt headers and indexes are rejected on open instead of failing on access."""
+    path = tmp_path / "durations.bin"
+    write_export(path, **export)
+    with pytest.raises(ValueError, match=f"is not a pytest-durations binary export .*: {message}"):
+        BinaryMeasurements(str(path))
+
+
+@pytest.mark.parametrize("content", [b"", MAGIC])
+def test_binary_measurements_truncated(tmp_path, content):
+    path = tmp_path / "durations.bin"
+    path.write_bytes(content)
+    with pytest.raises(ValueError, match="truncated header"):
+        BinaryMeasurements(str(path))
+
+
+@pytest.mark.parametrize(("code", "blocks"), [(0, bytes(12)), (1, bytes(12)), (2, bytes(12))])
+def test_binary_measurements_corrupt_samples(tmp_path, code, blocks):
+    """Blocks which do not decode into the exported number of samples raise ValueError when read."""
+    path = tmp_path / "durations.bin"
+    index = {"keys": ["a"], "categories": {"test call": [[0, HEADER.size, len(blocks), 1]]}}
+    write_export(path, index, code=code, blocks=blocks)
+    with BinaryMeasurements(str(path)) as reader, pytest.raises(ValueError, match="corrupt samples block of a"):
+        reader.samples(Category.TEST_CALL, "a")
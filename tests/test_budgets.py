@@ -0,0 +1,79 @@
+from types import SimpleNamespace
+
+import pytest
+
+from pytest_durations.budgets import (
+    BudgetViolationT,
+    get_item_budgets,
+    parse_budgets,
+    parse_directory_budgets,
+)
+from pytest_durations.options import BUDGET_MARKER
+from pytest_durations.types import Category
+
+
+def make_item(nodeid, **budgets):
+    marker = getattr(pytest.mark, BUDGET_MARKER)(**budgets).mark if budgets else None
+    return SimpleNamespace(nodeid=nodeid, get_closest_marker=lambda name: marker if name == BUDGET_MARKER else None)
+
+
+def test_parse_budgets():
+    assert parse_budgets({"call": 0.5, "setup": "2"}, origin="test") == {
+        Category.TEST_CALL: 0.5,
+        Category.TEST_SETUP: 2.0,
+    }
+
+
+@pytest.mark.parametrize(
+    ("phases", "message"),
+    [
+        ({"fixture": 1.0}, "test: unknown phase 'fixture'; choose from: setup, call, teardown"),
+        ({"call": "fast"}, "test: invalid call budget 'fast'; use a non-negative number of seconds"),
+        ({"call": None}, "test: invalid call budget None; use a non-negative number of seconds"),
+        ({"teardown": -1}, "test: invalid teardown budget -1; use a non-negative number of seconds"),
+    ],
+)
+def test_parse_budgets_invalid(phases, message):
+    with pytest.raises(pytest.UsageError, match=message.replace("(", r"\(")):
+        parse_budgets(phases, origin="test")
+
+
+def test_parse_directory_budgets():
+    """Directories are normalized and sorted from the most specific one."""
+    lines = ["./ call=5", "tests/ call=1", "tests/unit call=0.5 setup=2"]
+    assert parse_directory_budgets(lines) == [
+        ("tests/unit", {Category.TEST_CALL: 0.5, Category.TEST_SETUP: 2.0}),
+        ("tests", {Category.TEST_CALL: 1.0}),
+        ("", {Category.TEST_CALL: 5.0}),
+    ]
+
+
+def test_parse_directory_budgets_invalid():
+    with pytest.raises(pytest.UsageError, match="line 'tests call': invalid call budget ''"):
+        parse_directory_budgets(["tests call"])
+
+
+def test_get_item_budgets():
+    """The closest directory applies, markers override it by phase."""
+    directory_budgets = parse_directory_budgets(["tests call=1 teardown=1", "tests/unit call=0.5"])
+    items = [
+        make_item("tests/unit/test_a.py::test_1"),
+        make_item("tests/unit/test_a.py::test_2", setup=2.0, call=0.1),
+        make_item("tests/test_b.py::test_3"),
+        make_item("tests_other/test_c.py::test_4"),
+    ]
+    assert get_item_budgets(items, directory_budgets=directory_budgets) == {
+        Category.TEST_SETUP: {"tests/unit/test_a.py::test_2": 2.0},
+        Category.TEST_CALL: {
+            "tests/unit/test_a.py::test_1": 0.5,
+            "tests/unit/test_a.py::test_2": 0.1,
+            "tests/test_b.py::test_3": 1.0,
+        },
+        Category.TEST_TEARDOWN: {"tests/test_b.py::test_3": 1.0},
+    }
+
+
+def test_budget_violation():
+    violation = BudgetViolationT(Category.TEST_CALL, "test_foo", 0.75, 0.5)
+    assert violation.overrun == 0.25
+    assert violation.message == "call took 0.750s, exceeding its duration budget of 0.500s"
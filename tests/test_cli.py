@@ -0,0 +1,152 @@
+"""Tests for command line interface."""
+from pathlib import Path
+
+import pytest
+
+from pytest_durations.binary_exporter import export_binary
+from pytest_durations.cli import main, merge_exports
+from pytest_durations.database import export_database
+from pytest_durations.json_exporter import export_json
+from pytest_durations.types import ALL_CATEGORIES, PRIMARY_CATEGORIES, Category
+
+
+@pytest.fixture
+def database(tmp_path):
+    path = str(tmp_path / "durations.db")
+    for times in ([1.0, 3.0], [2.0]):
+        export_database(measurements={Category.TEST_CALL: {"test_foo": times}}, filename=path)
+    return path
+
+
+def test_trend(database, capsys):
+    assert main(["trend", database, "test_foo", "--time-format", "auto"]) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0].split() == ["run", "finished", "num", "total", "min", "med", "max"]
+    assert lines[1].split()[2:] == ["2", "4.000s", "1.000s", "2.000s", "3.000s"]
+    assert lines[2].split()[2:] == ["1", "2.000s", "2.000s", "2.000s", "2.000s"]
+
+
+def test_trend_unknown_key(database, capsys):
+    assert main(["trend", database, "test_foo", "--category", "setup"]) == 1
+    assert capsys.readouterr().err == 'No "setup" durations recorded for "test_foo"\n'
+
+
+@pytest.mark.parametrize("content", [None, b"", b"not a database"])
+def test_trend_invalid_database(tmp_path, capsys, content):
+    """A missing or invalid database is a clean error, and no database file is created."""
+    path = tmp_path / "durations.db"
+    if content is not None:
+        path.write_bytes(content)
+    assert main(["trend", str(path), "test_foo"]) == 1
+    assert capsys.readouterr().err.startswith(f"{path}: ")
+    assert path.exists() is (content is not None)
+
+
+def test_missing_command(capsys):
+    with pytest.raises(SystemExit):
+        main([])
+
+
+@pytest.fixture
+def shards(tmp_path):
+    """Two shards of the same suite, exported as JSON with samples and as binary."""
+    first = str(tmp_path / "shard1.json")
+    second = str(tmp_path / "shard2.bin")
+    export_json(
+        measurements={
+            Category.TEST_CALL: {"tests/test_a.py::test_foo": [1.0], "tests/test_a.py::test_bar": [2.0]},
+            Category.FIXTURE_SETUP: {"tests/test_a.py::fixture_foo": [0.5]},
+        },
+        filename=first,
+        samples=True,
+    )
+    export_binary(
+        measurements={Category.TEST_CALL: {"tests/test_a.py::test_foo": [3.0], "tests/test_b.py::test_baz": [4.0]}},
+        filename=second,
+    )
+    return [first, second]
+
+
+def test_merge_exports(shards):
+    measurements = merge_exports(shards)
+    assert measurements[Category.TEST_CALL] == {
+        "tests/test_a.py::test_foo": [1.0, 3.0],
+        "tests/test_a.py::test_bar": [2.0],
+        "tests/test_b.py::test_baz": [4.0],
+    }
+    assert measurements[Category.FIXTURE_SETUP] == {"tests/test_a.py::fixture_foo": [0.5]}
+    assert measurements[Category.TEST_SETUP] == {}
+
+
+def test_report(shards, capsys):
+    assert main(["report", *shards, "--show", "call", "--group-by", "module", "--columns", "num,total"]) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0].strip("= ") == "test call duration top"
+    assert [line.split() for line in lines[1:]] == [
+        ["num", "name", "total"],
+        ["3", "tests/test_a.py", "0:00:06"],
+        ["1", "tests/test_b.py", "0:00:04"],
+        ["4", "grand", "total", "0:00:10"],
+    ]
+
+
+@pytest.mark.parametrize(
+    ("show", "expected"),
+    [
+        ((), PRIMARY_CATEGORIES),
+        (("--show", ""), ALL_CATEGORIES),
+    ],
+)
+def test_report_sections(shards, capsys, show, expected):
+    """Sections of derived categories are shown on request only."""
+    assert main(["report", *shards, *show]) == 0
+    titles = [line.strip("= ") for line in capsys.readouterr().out.splitlines() if line.startswith("=")]
+    assert titles == [f"{category} duration top" for category in expected]
+
+
+def test_report_without_samples(tmp_path, capsys):
+    path = str(tmp_path / "durations.json")
+    export_json(measurements={Category.TEST_CALL: {"test_foo": [1.0]}}, filename=path)
+    assert main(["report", path]) == 1
+    assert "has no raw samples" in capsys.readouterr().err
+
+
+def test_report_derived_categories(shards, capsys):
+    """Exports written with derived sections shown are merged, categories unknown to this version are rejected."""
+    derived = shards[0].replace("shard1", "derived")
+    export_json(measurements={Category.PARAM: {"x=1": [1.0]}}, filename=derived, samples=True)
+    assert merge_exports([*shards, derived])[Category.PARAM] == {"x=1": [1.0]}
+    unknown = shards[0].replace("shard1", "unknown")
+    export_json(measurements={"unknown": {"test_foo": [1.0]}}, filename=unknown, samples=True)
+    assert main(["report", *shards, unknown]) == 1
+    assert capsys.readouterr().err == f"unknown category 'unknown' in {unknown}\n"
+
+
+def test_report_corrupt_binary(shards, capsys):
+    """Corrupt binary exports are reported without a traceback."""
+    with Path(shards[1]).open("r+b") as fp:
+        fp.truncate(40)
+    assert main(["report", *shards]) == 1
+    message = f'"{shards[1]}" is not a pytest-durations binary export (version 1): index out of bounds'
+    assert capsys.readouterr().err == f"{message}\n"
+
+
+def test_report_group_by_path(shards, capsys):
+    assert main(["report", *shards, "--show", "call", "--group-by", "path:1", "--columns", "num"]) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert [line.split() for line in lines[1:]] == [["num", "name"], ["4", "tests"], ["4", "grand", "total"]]
+
+
+@pytest.mark.parametrize(
+    ("option", "value", "message"),
+    [
+        ("--group-by", "marker:slow", "exports do not carry markers"),
+        ("--columns", "total,trend", "unavailable column 'trend'"),
+        ("--columns", "total,unknown", "unknown column 'unknown'"),
+    ],
+)
+def test_report_unavailable_options(shards, capsys, option, value, message):
+    """Groupings and columns needing data of the pytest session are rejected."""
+    with pytest.raises(SystemExit):
+        main(["report", *shards, option, value])
+    assert message in capsys.readouterr().err
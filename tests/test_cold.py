@@ -0,0 +1,110 @@
+import pytest
+
+from pytest_durations.cold import ColdSamples, get_cold_start_rows, get_warm_times
+from pytest_durations.types import Category
+
+
+@pytest.fixture
+def cold():
+    """A module paying for a lazy import in its first test and a module without a cold start."""
+    cold = ColdSamples(limit=1)
+    for key, duration in (
+        ("test_a.py::test_first", 3.0),
+        ("test_a.py::test_second", 1.0),
+        ("test_a.py::test_third", 1.0),
+        ("test_b.py::test_first", 1.0),
+        ("test_b.py::test_second", 2.0),
+        ("test_c.py::test_only", 5.0),
+    ):
+        cold.add(Category.TEST_CALL, key, duration)
+        cold.add_test(key, duration)
+    return cold
+
+
+def test_cold_samples(cold):
+    """Test phases are cold for the first tests of every module, other keys for their own first samples."""
+    cold.add(Category.FIXTURE_SETUP, "conftest.py::db", 2.0)
+    cold.add(Category.FIXTURE_SETUP, "conftest.py::db", 0.5)
+    cold.add(Category.FIXTURE_SETUP, "tmp_path", 0.5)
+    assert cold.samples == {
+        Category.TEST_CALL: {
+            "test_a.py::test_first": [3.0],
+            "test_b.py::test_first": [1.0],
+            "test_c.py::test_only": [5.0],
+        },
+        Category.FIXTURE_SETUP: {"conftest.py::db": [2.0], "tmp_path": [0.5]},
+    }
+    assert cold.modules["test_a.py"] == ([3.0], [1.0, 1.0])
+
+
+def test_cold_samples_fixtures_by_test():
+    """Fixtures keyed by test count per module and name, derived categories have no cold samples."""
+    cold = ColdSamples(limit=1)
+    for key in (
+        "test_a.py::test_first::local",
+        "test_a.py::test_second::local",
+        "test_a.py::TestClass::test_third[1]::local",
+        "test_a.py::test_first::other",
+        "test_b.py::test_first::local",
+    ):
+        cold.add(Category.FIXTURE_SETUP, key, 1.0)
+    cold.add(Category.PARAM, "x=1", 1.0)
+    cold.add(Category.OUTCOME, "passed", 1.0)
+    cold.add(Category.SESSION, "session", 1.0)
+    assert cold.samples == {
+        Category.FIXTURE_SETUP: {
+            "test_a.py::test_first::local": [1.0],
+            "test_a.py::test_first::other": [1.0],
+            "test_b.py::test_first::local": [1.0],
+        },
+    }
+
+
+def test_cold_samples_dump_load(cold):
+    """Counts are kept on clear, so samples recorded after a dump are never cold again."""
+    data = cold.dump()
+    loaded = ColdSamples(limit=1)
+    loaded.load(data)
+    loaded.load({
+        "samples": {Category.TEST_CALL: {"test_a.py::test_first": [4.0]}},
+        "modules": {"test_a.py": ([4.0], [])},
+    })
+    assert loaded.samples[Category.TEST_CALL]["test_a.py::test_first"] == [3.0, 4.0]
+    assert loaded.modules["test_a.py"] == ([3.0, 4.0], [1.0, 1.0])
+    cold.clear()
+    cold.add(Category.TEST_CALL, "test_a.py::test_fourth", 1.0)
+    assert cold.dump() == {"samples": {}, "modules": {}}
+
+
+def test_cold_samples_discard(cold):
+    """Discarded cold samples free their place, samples not kept as cold and unknown keys are ignored."""
+    cold.discard(Category.TEST_CALL, "test_a.py::test_first", 3.0)
+    cold.discard(Category.TEST_CALL, "test_a.py::test_second", 1.0)
+    cold.discard(Category.TEST_CALL, "test_d.py::test_unknown", 1.0)
+    cold.discard_test("test_a.py::test_third", 1.0)
+    cold.discard_test("test_a.py::test_second", 1.0)
+    cold.discard_test("test_a.py::test_first", 2.0)
+    cold.discard_test("test_d.py::test_unknown", 1.0)
+    cold.add(Category.TEST_CALL, "test_a.py::test_fourth", 4.0)
+    cold.add_test("test_a.py::test_fourth", 4.0)
+    assert cold.samples[Category.TEST_CALL]["test_a.py::test_fourth"] == [4.0]
+    assert "test_a.py::test_first" not in cold.samples[Category.TEST_CALL]
+    assert cold.modules["test_a.py"] == ([3.0], [4.0])
+    cold = ColdSamples(limit=2)
+    cold.add(Category.FIXTURE_SETUP, "conftest.py::db", 2.0)
+    cold.add(Category.FIXTURE_SETUP, "conftest.py::db", 0.5)
+    cold.discard(Category.FIXTURE_SETUP, "conftest.py::db", 0.5)
+    assert cold.samples == {Category.FIXTURE_SETUP: {"conftest.py::db": [2.0]}}
+
+
+def test_get_warm_times():
+    """Cold samples are removed once each, wherever they are."""
+    assert get_warm_times([1.0, 3.0, 1.0, 3.0], [3.0, 2.0]) == [1.0, 1.0, 3.0]
+
+
+@pytest.mark.parametrize(("max_rows", "expected"), [(0, 2), (1, 2)])
+def test_get_cold_start_rows(cold, max_rows, expected):
+    """Modules without a penalty or without warm tests are skipped."""
+    rows = get_cold_start_rows(cold, max_rows=max_rows, format_seconds=str)
+    assert rows[:2] == [("penalty", "cold", "warm", "name"), ("2.0", "3.0", "1.0", "test_a.py")]
+    assert len(rows) == expected
@@ -0,0 +1,120 @@
+"""Tests for baseline comparison."""
+from functools import partial
+
+import pytest
+
+from pytest_durations.binary_exporter import export_binary
+from pytest_durations.comparison import (
+    BaselineT,
+    RegressionT,
+    find_regressions,
+    get_baseline_means,
+    get_grouped_baseline,
+    load_baseline,
+    mann_whitney_u_pvalue,
+)
+from pytest_durations.helpers import get_test_grouping_func
+from pytest_durations.json_exporter import export_json
+from pytest_durations.types import Category, GroupBy
+
+SAMPLE_MEASUREMENTS = {
+    Category.TEST_CALL: {
+        "tests/test_a.py::test_foo": [0.1, 0.3],
+        "tests/test_a.py::test_bar": [0.2],
+    },
+}
+
+
+@pytest.mark.parametrize(
+    ("export", "samples"),
+    [
+        (export_binary, (0.1, 0.3)),
+        (partial(export_json, samples=True), (0.1, 0.3)),
+        (export_json, None),
+    ],
+)
+def test_load_baseline(tmp_path, export, samples):
+    """Binary baselines and JSON ones with samples carry raw samples, other JSON ones summaries only."""
+    path = str(tmp_path / "baseline")
+    export(measurements=SAMPLE_MEASUREMENTS, filename=path)
+    baseline = load_baseline(path)
+    foo = baseline[Category.TEST_CALL]["tests/test_a.py::test_foo"]
+    assert foo.calls == 2
+    assert foo.total == pytest.approx(0.4)
+    assert foo.mean == pytest.approx(0.2)
+    assert foo.samples == samples
+
+
+@pytest.mark.parametrize(
+    ("bar_samples", "expected_samples"),
+    [
+        ((0.2,), (0.1, 0.3, 0.2)),
+        (None, None),
+    ],
+)
+def test_get_grouped_baseline(bar_samples, expected_samples):
+    """Grouped keys sum up; samples survive only if every grouped key has them."""
+    baseline = {
+        "tests/test_a.py::test_foo": BaselineT(calls=2, total=0.4, samples=(0.1, 0.3)),
+        "tests/test_a.py::test_bar": BaselineT(calls=1, total=0.2, samples=bar_samples),
+    }
+    grouped = get_grouped_baseline(baseline, grouping_func=get_test_grouping_func(group_by=GroupBy.MODULE))
+    assert grouped == {
+        "tests/test_a.py": BaselineT(calls=3, total=pytest.approx(0.6), samples=expected_samples),
+    }
+
+
+def test_get_baseline_means():
+    assert get_baseline_means({"foo": BaselineT(calls=0, total=0.0, samples=None)}) == {"foo": 0.0}
+
+
+def test_find_regressions_by_ratio():
+    """Without raw samples the ratio threshold alone flags a regression."""
+    baseline = {
+        "slow": BaselineT(calls=1, total=1.0, samples=None),
+        "same": BaselineT(calls=1, total=1.0, samples=None),
+        "tiny": BaselineT(calls=1, total=0.001, samples=None),
+        "zero": BaselineT(calls=0, total=0.0, samples=None),
+    }
+    measurements = {"slow": [2.0, 3.0], "same": [1.1], "tiny": [0.01], "zero": [1.0], "new": [1.0], "empty": []}
+    regressions = find_regressions(
+        category=Category.TEST_CALL,
+        measurements=measurements,
+        baseline=baseline,
+        ratio=1.2,
+        duration_min=0.1,
+    )
+    assert regressions == [
+        RegressionT(category=Category.TEST_CALL, name="slow", base=1.0, mean=2.5, pvalue=None, cost=3.0),
+    ]
+    assert regressions[0].ratio == 2.5
+
+
+def test_find_regressions_by_rank_test():
+    """With raw samples on both sides a noisy slowdown is not flagged."""
+    base_samples = (1.0, 1.1, 1.2, 1.3, 1.4)
+    baseline = {
+        "slow": BaselineT(calls=5, total=sum(base_samples), samples=base_samples),
+        "noisy": BaselineT(calls=5, total=sum(base_samples), samples=base_samples),
+    }
+    measurements = {"slow": [2.0, 2.1, 2.2, 2.3, 2.4], "noisy": [0.9, 1.0, 1.1, 1.2, 5.0]}
+    regressions = find_regressions(
+        category=Category.TEST_CALL,
+        measurements=measurements,
+        baseline=baseline,
+        ratio=1.2,
+    )
+    assert [regression.name for regression in regressions] == ["slow"]
+    assert regressions[0].pvalue < 0.05
+
+
+@pytest.mark.parametrize(
+    ("greater", "lesser", "expected"),
+    [
+        ((2.0, 2.1, 2.2, 2.3, 2.4), (1.0, 1.1, 1.2, 1.3, 1.4), 0.0061),
+        ((1.0, 1.1, 1.2, 1.3, 1.4), (2.0, 2.1, 2.2, 2.3, 2.4), 0.9967),
+        ((1.0, 1.0, 1.0), (1.0, 1.0, 1.0), 1.0),
+    ],
+)
+def test_mann_whitney_u_pvalue(greater, lesser, expected):
+    assert mann_whitney_u_pvalue(greater, lesser) == pytest.approx(expected, abs=1e-4)
@@ -0,0 +1,54 @@
+"""Tests for SQLite history database."""
+import sqlite3
+from contextlib import closing
+
+import pytest
+
+from pytest_durations.database import export_database, get_trends
+from pytest_durations.types import Category
+
+SAMPLE_MEASUREMENTS = {
+    Category.TEST_CALL: {
+        "test_foo": [0.001, 0.002, 0.003],
+        "test_bar": [],
+    },
+    Category.TEST_SETUP: {
+        "test_foo": [0.5],
+    },
+}
+
+
+@pytest.fixture
+def database(tmp_path):
+    return str(tmp_path / "durations.db")
+
+
+def test_export_database(database):
+    """Each export inserts a new run with aggregates of every non-empty key."""
+    first = export_database(measurements=SAMPLE_MEASUREMENTS, filename=database)
+    second = export_database(measurements=SAMPLE_MEASUREMENTS, filename=database)
+    assert (first, second) == (1, 2)
+    with closing(sqlite3.connect(database)) as connection:
+        assert connection.execute("SELECT COUNT(*) FROM durations").fetchone() == (4,)
+        assert connection.execute("SELECT COUNT(*) FROM samples").fetchone() == (0,)
+
+
+def test_export_database_samples(database):
+    export_database(measurements=SAMPLE_MEASUREMENTS, filename=database, samples=True)
+    with closing(sqlite3.connect(database)) as connection:
+        rows = connection.execute("SELECT category, key, duration FROM samples ORDER BY duration").fetchall()
+    assert rows == [
+        ("test call", "test_foo", 0.001),
+        ("test call", "test_foo", 0.002),
+        ("test call", "test_foo", 0.003),
+        ("test setup", "test_foo", 0.5),
+    ]
+
+
+def test_get_trends(database):
+    """Trends are limited to the last N runs and returned oldest first."""
+    for idx in range(3):
+        export_database(measurements={Category.TEST_CALL: {"test_foo": [float(idx)]}}, filename=database)
+    trends = get_trends(database, key="test_foo", last=2)
+    assert [(row.run, row.calls, row.total) for row in trends] == [(2, 1, 1.0), (3, 1, 2.0)]
+    assert get_trends(database, key="test_foo", category=Category.TEST_SETUP) == []
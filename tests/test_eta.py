@@ -0,0 +1,48 @@
+import json
+
+import pytest
+
+from pytest_durations.eta import RemainingTimeEstimator, format_eta, write_eta_status
+
+NODEIDS = ["test_a", "test_b", "test_c"]
+
+
+@pytest.fixture
+def estimator():
+    return RemainingTimeEstimator(NODEIDS, durations=[1.0, 3.0, None], started=10.0)
+
+
+def test_estimator_unknown_durations(estimator):
+    """Tests without a recorded duration are predicted to take the mean of the recorded ones."""
+    assert estimator.predictions == {"test_a": 1.0, "test_b": 3.0, "test_c": 2.0}
+    assert estimator.get_remaining(now=10.0) == 6.0
+
+
+def test_estimator_nothing_recorded():
+    estimator = RemainingTimeEstimator(NODEIDS, durations=[None] * 3, started=0.0)
+    assert estimator.get_remaining(now=0.0) == 3.0
+
+
+def test_estimator_corrected_by_speed(estimator):
+    """The remaining prediction is scaled by the elapsed to predicted time ratio of finished tests."""
+    estimator.finish("test_a")
+    estimator.finish("test_a")
+    estimator.finish("test_unknown")
+    assert estimator.finished == 1
+    assert estimator.get_remaining(now=12.0) == 10.0
+    estimator.finish("test_b")
+    estimator.finish("test_c")
+    assert estimator.get_remaining(now=20.0) == 0.0
+
+
+@pytest.mark.parametrize(("remaining", "expected"), [(0.4, " ETA 0:00:00"), (3725.6, " ETA 1:02:06")])
+def test_format_eta(remaining, expected):
+    assert format_eta(remaining) == expected
+
+
+def test_write_eta_status(tmp_path, estimator):
+    filename = str(tmp_path / "status.json")
+    estimator.finish("test_b")
+    write_eta_status(filename, estimator=estimator, now=13.0)
+    status = json.loads((tmp_path / "status.json").read_text())
+    assert status == {"finished": 1, "total": 3, "elapsed": 3.0, "remaining": 3.0}
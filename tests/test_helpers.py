@@ -1,3 +1,4 @@
+from types import SimpleNamespace
 from typing import TYPE_CHECKING, cast
 
 import pytest
@@ -5,13 +6,21 @@ import pytest
 from pytest_durations.helpers import (
     _GROUPING_FUNC_MAP,
     _get_grouping_func,
+    filter_outcomes,
+    get_category_grouping_func,
+    get_collect_key,
     get_fixture_key,
+    get_marker_tags,
+    get_param_keys,
+    get_report_outcome,
     get_test_key,
     is_shared_fixture,
+    is_xdist_worker,
 )
-from pytest_durations.types import GroupBy
+from pytest_durations.types import Category, GroupBy, MarkerGroupBy, PathGroupBy
 
 if TYPE_CHECKING:
+    from _pytest.config import Config
     from _pytest.fixtures import FixtureRequest, SubRequest
 
 
@@ -69,6 +78,77 @@ class TestGetFixtureKey:
         assert result == expected
 
 
+@pytest.mark.parametrize(("nodeid", "expected"), [("", "."), ("tests", "tests"), ("tests/a.py::TestA", "tests/a.py")])
+def test_get_collect_key(nodeid, expected):
+    assert get_collect_key(SimpleNamespace(nodeid=nodeid)) == expected
+
+
+@pytest.mark.parametrize(
+    ("idlist", "expected"),
+    [
+        (["sqlite", "10", "data2"], "data=data2"),
+        (["sqlite-10", "data2"], "data=data2"),
+        (["sqlite-10-case-2"], "data=sqlite-10-case-2"),
+    ],
+)
+def test_get_param_keys(idlist, expected):
+    """Scalar values are kept, other values are represented by their parametrize ID."""
+    callspec = SimpleNamespace(
+        params={"backend": "sqlite", "size": 10, "data": {}},
+        indices={"backend": 1, "size": 0, "data": 2},
+        _idlist=idlist,
+        id="-".join(idlist),
+    )
+    assert get_param_keys(SimpleNamespace(callspec=callspec)) == ("backend=sqlite", "size=10", expected)
+    assert get_param_keys(SimpleNamespace()) == ()
+
+
+def test_get_marker_tags():
+    """Tests are tagged by the listed markers they have, in the order of the list."""
+    items = [
+        SimpleNamespace(nodeid=nodeid, iter_markers=lambda names=names: [SimpleNamespace(name=name) for name in names])
+        for nodeid, names in [("a", ["slow", "unit"]), ("b", ["parametrize"]), ("c", ["unit"]), ("d", ["unit"])]
+    ]
+    tags = get_marker_tags(items, names=["unit", "slow"])
+    assert tags == {"a": "unit+slow", "c": "unit", "d": "unit"}
+    assert tags["c"] is tags["d"]
+
+
+@pytest.mark.parametrize(
+    ("when", "outcome", "wasxfail", "expected"),
+    [
+        ("setup", "passed", False, "passed"),
+        ("setup", "failed", False, "error"),
+        ("setup", "skipped", False, "skipped"),
+        ("call", "failed", False, "failed"),
+        ("call", "skipped", True, "xfailed"),
+        ("call", "passed", True, "xpassed"),
+        ("teardown", "failed", False, "error"),
+    ],
+)
+def test_get_report_outcome(when, outcome, wasxfail, expected):
+    report = pytest.TestReport("test_a.py::test_a", ("test_a.py", 0, "test_a"), {}, outcome, None, when)
+    if wasxfail:
+        report.wasxfail = ""
+    assert get_report_outcome(report) == expected
+
+
+def test_filter_outcomes():
+    """Test phases of other outcomes are dropped, tests of unknown outcome and other categories are kept."""
+    measurements = {category: {} for category in Category}
+    measurements[Category.TEST_CALL] = {"test_a": [1.0], "test_b": [2.0], "test_c": [3.0]}
+    measurements[Category.FIXTURE_SETUP] = {"test_b::db": [1.0]}
+    measurements[Category.OUTCOME] = {"passed": [1.0], "failed": [2.0]}
+    filtered = filter_outcomes(measurements, outcomes={"test_a": "passed", "test_b": "failed"}, selected=("failed",))
+    assert filtered[Category.TEST_CALL] == {"test_b": [2.0], "test_c": [3.0]}
+    assert filtered[Category.FIXTURE_SETUP] == {"test_b::db": [1.0]}
+    assert filtered[Category.OUTCOME] == {"failed": [2.0]}
+    assert measurements[Category.TEST_CALL] == {"test_a": [1.0], "test_b": [2.0], "test_c": [3.0]}
+    del measurements[Category.OUTCOME]
+    filtered = filter_outcomes(measurements, outcomes={"test_a": "passed", "test_b": "failed"}, selected=("failed",))
+    assert Category.OUTCOME not in filtered
+
+
 class TestGetTestKey:
     def test_get_test_key(self, request: "FixtureRequest"):
         result = get_test_key(item=request.node)
@@ -80,6 +160,15 @@ class TestGetTestKey:
         assert result == "tests/test_helpers.py::TestGetTestKey::test_get_test_key_parametrized[None]"
 
 
+class TestIsXdistWorker:
+    def test_is_xdist_worker(self, request: "FixtureRequest"):
+        assert is_xdist_worker(request.config) is hasattr(request.config, "workerinput")
+
+    def test_is_xdist_worker_workerinput(self):
+        config = SimpleNamespace(workerinput={"workerid": "gw0"})
+        assert is_xdist_worker(cast("Config", config)) is True
+
+
 class TestGetGroupingFunc:
     @pytest.fixture(params=[*GroupBy])
     def group_by(self, request: "SubRequest"):
@@ -98,6 +187,48 @@ class TestGetGroupingFunc:
             _get_grouping_func(kind="test", group_by=cast("GroupBy", "invalid"))
         assert exc.match('Test grouping function for "invalid" not implemented')
 
+    def test_get_category_grouping_func_markers(self):
+        """Tests are grouped by their marker tags, fixtures by function."""
+        group_by = MarkerGroupBy(("unit",), tags={"test_a.py::test_a": "unit"})
+        test_func = get_category_grouping_func(category=Category.TEST_CALL, group_by=group_by)
+        assert test_func(("test_a.py::test_a", [])) == "unit"
+        assert test_func(("test_a.py::test_b", [])) == "(no marker)"
+        fixture_func = get_category_grouping_func(category=Category.FIXTURE_SETUP, group_by=group_by)
+        assert fixture_func is _GROUPING_FUNC_MAP["fixture"][GroupBy.FUNCTION]
+
+    @pytest.mark.parametrize(
+        ("key", "expected"),
+        [
+            ("tests/api/test_users.py::TestUsers::test_get[1]", "tests/api"),
+            ("tests/api/conftest.py::db", "tests/api"),
+            ("tests/test_main.py::test_main", "tests/test_main.py"),
+            ("tmp_path", "tmp_path"),
+        ],
+    )
+    @pytest.mark.parametrize("category", [Category.FIXTURE_SETUP, Category.TEST_CALL])
+    def test_get_category_grouping_func_path(self, category, key, expected):
+        """Tests and fixtures are grouped by their leading path components."""
+        grouping_func = get_category_grouping_func(category=category, group_by=PathGroupBy(2))
+        assert grouping_func((key, [])) == expected
+
+    @pytest.mark.parametrize(
+        ("category", "kind"),
+        [
+            (Category.FIXTURE_SETUP, "fixture"),
+            (Category.TEST_CALL, "test"),
+            (Category.TEST_SETUP, "test"),
+            (Category.TEST_TEARDOWN, "test"),
+        ],
+    )
+    def test_get_category_grouping_func(self, category, kind):
+        result = get_category_grouping_func(category=category, group_by=GroupBy.LEGACY)
+        assert result is _GROUPING_FUNC_MAP[kind][GroupBy.LEGACY]
+
+    @pytest.mark.parametrize("group_by", list(GroupBy))
+    def test_get_category_grouping_func_collect(self, group_by):
+        result = get_category_grouping_func(category=Category.COLLECT, group_by=group_by)
+        assert result(("tests/test_helpers.py", [1.0])) == "tests/test_helpers.py"
+
 
 class TestTestGroupBy:
     @pytest.fixture
@@ -0,0 +1,46 @@
+from types import SimpleNamespace
+
+import pytest
+
+from pytest_durations.history import get_test_durations, load_cached_trends, load_history
+from pytest_durations.json_exporter import export_json
+from pytest_durations.trends import TRENDS_CACHE_DIR, TRENDS_FILENAME, KeyTrends, save_trends
+from pytest_durations.types import Category
+
+
+@pytest.fixture
+def config(pytester):
+    return pytester.parseconfigure()
+
+
+def test_get_test_durations():
+    """Setup, call and teardown durations are summed up, fixtures are ignored."""
+    means = {
+        Category.FIXTURE_SETUP: {"fixture": 5.0},
+        Category.TEST_SETUP: {"test_foo": 0.5},
+        Category.TEST_CALL: {"test_foo": 1.0, "test_bar": 2.0},
+    }
+    assert get_test_durations(means) == {"test_foo": 1.5, "test_bar": 2.0}
+
+
+def test_load_history_export(tmp_path):
+    filename = str(tmp_path / "durations.json")
+    export_json({Category.TEST_CALL: {"test_foo": [1.0, 3.0]}, Category.TEST_TEARDOWN: {"test_foo": [0.5]}}, filename)
+    assert load_history(SimpleNamespace(), filename) == {"test_foo": 2.5}
+
+
+def test_load_history_cache(config):
+    """Durations in the cache are the moving averages of the trends store."""
+    trends = {
+        Category.FIXTURE_SETUP: KeyTrends(["fixture"], calls=[1], totals=[5.0], ewmas=[5.0]),
+        Category.TEST_CALL: KeyTrends(["test_foo", "test_bar"], calls=[2, 1], totals=[8.0, 2.0], ewmas=[3.0, 2.0]),
+        Category.TEST_SETUP: KeyTrends(["test_foo"], calls=[1], totals=[0.5], ewmas=[0.5]),
+    }
+    save_trends(config.cache.mkdir(TRENDS_CACHE_DIR) / TRENDS_FILENAME, trends)
+    assert load_history(config, "cache") == {"test_foo": 3.5, "test_bar": 2.0}
+
+
+def test_history_no_cache():
+    config = SimpleNamespace()
+    assert load_cached_trends(config) == {}
+    assert load_history(config, "cache") == {}
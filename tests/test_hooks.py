@@ -0,0 +1,159 @@
+import sys
+
+import pluggy
+import pytest
+
+from pytest_durations.hooks import HookTimer, get_hook_rows, get_plugin_name
+
+hookspec = pluggy.HookspecMarker("sample")
+hookimpl = pluggy.HookimplMarker("sample")
+
+clock = [0.0]
+
+
+def advance(seconds):
+    clock[0] += seconds
+
+
+class Specs:
+    @hookspec
+    def sample_outer(self, value):
+        pass
+
+    @hookspec
+    def sample_inner(self, value):
+        pass
+
+
+class Plain:
+    def __init__(self, pluginmanager):
+        self.pluginmanager = pluginmanager
+
+    @hookimpl
+    def sample_outer(self, value):
+        advance(1.0)
+        self.pluginmanager.hook.sample_inner(value=value)
+        return value
+
+    @hookimpl
+    def sample_inner(self, value):
+        advance(2.0)
+        if value < 0:
+            raise ValueError(value)
+        return value
+
+
+class OldStyleWrapper:
+    @hookimpl(hookwrapper=True)
+    def sample_outer(self, value):
+        advance(4.0)
+        yield
+        advance(8.0)
+
+
+class NewStyleWrapper:
+    @hookimpl(wrapper=True)
+    def sample_inner(self, value):
+        advance(16.0)
+        try:
+            return (yield)
+        except ValueError:
+            return [0]
+
+
+@pytest.fixture
+def ticks(monkeypatch):
+    """The clock only advances in hook implementations."""
+    monkeypatch.setattr("pytest_durations.hooks.get_current_ticks", lambda: clock[0])
+
+
+@pytest.fixture
+def pluginmanager():
+    pluginmanager = pluggy.PluginManager("sample")
+    pluginmanager.add_hookspecs(Specs)
+    pluginmanager.register(Plain(pluginmanager))
+    pluginmanager.register(OldStyleWrapper())
+    pluginmanager.register(NewStyleWrapper())
+    return pluginmanager
+
+
+@pytest.fixture
+def timer(pluginmanager):
+    timer = HookTimer()
+    timer.install(pluginmanager)
+    yield timer
+    timer.uninstall()
+
+
+@pytest.mark.usefixtures("ticks")
+def test_hook_timer(pluginmanager, timer):
+    """Every implementation gets its self time, wrappers are timed around their yield only."""
+    assert pluginmanager.hook.sample_outer(value=1) == [1]
+    assert timer.calls == {
+        ("OldStyleWrapper", "sample_outer"): 1,
+        ("Plain", "sample_outer"): 1,
+        ("NewStyleWrapper", "sample_inner"): 1,
+        ("Plain", "sample_inner"): 1,
+    }
+    assert timer.totals == {
+        ("OldStyleWrapper", "sample_outer"): 12.0,
+        ("Plain", "sample_outer"): 1.0,
+        ("NewStyleWrapper", "sample_inner"): 16.0,
+        ("Plain", "sample_inner"): 2.0,
+    }
+
+
+def test_hook_timer_exception(pluginmanager, timer):
+    """Exceptions of implementations are passed to wrappers, which may handle them."""
+    assert pluginmanager.hook.sample_inner(value=-1) == [0]
+    assert timer.calls[("NewStyleWrapper", "sample_inner")] == 1
+    assert timer.calls[("Plain", "sample_inner")] == 1
+
+
+def test_hook_timer_uninstall(pluginmanager, timer):
+    hookimpls = pluginmanager.hook.sample_inner.get_hookimpls()
+    functions = [hookimpl.function for hookimpl in hookimpls]
+    pluginmanager.hook.sample_inner(value=1)
+    timer.uninstall()
+    timer.uninstall()
+    pluginmanager.hook.sample_inner(value=1)
+    assert [hookimpl.function for hookimpl in hookimpls] == functions
+    assert timer.calls[("Plain", "sample_inner")] == 1
+
+
+def test_hook_timer_dump_load():
+    timer = HookTimer()
+    timer.load([("runner", "pytest_runtest_setup", 2, 0.5), ("runner", "pytest_runtest_setup", 1, 0.25)])
+    assert timer.dump() == [("runner", "pytest_runtest_setup", 3, 0.75)]
+    timer.clear()
+    assert timer.dump() == []
+
+
+@pytest.mark.parametrize(("plugin", "expected"), [(sys.modules[__name__], __name__), (Plain(None), "Plain")])
+def test_get_plugin_name(plugin, expected):
+    assert get_plugin_name(plugin) == expected
+
+
+@pytest.mark.parametrize(("max_rows", "expected"), [(0, 3), (1, 2)])
+def test_get_hook_rows(max_rows, expected):
+    timer = HookTimer()
+    timer.load([("runner", "pytest_runtest_setup", 2, 0.5), ("python", "pytest_pyfunc_call", 1, 1.0)])
+    rows = get_hook_rows(timer, max_rows=max_rows, format_seconds=str)
+    assert rows[:2] == [("total", "num", "name"), ("1.0", "1", "python pytest_pyfunc_call")]
+    assert len(rows) == expected
+
+
+def test_hook_timer_generator_closed():
+    """A wrapper closed before its teardown is closed as well."""
+    closed = []
+
+    def wrapper():
+        try:
+            yield
+        finally:
+            closed.append(True)
+
+    generator = HookTimer()._time_generator(("Plain", "sample_outer"), wrapper)
+    next(generator)
+    generator.close()
+    assert closed == [True]
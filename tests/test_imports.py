@@ -0,0 +1,42 @@
+import builtins
+import sys
+
+import pytest
+
+from pytest_durations.imports import ImportTimer
+
+PACKAGES = ("sample_main", "sample_nested")
+
+
+@pytest.fixture
+def sample_packages(pytester, monkeypatch):
+    """Package importing another one, both removed from the module cache afterwards."""
+    pytester.makepyfile(sample_main="import sample_nested", sample_nested="VALUE = 1")
+    pytester.syspathinsert()
+    for package in PACKAGES:
+        monkeypatch.delitem(sys.modules, package, raising=False)
+    yield
+    for package in PACKAGES:
+        sys.modules.pop(package, None)
+
+
+@pytest.fixture
+def ticks(monkeypatch):
+    """Every clock reading advances by one second."""
+    clock = iter(range(100))
+    monkeypatch.setattr("pytest_durations.imports.get_current_ticks", lambda: float(next(clock)))
+
+
+@pytest.mark.usefixtures("sample_packages", "ticks")
+def test_import_timer():
+    """First imports of packages are timed excluding nested package imports, other imports are not."""
+    records = []
+    import_timer = ImportTimer(record=lambda key, duration: records.append((key, duration)))
+    import_timer.install()
+    try:
+        import sample_main  # noqa: F401, PLC0415
+        import sample_nested  # noqa: F401, PLC0415
+    finally:
+        import_timer.uninstall()
+    assert builtins.__import__ is import_timer.original_import
+    assert records == [("import sample_nested", 1.0), ("import sample_main", 2.0)]
@@ -3,7 +3,9 @@ import json
 import tempfile
 from pathlib import Path
 
-from pytest_durations.json_exporter import export_json
+import pytest
+
+from pytest_durations.json_exporter import export_json, load_json_measurements
 from pytest_durations.types import Category
 
 SAMPLE_MEASUREMENTS = {
@@ -51,3 +53,33 @@ def test_export_json_empty_measurements():
         assert data["categories"] == {}
     finally:
         Path(path).unlink(missing_ok=True)
+
+
+def test_export_json_samples_roundtrip(tmp_path):
+    """Raw samples exported with samples=True should be loaded back as is."""
+    path = str(tmp_path / "durations.json")
+    export_json(measurements=SAMPLE_MEASUREMENTS, filename=path, samples=True)
+    assert load_json_measurements(path) == SAMPLE_MEASUREMENTS
+
+
+def test_load_json_measurements_without_samples(tmp_path):
+    """Summary-only exports cannot be turned back into raw samples."""
+    path = str(tmp_path / "durations.json")
+    export_json(measurements=SAMPLE_MEASUREMENTS, filename=path)
+    with pytest.raises(ValueError, match="has no raw samples"):
+        load_json_measurements(path)
+
+
+def test_export_json_cold(tmp_path):
+    """Cold samples are kept apart from the warm ones, keys without cold samples have warm ones only."""
+    path = tmp_path / "durations.json"
+    export_json(
+        measurements={Category.TEST_CALL: {"test_foo": [0.5, 0.001, 0.002], "test_bar": [0.001]}},
+        filename=str(path),
+        cold={Category.TEST_CALL: {"test_foo": [0.5]}},
+    )
+    foo, bar = json.loads(path.read_text())["categories"]["test call"]
+    assert foo["cold"] == {"calls": 1, "total": 0.5}
+    assert foo["warm"] == {"calls": 2, "total": 0.003, "med": 0.002}
+    assert bar["cold"] == {"calls": 0, "total": 0}
+    assert bar["warm"] == {"calls": 1, "total": 0.001, "med": 0.001}
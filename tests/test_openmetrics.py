@@ -0,0 +1,66 @@
+"""Tests for OpenMetrics exporter."""
+import pytest
+
+from pytest_durations.openmetrics import DurationHistograms, export_openmetrics
+from pytest_durations.types import Category, GroupBy
+
+
+@pytest.fixture
+def histograms():
+    histograms = DurationHistograms(buckets=(0.1, 1.0))
+    for key, duration in [
+        ("tests/test_a.py::test_foo", 0.05),
+        ("tests/test_a.py::test_foo", 0.1),
+        ("tests/test_a.py::test_bar", 0.5),
+        ('tests/test_"b".py::test_baz', 2.0),
+    ]:
+        histograms.observe(Category.TEST_CALL, key, duration)
+    histograms.observe(Category.FIXTURE_SETUP, "tests/test_a.py::fixture_foo", 0.01)
+    return histograms
+
+
+def test_observe(histograms):
+    """Samples on a bucket bound are counted in that bucket."""
+    assert histograms.counts[Category.TEST_CALL]["tests/test_a.py::test_foo"] == [2, 0, 0]
+    assert histograms.sums[Category.TEST_CALL]["tests/test_a.py::test_foo"] == pytest.approx(0.15)
+
+
+def test_discard(histograms):
+    """Discarded samples are uncounted, samples of keys not counted are ignored."""
+    histograms.discard(Category.TEST_CALL, "tests/test_a.py::test_foo", 0.1)
+    histograms.discard(Category.TEST_CALL, "tests/test_a.py::test_unknown", 0.1)
+    histograms.discard(Category.TEST_SETUP, "tests/test_a.py::test_foo", 0.1)
+    assert histograms.counts[Category.TEST_CALL]["tests/test_a.py::test_foo"] == [1, 0, 0]
+    assert histograms.sums[Category.TEST_CALL]["tests/test_a.py::test_foo"] == pytest.approx(0.05)
+    assert Category.TEST_SETUP not in histograms.counts
+
+
+def test_get_grouped(histograms):
+    assert histograms.get_grouped(Category.TEST_CALL, group_by=GroupBy.MODULE) == {
+        "tests/test_a.py": ([2, 1, 0], pytest.approx(0.65)),
+        'tests/test_"b".py': ([0, 0, 1], 2.0),
+    }
+    assert histograms.get_grouped(Category.TEST_SETUP, group_by=GroupBy.MODULE) == {}
+
+
+def test_export_openmetrics(tmp_path):
+    """Histograms are written by rename with cumulative buckets and escaped labels."""
+    histograms = DurationHistograms(buckets=(0.25, 1))
+    for duration in (0.25, 0.5, 2.0):
+        histograms.observe(Category.TEST_CALL, 'tests/test_"a".py::test_foo', duration)
+    path = tmp_path / "durations.prom"
+    path.write_text("stale")
+    export_openmetrics(histograms=histograms, filename=str(path), group_by=GroupBy.MODULE)
+    assert [*tmp_path.iterdir()] == [path]
+    labels = 'category="test call",group="tests/test_\\"a\\".py"'
+    assert path.read_text().splitlines() == [
+        "# TYPE pytest_durations_seconds histogram",
+        "# UNIT pytest_durations_seconds seconds",
+        "# HELP pytest_durations_seconds Duration of pytest tests and fixtures.",
+        f'pytest_durations_seconds_bucket{{{labels},le="0.25"}} 1',
+        f'pytest_durations_seconds_bucket{{{labels},le="1.0"}} 2',
+        f'pytest_durations_seconds_bucket{{{labels},le="+Inf"}} 3',
+        f"pytest_durations_seconds_count{{{labels}}} 3",
+        f"pytest_durations_seconds_sum{{{labels}}} 2.75",
+        "# EOF",
+    ]
@@ -5,13 +5,27 @@ from unittest.mock import create_autospec
 
 import pytest
 
-from pytest_durations.options import pytest_addoption, pytest_configure
+from pytest_durations.options import (
+    pytest_addoption,
+    pytest_collection_modifyitems,
+    pytest_configure,
+    pytest_load_initial_conftests,
+)
 from pytest_durations.types import (
     ALL_CATEGORIES,
     DEFAULT_COLUMNS,
+    OUTCOMES,
+    BudgetAction,
     Category,
+    GroupBy,
+    MarkerGroupBy,
+    PathGroupBy,
+    parse_buckets,
     parse_categories,
     parse_columns,
+    parse_group_by,
+    parse_outcomes,
+    parse_shard,
 )
 
 
@@ -33,13 +47,13 @@ def fake_pluginmanager():
 
 @pytest.fixture
 def fake_config(fake_pluginmanager):
-    return create_autospec(pytest.Config, instance=True, pluginmanager=fake_pluginmanager)
+    return create_autospec(pytest.Config, instance=True, pluginmanager=fake_pluginmanager, stash=pytest.Stash())
 
 
 def test_pytest_addoption(fake_parser, fake_pluginmanager):
     pytest_addoption(fake_parser, fake_pluginmanager)
     assert fake_parser.getgroup.called is True
-    assert fake_parser.getgroup.return_value.addoption.call_count == 8
+    assert fake_parser.getgroup.return_value.addoption.call_count == 34
 
 
 @pytest.mark.parametrize(
@@ -80,12 +94,104 @@ def test_parse_columns_unknown() -> None:
         parse_columns("name")
 
 
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("1", (1.0,)),
+        ("0.5, 0.1,0.5", (0.1, 0.5)),
+    ],
+)
+def test_parse_buckets(value: str, expected: tuple[float, ...]) -> None:
+    assert parse_buckets(value) == expected
+
+
+@pytest.mark.parametrize("value", ["", "0.1,abc", "0.1,inf"])
+def test_parse_buckets_invalid(value: str) -> None:
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse_buckets(value)
+
+
+@pytest.mark.parametrize(("value", "expected"), [("1/1", (1, 1)), ("2/4", (2, 4))])
+def test_parse_shard(value: str, expected: tuple[int, int]) -> None:
+    assert parse_shard(value) == expected
+
+
+@pytest.mark.parametrize("value", ["", "1", "0/2", "3/2", "a/b"])
+def test_parse_shard_invalid(value: str) -> None:
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse_shard(value)
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("module", GroupBy.MODULE),
+        ("marker:unit", MarkerGroupBy(("unit",))),
+        ("marker:unit, slow,", MarkerGroupBy(("unit", "slow"))),
+        ("path:2", PathGroupBy(2)),
+    ],
+)
+def test_parse_group_by(value: str, expected: GroupBy | MarkerGroupBy | PathGroupBy) -> None:
+    assert parse_group_by(value) == expected
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [("", OUTCOMES), ("skipped, xfailed", ("skipped", "xfailed"))],
+)
+def test_parse_outcomes(value: str, expected: tuple[str, ...]) -> None:
+    assert parse_outcomes(value) == expected
+
+
+def test_parse_outcomes_unknown() -> None:
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse_outcomes("passed,rerun")
+
+
+@pytest.mark.parametrize("value", ["", "marker:", "markers:unit", "path:", "path:0", "path:-1", "path:a"])
+def test_parse_group_by_invalid(value: str) -> None:
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse_group_by(value)
+
+
+def test_marker_group_by_str() -> None:
+    assert str(MarkerGroupBy(("unit", "slow"))) == "marker:unit,slow"
+
+
+def test_path_group_by_str() -> None:
+    assert str(PathGroupBy(2)) == "path:2"
+
+
 def test_pytest_configure(fake_config, fake_pluginmanager):
     pytest_configure(fake_config)
     assert fake_pluginmanager.register.called is True
 
 
+def test_pytest_configure_started(fake_config, fake_pluginmanager, monkeypatch):
+    """The session timeline starts when the initial conftest files start loading."""
+    monkeypatch.setattr("pytest_durations.options.get_current_ticks", lambda: 1.0)
+    pytest_load_initial_conftests(fake_config)
+    pytest_configure(fake_config)
+    assert fake_pluginmanager.register.call_args.args[0].timeline.started == 1.0
+
+
 def test_pytest_configure_disabled(fake_config, fake_pluginmanager):
-    fake_config.getoption.return_value = None
+    fake_config.getoption.side_effect = {"--pytest-durations-budget-action": BudgetAction.WARN}.get
+    fake_config.getini.return_value = []
     pytest_configure(fake_config)
     assert fake_pluginmanager.register.called is False
+
+
+@pytest.mark.parametrize(
+    ("marker", "registered", "expected"),
+    [(None, False, False), (object(), False, True), (object(), True, False)],
+)
+def test_pytest_collection_modifyitems(fake_config, fake_pluginmanager, marker, registered, expected):
+    """The plugin is registered late for tests with a duration budget, unless it is registered already."""
+    if registered:
+        pytest_configure(fake_config)
+        fake_pluginmanager.register.reset_mock()
+    item = create_autospec(pytest.Item, instance=True)
+    item.get_closest_marker.return_value = marker
+    pytest_collection_modifyitems(fake_config, [item])
+    assert fake_pluginmanager.register.called is expected
@@ -0,0 +1,85 @@
+from types import SimpleNamespace
+
+import pytest
+
+from pytest_durations.ordering import get_ordered_items, get_trend_durations
+from pytest_durations.trends import KeyTrends
+from pytest_durations.types import Category, RunOrder
+
+NODEIDS = [
+    "test_a.py::test_1",
+    "test_a.py::TestClass::test_2",
+    "test_a.py::TestClass::test_3",
+    "test_b.py::test_4",
+    "test_b.py::test_5",
+]
+
+
+@pytest.fixture
+def items():
+    return [SimpleNamespace(nodeid=nodeid) for nodeid in NODEIDS]
+
+
+@pytest.mark.parametrize(
+    ("order", "expected"),
+    [
+        (RunOrder.SLOWEST_FIRST, ["test_4", "test_5", "test_3", "test_2", "test_1"]),
+        (RunOrder.FASTEST_FIRST, ["test_1", "test_2", "test_3", "test_5", "test_4"]),
+    ],
+)
+def test_get_ordered_items(items, order, expected):
+    """Modules and classes are ordered by their totals, tests within them by their own durations."""
+    durations = [1.0, 2.0, 3.0, 6.0, None]
+    result = get_ordered_items(items, durations=durations, order=order)
+    assert [item.nodeid.rsplit("::", 1)[-1] for item in result] == expected
+
+
+@pytest.mark.parametrize("order", list(RunOrder))
+def test_get_ordered_items_unknown(items, order):
+    """Without recorded durations the collection order is kept."""
+    assert get_ordered_items(items, durations=[None] * len(items), order=order) == items
+
+
+def make_param_item(nodeid, scope):
+    """Return an item parametrized by the second or first parameter of a shared fixture."""
+    return SimpleNamespace(
+        nodeid=nodeid,
+        callspec=SimpleNamespace(indices={"shared": int(nodeid.endswith("[1]")), "local": 0}),
+        _fixtureinfo=SimpleNamespace(name2fixturedefs={"shared": [SimpleNamespace(scope=scope)]}),
+    )
+
+
+@pytest.mark.parametrize("scope", ["session", "package"])
+def test_get_ordered_items_wide_params(scope):
+    """Parameters of session and package scoped fixtures are not split by modules."""
+    nodeids = ["test_a.py::test_1[0]", "test_a.py::test_1[1]", "test_b.py::test_2[0]", "test_b.py::test_2[1]"]
+    items = [make_param_item(nodeid, scope) for nodeid in nodeids]
+    result = get_ordered_items(items, durations=[1.0, 5.0, 1.0, 1.0], order=RunOrder.SLOWEST_FIRST)
+    assert [item.nodeid for item in result] == [nodeids[1], nodeids[3], nodeids[0], nodeids[2]]
+
+
+def test_get_ordered_items_module_params():
+    """Parameters of module scoped fixtures are grouped within their module."""
+    nodeids = ["test_a.py::test_1[0]", "test_a.py::test_1[1]", "test_b.py::test_2[0]", "test_b.py::test_2[1]"]
+    items = [make_param_item(nodeid, "module") for nodeid in nodeids]
+    result = get_ordered_items(items, durations=[1.0, 5.0, 1.0, 2.0], order=RunOrder.SLOWEST_FIRST)
+    assert [item.nodeid for item in result] == [nodeids[1], nodeids[0], nodeids[3], nodeids[2]]
+
+
+def test_get_ordered_items_directories():
+    """Modules of a directory stay together, so package scoped fixtures are set up once."""
+    nodeids = ["pkg/test_a.py::test_1", "test_b.py::test_2", "pkg/test_c.py::test_3"]
+    items = [SimpleNamespace(nodeid=nodeid) for nodeid in nodeids]
+    result = get_ordered_items(items, durations=[1.0, 2.0, 2.0], order=RunOrder.SLOWEST_FIRST)
+    assert [item.nodeid for item in result] == [nodeids[2], nodeids[0], nodeids[1]]
+
+
+def test_get_trend_durations():
+    """Moving averages are summed up over the requested categories only."""
+    trends = {
+        Category.TEST_SETUP: KeyTrends(keys=NODEIDS[:2], calls=[1, 1], totals=[1.0, 1.0], ewmas=[0.5, 1.0]),
+        Category.TEST_CALL: KeyTrends(keys=NODEIDS[1:3], calls=[1, 1], totals=[2.0, 3.0], ewmas=[2.0, 3.0]),
+        Category.FIXTURE_SETUP: KeyTrends(keys=NODEIDS[3:], calls=[1, 1], totals=[1.0, 1.0], ewmas=[1.0, 1.0]),
+    }
+    categories = (Category.TEST_SETUP, Category.TEST_CALL, Category.TEST_TEARDOWN)
+    assert get_trend_durations(NODEIDS, trends=trends, categories=categories) == [0.5, 3.0, 3.0, None, None]
@@ -1,11 +1,27 @@
+import builtins
 import json
 import pathlib
+from unittest.mock import create_autospec
 
 import pytest
 from _pytest.pytester import LineMatcher
+from _pytest.terminal import TerminalReporter
+
+from pytest_durations.binary_exporter import load_binary
+from pytest_durations.cold import ColdSamples
+from pytest_durations.comparison import load_baseline
+from pytest_durations.database import get_trends
+from pytest_durations.history import load_history
+from pytest_durations.imports import ImportTimer
+from pytest_durations.json_exporter import export_json, load_json_measurements
+from pytest_durations.plugin import PytestDurationPlugin
+from pytest_durations.spool import MeasurementSpool, load_spool
+from pytest_durations.trends import TRENDS_CACHE_DIR, TRENDS_FILENAME, KeyTrends, load_trends, save_trends
+from pytest_durations.types import PRIMARY_CATEGORIES, Category
 
 SAMPLE_RESULT_LOG_NAME = "result.log"
 SAMPLE_RESULT_LOG_FIRST_LINE = "thefirstline\n"
+SAMPLE_ETA_FILE_NAME = "status.json"
 
 
 @pytest.fixture(autouse=True)
@@ -101,6 +117,21 @@ def test_plugin_disable(pytester, sample_testfile):
     result.stdout.no_fnmatch_line("*duration top*")
 
 
+@pytest.mark.parametrize(
+    "options",
+    [
+        (),
+        ("--pytest-durations-collect-imports",),
+        ("--pytest-durations-hooks",),
+    ],
+)
+def test_plugin_enabled_without_report(pytester, options):
+    """Options which need measurements register the plugin with the terminal report disabled as well."""
+    config = pytester.parseconfigure("--pytest-durations", "0", *options)
+    registered = any(isinstance(plugin, PytestDurationPlugin) for plugin in config.pluginmanager.get_plugins())
+    assert registered is bool(options)
+
+
 @pytest.mark.parametrize(
     ("show", "expected", "absent"),
     [
@@ -161,6 +192,14 @@ def test_plugin_xdist_disabled(pytester, sample_testfile):
     result.assert_outcomes(passed=2)
 
 
+def test_plugin_xdist_worker_summary():
+    """Workers should neither export nor report, the controller does it for them."""
+    config = create_autospec(pytest.Config, instance=True, workerinput={"workerid": "gw0"})
+    terminalreporter = create_autospec(TerminalReporter, instance=True)
+    PytestDurationPlugin().pytest_terminal_summary(terminalreporter, 0, config)
+    assert terminalreporter.write_sep.called is False
+
+
 def test_plugin_xdist_enabled(pytester, sample_testfile, expected_output_lines):
     """Run when pytest-xdist is enabled should be successful (#3)."""
     result = pytester.runpytest("--numprocesses", "2")
@@ -168,6 +207,18 @@ def test_plugin_xdist_enabled(pytester, sample_testfile, expected_output_lines):
     result.stdout.fnmatch_lines(expected_output_lines)
 
 
+def test_plugin_xdist_schedule(pytester, sample_testfile):
+    """Scheduled runs record test durations in the cache and schedule the next run by them."""
+    options = ("--numprocesses", "2", "--pytest-durations", "0", "--pytest-durations-schedule", "cache")
+    pytester.runpytest(*options).assert_outcomes(passed=2)
+    history = load_history(pytester.parseconfigure(), "cache")
+    assert sorted(history) == [
+        "test_plugin_xdist_schedule.py::test_function1",
+        "test_plugin_xdist_schedule.py::test_function2",
+    ]
+    pytester.runpytest(*options).assert_outcomes(passed=2)
+
+
 # JSON export tests
 
 SAMPLE_JSON_NAME = "durations.json"
@@ -203,6 +254,20 @@ def test_plugin_json_only(pytester, sample_testfile, sample_json_file):
     assert "categories" in data
 
 
+@pytest.mark.parametrize(
+    ("show", "expected"),
+    [
+        ((), list(PRIMARY_CATEGORIES)),
+        (("--pytest-durations-show", "call,outcome"), [*PRIMARY_CATEGORIES, Category.OUTCOME]),
+    ],
+)
+def test_plugin_json_derived_categories(pytester, sample_testfile, sample_json_file, show, expected):
+    """Derived categories are recorded and exported only if their sections are shown."""
+    result = pytester.runpytest("--pytest-durations", "0", "--pytest-durations-json", SAMPLE_JSON_NAME, *show)
+    result.assert_outcomes(passed=2)
+    assert list(json.loads(sample_json_file.read_text())["categories"]) == expected
+
+
 def test_plugin_json_stdout(pytester, sample_testfile):
     """--pytest-durations-json=- should emit JSON to stdout."""
     result = pytester.runpytest("--pytest-durations", "0", "--pytest-durations-json", "-")
@@ -210,3 +275,1018 @@ def test_plugin_json_stdout(pytester, sample_testfile):
     stdout = result.stdout.str()
     assert '"version": "1.0"' in stdout
     assert '"categories"' in stdout
+
+
+def test_plugin_json_samples(pytester, sample_testfile, sample_json_file):
+    """JSON export with samples should carry every raw sample."""
+    result = pytester.runpytest(
+        "--pytest-durations", "0",
+        "--pytest-durations-json", SAMPLE_JSON_NAME,
+        "--pytest-durations-json-samples",
+    )
+    result.assert_outcomes(passed=2)
+    measurements = load_json_measurements(str(sample_json_file))
+    assert sum(map(len, measurements["fixture"].values())) == 7
+
+
+# Binary export tests
+
+SAMPLE_BINARY_NAME = "durations.bin"
+
+
+def test_plugin_binary_export(pytester, sample_testfile):
+    """Binary export should write raw samples of every category."""
+    result = pytester.runpytest(
+        "--pytest-durations", "0",
+        "--pytest-durations-binary", SAMPLE_BINARY_NAME,
+        "--pytest-durations-binary-compression", "zlib",
+    )
+    result.assert_outcomes(passed=2)
+    result.stdout.no_fnmatch_line("*duration top*")
+    measurements = load_binary(str(pytester.path / SAMPLE_BINARY_NAME))
+    assert sum(map(len, measurements["test call"].values())) == 2
+    assert sum(map(len, measurements["fixture"].values())) == 7
+
+
+def test_plugin_xdist_utilization(pytester, sample_testfile):
+    """Per-worker utilization and the critical worker tests are reported for xdist runs."""
+    result = pytester.runpytest("--numprocesses", "2", "--pytest-durations-min", "0")
+    result.assert_outcomes(passed=2)
+    result.stdout.fnmatch_lines([
+        "* xdist worker utilization *",
+        "worker *tests *busy *idle *elapsed *util*",
+        "gw? *1 *%",
+        "gw? *1 *%",
+        "makespan * (gw?), average load *, imbalance *x",
+        "* critical worker gw? duration top *",
+        "total *name*",
+        "* test_plugin_xdist_utilization.py::test_function?",
+    ])
+
+
+def test_plugin_xdist_crash(pytester, sample_testfile):
+    """Measurements of a crashed worker are recovered from its spool and reported as partial."""
+    pytester.makepyfile(test_crash="import os\n\ndef test_crash():\n    os._exit(1)\n")
+    result = pytester.runpytest(
+        "test_plugin_xdist_crash.py", "test_crash.py",
+        "--numprocesses", "1",
+        "--max-worker-restart", "0",
+        "--pytest-durations-xdist-flush", "1000",
+        "--pytest-durations-xdist-spool",
+        "--pytest-durations-min", "0",
+    )
+    result.assert_outcomes(passed=2, failed=1)
+    result.stdout.fnmatch_lines([
+        "* test call duration top *",
+        "* test_plugin_xdist_crash.py::test_function? *",
+        "* xdist worker utilization *",
+        "gw0 (crashed) *",
+        "Measurements are partial: recovered from the spool of crashed workers gw0, *",
+    ])
+
+
+def test_plugin_measure_spool(tmp_path):
+    """Every recorded sample is spooled as well."""
+    plugin = PytestDurationPlugin()
+    plugin.spool = MeasurementSpool(str(tmp_path / "gw0.jsonl"))
+    with plugin._measure(Category.TEST_CALL, "test_foo"):
+        pass
+    plugin.spool.flush()
+    assert [key for _, key, _ in load_spool(str(tmp_path / "gw0.jsonl"))] == ["test_foo"]
+    plugin.spool.close()
+
+
+def test_plugin_xdist_streaming(pytester, sample_testfile, expected_output_lines):
+    """Measurements sent after every test are merged on the controller."""
+    result = pytester.runpytest(
+        "--numprocesses", "2",
+        "--pytest-durations-xdist-flush", "0",
+        "--pytest-durations-openmetrics", "durations.prom",
+        "--pytest-durations-openmetrics-buckets", "60",
+    )
+    result.assert_outcomes(passed=2)
+    result.stdout.fnmatch_lines(expected_output_lines)
+    assert 'pytest_durations_seconds_count{category="fixture",group="test_plugin_xdist_streaming.py"} 7' in (
+        (pytester.path / "durations.prom").read_text().splitlines()
+    )
+
+
+# OpenMetrics export tests
+
+SAMPLE_OPENMETRICS_NAME = "durations.prom"
+
+
+@pytest.mark.parametrize("options", [(), ("--numprocesses", "2")])
+def test_plugin_openmetrics_export(pytester, sample_testfile, options):
+    """Histograms recorded on every worker should be merged into a single export."""
+    result = pytester.runpytest(
+        "--pytest-durations", "0",
+        "--pytest-durations-openmetrics", SAMPLE_OPENMETRICS_NAME,
+        "--pytest-durations-openmetrics-buckets", "10,60",
+        *options,
+    )
+    result.assert_outcomes(passed=2)
+    lines = (pytester.path / SAMPLE_OPENMETRICS_NAME).read_text().splitlines()
+    group = "test_plugin_openmetrics_export.py"
+    assert f'pytest_durations_seconds_bucket{{category="fixture",group="{group}",le="10.0"}} 7' in lines
+    assert f'pytest_durations_seconds_count{{category="test call",group="{group}"}} 2' in lines
+    assert lines[-1] == "# EOF"
+
+
+# History database tests
+
+SAMPLE_DB_NAME = "durations.db"
+
+
+def test_plugin_database_export(pytester, sample_testfile):
+    """Every run should be appended to the history database, including xdist ones."""
+    pytester.runpytest("--pytest-durations-db", SAMPLE_DB_NAME).assert_outcomes(passed=2)
+    pytester.runpytest("--pytest-durations-db", SAMPLE_DB_NAME, "--numprocesses", "2").assert_outcomes(passed=2)
+    trends = get_trends(str(pytester.path / SAMPLE_DB_NAME), key="test_plugin_database_export.py::test_function1")
+    assert [row.calls for row in trends] == [1, 1]
+
+
+# Baseline comparison tests
+
+SAMPLE_BASELINE_NAME = "baseline.json"
+
+
+@pytest.fixture
+def sample_baseline(pytester, request):
+    """Baseline export where every test call took a nanosecond."""
+    module = request.node.originalname
+    export_json(
+        measurements={
+            Category.TEST_CALL: {
+                f"{module}.py::test_function1": [1e-9],
+                f"{module}.py::test_function2": [1e-9],
+            },
+        },
+        filename=str(pytester.path / SAMPLE_BASELINE_NAME),
+    )
+
+
+@pytest.mark.parametrize("options", [(), ("--numprocesses", "2")])
+def test_plugin_compare(pytester, sample_testfile, sample_baseline, options):
+    """Slowdowns against the baseline are reported without failing the run."""
+    result = pytester.runpytest(
+        "--pytest-durations-compare", SAMPLE_BASELINE_NAME,
+        "--pytest-durations-min", "0",
+        *options,
+    )
+    result.assert_outcomes(passed=2)
+    assert result.ret == 0
+    result.stdout.fnmatch_lines([
+        "* test call duration top *",
+        "total *name *num *med *max *base *diff *ratio*",
+        "* duration regressions *",
+        "cost *name *base *mean *ratio *pvalue*",
+        "* test_plugin_compare.py::test_function? (test call) *",
+        "* test_plugin_compare.py::test_function? (test call) *",
+        "* grand total *",
+    ])
+
+
+def test_plugin_compare_budget(pytester, sample_testfile, sample_baseline):
+    """Regressions exceeding the budget fail the run."""
+    result = pytester.runpytest(
+        "--pytest-durations-compare", SAMPLE_BASELINE_NAME,
+        "--pytest-durations-compare-budget", "0",
+        "--pytest-durations-min", "0",
+    )
+    result.assert_outcomes(passed=2)
+    assert result.ret == pytest.ExitCode.TESTS_FAILED
+    result.stdout.fnmatch_lines(["Regressions cost * exceeds the budget of *"])
+
+
+def test_plugin_compare_within_budget(pytester, sample_testfile, sample_baseline):
+    """Regressions within the budget pass the run."""
+    result = pytester.runpytest(
+        "--pytest-durations-compare", SAMPLE_BASELINE_NAME,
+        "--pytest-durations-compare-budget", "1000",
+        "--pytest-durations-min", "0",
+    )
+    assert result.ret == 0
+    result.stdout.fnmatch_lines(["* duration regressions *"])
+    result.stdout.no_fnmatch_line("Regressions cost *")
+
+
+def test_plugin_compare_budget_without_report(pytester, sample_testfile, sample_baseline):
+    """The regression gate works and tells why it failed the run with the terminal report disabled as well."""
+    result = pytester.runpytest(
+        "--pytest-durations", "0",
+        "--pytest-durations-compare", SAMPLE_BASELINE_NAME,
+        "--pytest-durations-compare-budget", "0",
+        "--pytest-durations-min", "0",
+    )
+    result.assert_outcomes(passed=2)
+    assert result.ret == pytest.ExitCode.TESTS_FAILED
+    result.stdout.no_fnmatch_line("* duration regressions *")
+    result.stdout.fnmatch_lines(["Regressions cost * exceeds the budget of *"])
+
+
+def test_plugin_compare_corrupt_baseline(pytester, sample_testfile):
+    """A corrupt baseline export is a usage error reported before any test runs."""
+    (pytester.path / SAMPLE_BASELINE_NAME).write_bytes(b"PTDURBIN")
+    result = pytester.runpytest("--pytest-durations-compare", SAMPLE_BASELINE_NAME)
+    assert result.ret == pytest.ExitCode.USAGE_ERROR
+    result.stderr.fnmatch_lines(["ERROR: --pytest-durations-compare: * is not a pytest-durations binary export *"])
+    result.stdout.no_fnmatch_line("*passed*")
+
+
+def test_plugin_compare_columns(pytester, sample_testfile, sample_baseline):
+    """Explicitly selected columns are kept as is."""
+    result = pytester.runpytest(
+        "--pytest-durations-compare", SAMPLE_BASELINE_NAME,
+        "--pytest-durations-columns", "total,ratio",
+        "--pytest-durations-compare-ratio", "1e12",
+    )
+    assert result.ret == 0
+    result.stdout.fnmatch_lines(["total *name *ratio*", "* duration regressions *", "* grand total *"])
+    result.stdout.no_fnmatch_line("* (test call) *")
+
+
+def test_plugin_compare_primary_categories(pytester):
+    """A regression is counted once, not again in the derived categories which include the same time."""
+    test_key = "test_foo.py::test_foo"
+    baseline = {
+        Category.TEST_CALL: {test_key: [0.1]},
+        Category.PARAM: {"test_foo.py::test_foo[x=1]": [0.1]},
+        Category.OUTCOME: {"passed": [0.1]},
+        Category.SESSION: {"session": [0.1]},
+    }
+    export_json(measurements=baseline, filename=str(pytester.path / SAMPLE_BASELINE_NAME))
+    plugin = PytestDurationPlugin()
+    plugin.measurements = {category: {key: [0.22] for key in series} for category, series in baseline.items()}
+    plugin._compare(pytester.parseconfigure("--pytest-durations-min", "0"), load_baseline(SAMPLE_BASELINE_NAME))
+    assert [(regression.category, regression.name) for regression in plugin.regressions] == [
+        (Category.TEST_CALL, test_key),
+    ]
+    assert plugin.regressions[0].cost == pytest.approx(0.12)
+    assert plugin.baseline[Category.OUTCOME] == {"passed": 0.1}
+
+
+# Shard splitting tests
+
+SAMPLE_SHARD_HISTORY_NAME = "history.json"
+
+
+@pytest.fixture
+def sample_shard_history(pytester, request):
+    """Export where the second test took twice as long as the first one."""
+    module = request.node.originalname
+    export_json(
+        measurements={
+            Category.TEST_CALL: {
+                f"{module}.py::test_function1": [1.0],
+                f"{module}.py::test_function2": [2.0],
+            },
+        },
+        filename=str(pytester.path / SAMPLE_SHARD_HISTORY_NAME),
+    )
+
+
+@pytest.mark.parametrize(
+    ("options", "expected"),
+    [
+        (("--pytest-durations-shard", "1/2"), {"passed": 1, "deselected": 1}),
+        (("--pytest-durations-shard", "2/2", "--numprocesses", "2"), {"passed": 1}),
+        (("--pytest-durations-shard", "1/2", "--pytest-durations-shard-group-by", "module"), {"passed": 2}),
+        (("--pytest-durations-shard", "2/2", "--pytest-durations-shard-group-by", "module"), {"deselected": 2}),
+    ],
+)
+def test_plugin_shard(pytester, sample_testfile, sample_shard_history, options, expected):
+    """Every shard runs its part of the tests only and leaves the durations in the cache alone."""
+    result = pytester.runpytest("--pytest-durations-shard-history", SAMPLE_SHARD_HISTORY_NAME, *options)
+    result.assert_outcomes(**expected)
+    assert load_history(pytester.parseconfigure(), "cache") == {}
+
+
+def test_plugin_shard_by_cache(pytester, sample_testfile):
+    """Shards are split by the durations recorded in the cache by unsharded runs."""
+    pytester.runpytest().assert_outcomes(passed=2)
+    pytester.runpytest("--pytest-durations-shard", "2/2").assert_outcomes(passed=1, deselected=1)
+
+
+def test_plugin_shards_in_sequence(pytester):
+    """Shards run one after another split the tests alike, so every test runs exactly once."""
+    pytester.makepyfile(
+        """
+        import pathlib
+        import time
+
+        import pytest
+
+        @pytest.mark.parametrize("index", range(8))
+        def test_function(index):
+            time.sleep(0.01 * (index % 3))
+            with pathlib.Path("runs.txt").open("a") as runs:
+                runs.write(f"{index}\\n")
+        """,
+    )
+    pytester.runpytest().assert_outcomes(passed=8)
+    pytester.path.joinpath("runs.txt").unlink()
+    for shard in range(1, 4):
+        pytester.runpytest("--pytest-durations-shard", f"{shard}/3", "--pytest-durations", "0")
+    runs = pytester.path.joinpath("runs.txt").read_text().split()
+    assert sorted(map(int, runs)) == list(range(8))
+
+
+# Trend columns tests
+
+
+def test_plugin_trends(pytester, sample_testfile):
+    """Timing data of the previous run fills the trend columns."""
+    options = ("--pytest-durations-columns", "total,prev,delta,trend", "--pytest-durations-min", "0")
+    result = pytester.runpytest(*options)
+    result.stdout.fnmatch_lines(["total *name *prev *delta *trend*"])
+    result.stdout.no_fnmatch_line("* test_plugin_trends.py::test_function1 *%")
+    result = pytester.runpytest(*options)
+    result.stdout.fnmatch_lines(["* test_plugin_trends.py::test_function1 * [+-]0:00:00.* *%"])
+
+
+def test_plugin_trends_primary_categories(pytester, sample_testfile):
+    """Only fixture and test categories are stored, also with derived sections shown."""
+    pytester.runpytest("--pytest-durations-show", "").assert_outcomes(passed=2)
+    trends = load_trends(pytester.path / ".pytest_cache" / "d" / TRENDS_CACHE_DIR / TRENDS_FILENAME)
+    assert sorted(trends) == sorted(PRIMARY_CATEGORIES)
+
+
+@pytest.mark.parametrize("options", [("--pytest-durations-trend-alpha", "0"), ("-p", "no:cacheprovider")])
+def test_plugin_trends_disabled(pytester, sample_testfile, options):
+    """Nothing is stored without the cache or with a zero moving average weight."""
+    pytester.runpytest(*options).assert_outcomes(passed=2)
+    assert not (pytester.path / ".pytest_cache" / "d" / "pytest_durations").exists()
+
+
+# Test ordering tests
+
+
+@pytest.fixture
+def sample_order_testfile(pytester):
+    code = """
+        import pytest
+
+        @pytest.fixture(scope="module", params=[1, 2])
+        def fixture_param(request):
+            return request.param
+
+        def test_fast(fixture_param):
+            pass
+
+        def test_slow(fixture_param):
+            pass
+    """
+    pytester.makepyfile(test_plugin_order=code)
+
+
+@pytest.fixture
+def sample_order_trends(pytester):
+    """Stored timing data where the second parameter of the shared fixture makes tests slow."""
+    trends = KeyTrends(
+        keys=[f"test_plugin_order.py::{name}" for name in ("test_fast[1]", "test_fast[2]", "test_slow[2]")],
+        calls=[1, 1, 1],
+        totals=[0.5, 2.0, 3.0],
+        ewmas=[0.5, 2.0, 3.0],
+    )
+    path = pytester.path / ".pytest_cache" / "d" / TRENDS_CACHE_DIR
+    path.mkdir(parents=True)
+    save_trends(path / TRENDS_FILENAME, {Category.TEST_CALL: trends})
+
+
+@pytest.mark.parametrize(
+    ("order", "expected"),
+    [
+        ("slowest-first", ["test_slow[2]", "test_fast[2]", "test_slow[1]", "test_fast[1]"]),
+        ("fastest-first", ["test_fast[1]", "test_slow[1]", "test_fast[2]", "test_slow[2]"]),
+    ],
+)
+def test_plugin_order(pytester, sample_order_testfile, sample_order_trends, order, expected):
+    """Tests are ordered by stored durations, the shared fixture parameters stay grouped."""
+    result = pytester.runpytest("--collect-only", "-q", "--pytest-durations-order", order, "test_plugin_order.py")
+    result.stdout.fnmatch_lines([f"test_plugin_order.py::{name}" for name in expected], consecutive=True)
+
+
+def test_plugin_order_without_report(pytester, sample_order_testfile, sample_order_trends):
+    """Tests are ordered with the terminal report disabled as well."""
+    options = ("--collect-only", "-q", "--pytest-durations", "0", "--pytest-durations-order", "slowest-first")
+    result = pytester.runpytest(*options, "test_plugin_order.py")
+    result.stdout.fnmatch_lines(["test_plugin_order.py::test_slow[2]", "test_plugin_order.py::test_fast[2]"])
+
+
+def test_plugin_order_no_cache(pytester, sample_order_testfile):
+    """Without the cache tests keep the collection order."""
+    options = ("-p", "no:cacheprovider", "--collect-only", "-q", "--pytest-durations-order", "slowest-first")
+    result = pytester.runpytest(*options, "test_plugin_order.py")
+    result.stdout.fnmatch_lines(["test_plugin_order.py::test_fast[1]", "test_plugin_order.py::test_slow[1]"])
+
+
+# Remaining time prediction tests
+
+
+@pytest.mark.parametrize("options", [(), ("--numprocesses", "2")])
+def test_plugin_eta(pytester, sample_testfile, options):
+    """The progress line shows the predicted remaining time."""
+    result = pytester.runpytest("--pytest-durations-eta", *options)
+    result.assert_outcomes(passed=2)
+    result.stdout.re_match_lines([r".* \[100%\] ETA 0:00:00$"])
+
+
+@pytest.mark.parametrize("options", [(), ("--numprocesses", "2"), ("-p", "no:terminal", "--pytest-durations-eta")])
+def test_plugin_eta_file(pytester, sample_testfile, options):
+    """The status file has the progress of the finished session."""
+    pytester.runpytest("--pytest-durations-eta-file", SAMPLE_ETA_FILE_NAME, *options)
+    status = json.loads((pytester.path / SAMPLE_ETA_FILE_NAME).read_text())
+    assert status["finished"] == status["total"] == 2
+    assert status["remaining"] == 0.0
+
+
+def test_plugin_eta_xdist_worker():
+    """Workers leave the prediction to the controller."""
+    session = create_autospec(pytest.Session, instance=True)
+    session.config = create_autospec(pytest.Config, instance=True, workerinput={"workerid": "gw0"})
+    session.config.getini.return_value = []
+    session.items = []
+    plugin = PytestDurationPlugin()
+    plugin.pytest_collection_finish(session)
+    assert plugin.eta is None
+
+
+# Duration budget tests
+
+
+@pytest.fixture
+def sample_budget_testfile(pytester):
+    code = """
+        import pytest
+
+        @pytest.fixture
+        def fixture_teardown():
+            yield
+
+        @pytest.mark.duration_budget(call=0)
+        def test_over_budget():
+            pass
+
+        @pytest.mark.duration_budget(call=10)
+        def test_within_budget():
+            pass
+
+        @pytest.mark.duration_budget(call=0)
+        def test_failing():
+            assert False
+
+        @pytest.mark.duration_budget(teardown=0)
+        def test_over_teardown_budget(fixture_teardown):
+            pass
+    """
+    pytester.makepyfile(test_plugin_budget=code)
+
+
+@pytest.mark.parametrize(
+    ("options", "expected"),
+    [
+        ((), {"passed": 3, "failed": 1, "warnings": 3}),
+        (("--pytest-durations-budget-action", "xfail"), {"passed": 2, "failed": 1, "xfailed": 1, "warnings": 1}),
+        (("--pytest-durations-budget-action", "fail"), {"passed": 2, "failed": 2, "errors": 1}),
+        (("--pytest-durations-budget-action", "fail", "--numprocesses", "2"), {"passed": 2, "failed": 2, "errors": 1}),
+    ],
+)
+def test_plugin_budget(pytester, sample_budget_testfile, options, expected):
+    """Phases over their budgets are reported by the configured action and listed by overrun."""
+    warnings = ("-W", "default::pytest_durations.budgets.DurationBudgetWarning")
+    result = pytester.runpytest("--pytest-durations-min", "0", *warnings, *options, "test_plugin_budget.py")
+    result.assert_outcomes(**expected)
+    result.stdout.fnmatch_lines([
+        "*= duration budget violations =*",
+        "overrun *name *duration *budget*",
+    ])
+    result.stdout.fnmatch_lines(["* test_plugin_budget.py::test_over_budget (test call) *"])
+    result.stdout.fnmatch_lines(["* test_plugin_budget.py::test_over_teardown_budget (test teardown) *"])
+    result.stdout.no_fnmatch_line("* test_plugin_budget.py::test_within_budget (test call) *")
+
+
+@pytest.mark.parametrize(
+    ("options", "expected"),
+    [
+        ((), {"passed": 3, "failed": 1, "warnings": 3}),
+        (("--pytest-durations-budget-action", "fail"), {"passed": 2, "failed": 2, "errors": 1}),
+        (("--pytest-durations-budget-action", "fail", "--numprocesses", "2"), {"passed": 2, "failed": 2, "errors": 1}),
+    ],
+)
+def test_plugin_budget_without_report(pytester, sample_budget_testfile, options, expected):
+    """Duration budgets are enforced with the terminal report disabled as well."""
+    warnings = ("-W", "default::pytest_durations.budgets.DurationBudgetWarning")
+    result = pytester.runpytest("--pytest-durations", "0", *warnings, *options, "test_plugin_budget.py")
+    result.assert_outcomes(**expected)
+    result.stdout.no_fnmatch_line("*= duration budget violations =*")
+
+
+def test_plugin_budget_ini(pytester, sample_testfile):
+    """Directory budgets of the ini file apply to tests without a marker."""
+    pytester.makeini("[pytest]\npytest_durations_budgets =\n    . call=0\n")
+    result = pytester.runpytest("--pytest-durations-budget-action", "fail")
+    result.assert_outcomes(failed=2)
+    result.stdout.fnmatch_lines(["*call took *s, exceeding its duration budget of 0.000s*"])
+    warnings = ("-W", "default::pytest_durations.budgets.DurationBudgetWarning")
+    result = pytester.runpytest("--pytest-durations", "0", *warnings)
+    result.assert_outcomes(passed=2, warnings=2)
+
+
+# Collection timing tests
+
+
+@pytest.mark.parametrize(("options", "calls"), [((), 1), (("--numprocesses", "2"), 2)])
+def test_plugin_collect(pytester, sample_testfile, options, calls):
+    """Collection of every file is measured, on every pytest-xdist worker."""
+    result = pytester.runpytest("--pytest-durations-min", "0", "--pytest-durations-show", "collect", *options)
+    result.stdout.fnmatch_lines([
+        "*= collect duration top =*",
+        f"* test_plugin_collect.py *{calls} *",
+    ])
+
+
+@pytest.mark.parametrize("options", [(), ("--numprocesses", "2")])
+def test_plugin_session(pytester, sample_testfile, options):
+    """Session phases are recorded once by the reporting process and add up to the session time."""
+    json_file = pytester.path / "durations.json"
+    result = pytester.runpytest(
+        "--pytest-durations-min",
+        "0",
+        "--pytest-durations-show",
+        "session",
+        "--pytest-durations-json",
+        str(json_file),
+        "--pytest-durations-json-samples",
+        *options,
+    )
+    result.stdout.fnmatch_lines(["*= session duration top =*"])
+    result.stdout.no_fnmatch_line("*= test call duration top =*")
+    session = load_json_measurements(str(json_file))[Category.SESSION]
+    assert sorted(session) == ["collection", "finish", "gaps", "startup", "tests"]
+    assert all(len(samples) == 1 for samples in session.values())
+
+
+@pytest.mark.parametrize("options", [(), ("--numprocesses", "2")])
+def test_plugin_hooks(pytester, sample_testfile, options):
+    """Hook implementations of every plugin are timed, on every pytest-xdist worker."""
+    result = pytester.runpytest("--pytest-durations", "1000", "--pytest-durations-hooks", *options)
+    result.stdout.fnmatch_lines([
+        "*= hook duration top =*",
+        "total * num name*",
+        "* 2 _pytest.python pytest_pyfunc_call *",
+    ], consecutive=False)
+
+
+@pytest.mark.parametrize(
+    "options",
+    [(), ("--numprocesses", "1"), ("--numprocesses", "1", "--pytest-durations-xdist-flush", "0")],
+)
+def test_plugin_rebuilds(pytester, options):
+    """Shared fixtures set up more than once are listed with the tests which rebuilt them."""
+    pytester.makepyfile(test_plugin_rebuilds="""
+        import pytest
+
+        @pytest.fixture(scope="module", params=[1, 2])
+        def shared(request):
+            return request.param
+
+        @pytest.fixture(scope="module")
+        def once():
+            pass
+
+        def test_one(shared, once):
+            pass
+
+        def test_two(shared):
+            pass
+    """)
+    result = pytester.runpytest("--pytest-durations-min", "0", *options)
+    result.assert_outcomes(passed=4)
+    result.stdout.fnmatch_lines([
+        "*= shared fixture instantiations =*",
+        "total * num widened grouped name*",
+        "* 2 * test_plugin_rebuilds.py::shared *",
+        "* rebuilt by test_plugin_rebuilds.py::test_one[[]2]*",
+    ])
+    result.stdout.no_fnmatch_line("* 1 * test_plugin_rebuilds.py::once *")
+
+
+@pytest.mark.parametrize("options", [(), ("--numprocesses", "2")])
+def test_plugin_params(pytester, options):
+    """Durations of parametrized tests are added up by every parameter value."""
+    pytester.makepyfile(test_plugin_params="""
+        import pytest
+
+        @pytest.fixture(scope="module", params=["sqlite", "postgres"])
+        def backend(request):
+            return request.param
+
+        @pytest.mark.parametrize("size", [1, 2])
+        def test_query(backend, size):
+            pass
+    """)
+    result = pytester.runpytest("--pytest-durations-min", "0", "--pytest-durations-show", "param", *options)
+    result.assert_outcomes(passed=4)
+    result.stdout.fnmatch_lines_random([
+        "* backend=sqlite * 2 *",
+        "* backend=postgres * 2 *",
+        "* size=1 * 2 *",
+        "* size=2 * 2 *",
+    ])
+
+
+def test_plugin_params_ids(pytester):
+    """Non-scalar parameter values are shown by their parametrize IDs, as in the node IDs."""
+    pytester.makepyfile(test_plugin_params_ids="""
+        import pytest
+
+        @pytest.mark.parametrize("data", [{}, [1]])
+        @pytest.mark.parametrize("rows", [[1], [1, 2]], ids=["one-row", "two-rows"])
+        def test_query(rows, data):
+            pass
+    """)
+    result = pytester.runpytest("--pytest-durations-min", "0", "--pytest-durations-show", "param", "--verbose")
+    result.assert_outcomes(passed=4)
+    result.stdout.fnmatch_lines_random([
+        "*::test_query[[]one-row-data0] PASSED*",
+        "* rows=one-row * 2 *",
+        "* rows=two-rows * 2 *",
+        "* data=data0 * 2 *",
+        "* data=data1 * 2 *",
+    ])
+
+
+def test_plugin_params_shared_fixtures(pytester):
+    """Shared fixture setups are not accounted to the parameter value of the test which triggered them."""
+    pytester.makepyfile(test_plugin_params_shared_fixtures="""
+        import time
+
+        import pytest
+
+        @pytest.fixture(scope="module")
+        def database():
+            time.sleep(0.2)
+
+        @pytest.mark.parametrize("size", [1, 2])
+        def test_query(database, size):
+            pass
+    """)
+    result = pytester.runpytest("--pytest-durations-min", "0", "--pytest-durations-show", "param,fixture")
+    result.assert_outcomes(passed=2)
+    result.stdout.fnmatch_lines(["0:00:00.[2-9]* test_plugin_params_shared_fixtures.py::database *"])
+    result.stdout.fnmatch_lines_random(["0:00:00.0* size=1 *", "0:00:00.0* size=2 *"])
+
+
+def test_plugin_collect_imports(pytester, sample_testfile):
+    """Packages imported during collection for the first time get their own collection rows."""
+    pytester.makepyfile(sample_collect_package="VALUE = 1", sample_modifyitems_package="VALUE = 2")
+    pytester.makepyfile(test_plugin_collect_imports_package="""
+        import sample_collect_package
+
+        def test_value():
+            pass
+    """)
+    pytester.makeconftest("""
+        def pytest_collection_modifyitems(items):
+            import sample_modifyitems_package
+    """)
+    result = pytester.runpytest(
+        "--pytest-durations-min",
+        "0",
+        "--pytest-durations-show",
+        "collect",
+        "--pytest-durations-collect-imports",
+    )
+    result.assert_outcomes(passed=3)
+    result.stdout.fnmatch_lines(["* import sample_collect_package *1 *"], consecutive=False)
+    result.stdout.fnmatch_lines(["* import sample_modifyitems_package *1 *"])
+    assert not isinstance(builtins.__import__, ImportTimer)
+
+
+@pytest.mark.parametrize("options", [(), ("--numprocesses", "2")])
+def test_plugin_group_by_markers(pytester, options):
+    """Tests are grouped by the listed markers they have, tests with several markers by their combination."""
+    pytester.makeini("""
+        [pytest]
+        markers =
+            unit: unit tests
+            slow: slow tests
+    """)
+    pytester.makepyfile(test_plugin_group_by_markers="""
+        import pytest
+
+        @pytest.mark.unit
+        def test_unit_1():
+            pass
+
+        @pytest.mark.unit
+        def test_unit_2():
+            pass
+
+        @pytest.mark.slow
+        @pytest.mark.unit
+        def test_unit_slow():
+            pass
+
+        def test_plain():
+            pass
+    """)
+    result = pytester.runpytest(
+        "--pytest-durations-min",
+        "0",
+        "--pytest-durations-show",
+        "call",
+        "--pytest-durations-group-by",
+        "marker:unit,slow",
+        *options,
+    )
+    result.assert_outcomes(passed=4)
+    result.stdout.fnmatch_lines_random([
+        "* unit * 2 *",
+        "* unit+slow * 1 *",
+        "* (no marker) * 1 *",
+    ])
+
+
+@pytest.mark.parametrize("options", [(), ("--numprocesses", "2")])
+def test_plugin_group_by_path(pytester, options):
+    """Tests and fixtures are added up by their leading directories."""
+    pytester.makepyfile(**{
+        "api/test_users": "def test_get():\n    pass\n\ndef test_put():\n    pass\n",
+        "api/test_groups": "def test_get():\n    pass\n",
+        "storage/test_files": "def test_read():\n    pass\n",
+    })
+    result = pytester.runpytest(
+        "--pytest-durations-min",
+        "0",
+        "--pytest-durations-show",
+        "call",
+        "--pytest-durations-group-by",
+        "path:1",
+        *options,
+        "api",
+        "storage",
+    )
+    result.assert_outcomes(passed=4)
+    result.stdout.fnmatch_lines_random([
+        "* api * 3 *",
+        "* storage * 1 *",
+    ])
+
+
+@pytest.fixture
+def sample_rerun_conftest(pytester):
+    pytester.makeconftest("""
+        import pytest
+        from _pytest.runner import runtestprotocol
+
+        @pytest.hookimpl(tryfirst=True)
+        def pytest_runtest_protocol(item, nextitem):
+            # rerun failed tests twice, like pytest-rerunfailures
+            item.ihook.pytest_runtest_logstart(nodeid=item.nodeid, location=item.location)
+            for attempt in range(3):
+                for report in runtestprotocol(item, nextitem=nextitem, log=False):
+                    if report.failed and attempt < 2:
+                        report.outcome = "rerun"
+                    item.ihook.pytest_runtest_logreport(report=report)
+                    if report.outcome == "rerun":
+                        break
+                else:
+                    break
+            item.ihook.pytest_runtest_logfinish(nodeid=item.nodeid, location=item.location)
+            return True
+
+        def pytest_report_teststatus(report):
+            if report.outcome == "rerun":
+                return "rerun", "R", "RERUN"
+    """)
+
+
+@pytest.mark.parametrize("options", [(), ("--numprocesses", "2")])
+def test_plugin_retries(pytester, sample_rerun_conftest, options):
+    """Samples of retried attempts are moved from the clean measurements into the retry cost of their tests."""
+    pytester.makepyfile(test_plugin_retries="""
+        attempts = []
+
+        def test_flaky():
+            attempts.append(1)
+            assert len(attempts) > 1
+
+        def test_broken():
+            assert False
+    """)
+    result = pytester.runpytest(
+        "--pytest-durations-min",
+        "0",
+        "--pytest-durations-show",
+        "call",
+        "--pytest-durations-group-by",
+        "none",
+        "--pytest-durations-openmetrics",
+        "durations.prom",
+        "--pytest-durations-openmetrics-group-by",
+        "function",
+        *options,
+    )
+    result.assert_outcomes(passed=1, failed=1)
+    result.stdout.fnmatch_lines_random([
+        "* test_plugin_retries.py::test_flaky * 1 *",
+        "* test_plugin_retries.py::test_broken * 1 *",
+        "* retry cost *",
+        "* 1 passed test_plugin_retries.py::test_flaky*",
+        "* 2 failed test_plugin_retries.py::test_broken*",
+        "* 3 * grand total*",
+    ])
+    lines = (pytester.path / "durations.prom").read_text().splitlines()
+    # retried attempts are discarded from the histograms, only the final one is counted
+    for name in ("test_flaky", "test_broken"):
+        group = f"test_plugin_retries.py::{name}"
+        assert f'pytest_durations_seconds_count{{category="test call",group="{group}"}} 1' in lines
+
+
+def test_plugin_retries_rebuilds(pytester, sample_rerun_conftest):
+    """Shared fixture instantiations of retried attempts are discarded, the final attempt rebuilds it once."""
+    pytester.makepyfile(test_plugin_retries_rebuilds="""
+        import pytest
+
+        @pytest.fixture(scope="module")
+        def shared():
+            pass
+
+        def test_first(shared):
+            pass
+
+        def test_broken(shared):
+            assert False
+    """)
+    result = pytester.runpytest("--pytest-durations-min", "0", "test_plugin_retries_rebuilds.py")
+    result.assert_outcomes(passed=1, failed=1)
+    result.stdout.fnmatch_lines([
+        "*= shared fixture instantiations =*",
+        "total *num *widened *grouped *name*",
+        "* 2 * test_plugin_retries_rebuilds.py::shared *",
+        "* rebuilt by test_plugin_retries_rebuilds.py::test_broken*",
+        "*= retry cost =*",
+    ])
+
+
+def test_plugin_retries_duplicates(pytester, sample_rerun_conftest):
+    """Duplicates of a failed test kept by --keep-duplicates are not retries of each other."""
+    pytester.makepyfile(test_plugin_retries_duplicates="""
+        def test_passed():
+            pass
+    """)
+    result = pytester.runpytest(
+        "--pytest-durations-min", "0",
+        "--pytest-durations-show", "call",
+        "--keep-duplicates",
+        "test_plugin_retries_duplicates.py",
+        "test_plugin_retries_duplicates.py",
+    )
+    result.assert_outcomes(passed=2)
+    result.stdout.fnmatch_lines(["* test_plugin_retries_duplicates.py::test_passed * 2 *"])
+    result.stdout.no_fnmatch_line("*= retry cost =*")
+
+
+def test_plugin_retries_flushed():
+    """Only the latest samples are discarded, samples already sent by a pytest-xdist worker flush are kept."""
+    plugin = PytestDurationPlugin()
+    plugin.measurements[Category.TEST_SETUP]["test_foo"] = [0.25, 0.5]
+    plugin.attempt_samples = [(Category.TEST_SETUP, "test_foo", 0.5), (Category.TEST_CALL, "test_foo", 1.0)]
+    plugin.test_duration = 1.5
+    plugin._discard_attempt("test_foo")
+    assert plugin.measurements[Category.TEST_SETUP] == {"test_foo": [0.25]}
+    assert plugin.retries.tests["test_foo"].durations == [1.5]
+
+
+def test_plugin_retries_discarded_everywhere(tmp_path):
+    """Cold samples, spooled samples and budget violations of a retried attempt are discarded too."""
+    plugin = PytestDurationPlugin()
+    plugin.cold = ColdSamples(limit=1)
+    plugin.spool = MeasurementSpool(str(tmp_path / "gw0.jsonl"))
+    plugin.budgets[Category.TEST_CALL]["test_foo.py::test_foo"] = 0.5
+    plugin.test_duration = 1.0
+    for sent in (False, True):
+        plugin.attempt_samples = []
+        plugin._record(Category.TEST_CALL, "test_foo.py::test_foo", 1.0)
+        plugin.cold.add_test("test_foo.py::test_foo", 1.0)
+        if sent:
+            plugin.budget_violations = []
+        plugin._discard_attempt("test_foo.py::test_foo")
+    assert plugin.measurements[Category.TEST_CALL] == {}
+    assert plugin.cold.samples == {Category.TEST_CALL: {}}
+    assert plugin.cold.modules["test_foo.py"] == ([], [])
+    assert plugin.budget_violations == []
+    plugin.spool.flush()
+    assert list(load_spool(str(plugin.spool.path))) == []
+    plugin.spool.close()
+
+
+@pytest.mark.parametrize("options", [(), ("--numprocesses", "2")])
+def test_plugin_outcomes(pytester, options):
+    """Test durations are added up by final outcome, test phases are reported for the selected outcomes only."""
+    pytester.makepyfile(test_plugin_outcomes="""
+        import pytest
+
+        @pytest.fixture
+        def skipping():
+            pytest.skip("in setup")
+
+        @pytest.fixture
+        def breaking():
+            yield
+            raise RuntimeError
+
+        def test_passed():
+            pass
+
+        def test_failed():
+            assert False
+
+        def test_skipped(skipping):
+            pass
+
+        def test_error(breaking):
+            pass
+
+        @pytest.mark.xfail
+        def test_xfailed():
+            assert False
+
+        @pytest.mark.xfail
+        def test_xpassed():
+            pass
+    """)
+    result = pytester.runpytest(
+        "--pytest-durations-min",
+        "0",
+        "--pytest-durations-show",
+        "call,outcome",
+        "--pytest-durations-group-by",
+        "none",
+        "--pytest-durations-outcomes",
+        "passed,skipped,xfailed,xpassed,error",
+        *options,
+    )
+    result.assert_outcomes(passed=2, failed=1, skipped=1, errors=1, xfailed=1, xpassed=1)
+    result.stdout.fnmatch_lines_random([
+        "* outcome duration top *",
+        "* passed * 1 *",
+        "* skipped * 1 *",
+        "* xfailed * 1 *",
+        "* xpassed * 1 *",
+        "* error * 1 *",
+        "* test_plugin_outcomes.py::test_passed * 1 *",
+    ])
+    call_section, _, outcome_section = result.stdout.str().partition("outcome duration top")
+    assert "test_failed" not in call_section.partition("test call duration top")[2]
+    assert " failed " not in outcome_section.partition("grand total")[0]
+
+
+def test_plugin_outcomes_default_sections(pytester, sample_testfile):
+    """Selecting outcomes works without the outcome section shown."""
+    result = pytester.runpytest("--pytest-durations-min", "0", "--pytest-durations-outcomes", "passed")
+    result.assert_outcomes(passed=2)
+    assert result.ret == 0
+    result.stdout.fnmatch_lines(["* test call duration top *", "* grand total *"])
+    result.stdout.no_fnmatch_line("* outcome duration top *")
+
+
+@pytest.mark.parametrize("options", [(), ("--numprocesses", "2")])
+def test_plugin_cold(pytester, options):
+    """The first test of a module paying for a lazy import is kept apart as cold and shows up as a cold start."""
+    pytester.makepyfile(test_plugin_cold="""
+        import time
+
+        import pytest
+
+        cache = []
+
+        @pytest.mark.parametrize("index", range(4))
+        def test_lazy(index):
+            if not cache:
+                time.sleep(0.2)
+                cache.append(index)
+    """)
+    result = pytester.runpytest(
+        "test_plugin_cold.py",
+        "--pytest-durations-min",
+        "0",
+        "--pytest-durations-show",
+        "call",
+        "--pytest-durations-group-by",
+        "function",
+        "--pytest-durations-cold",
+        "1",
+        *options,
+    )
+    result.assert_outcomes(passed=4)
+    result.stdout.fnmatch_lines([
+        "* test call duration top *",
+        "total * name * num * cold * warm*",
+        "* test_plugin_cold.py::test_lazy * 4 * 0:00:00.[2-4]* 0:00:00.0*",
+        "* cold start by module *",
+        "penalty * cold * warm * name*",
+        "0:00:00.* test_plugin_cold.py*",
+    ])
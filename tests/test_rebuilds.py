@@ -0,0 +1,92 @@
+import pytest
+
+from pytest_durations.rebuilds import FixtureRebuilds, FixtureStats, get_rebuild_rows
+
+
+@pytest.fixture
+def rebuilds():
+    """Module fixture with two parameters, interleaved in one module and set up once in another one."""
+    rebuilds = FixtureRebuilds()
+    for scope_id, param_index, test_id in [
+        ("test_a.py", 0, "test_a.py::test_one[0]"),
+        ("test_a.py", 1, "test_a.py::test_one[1]"),
+        ("test_a.py", 0, "test_a.py::test_two[0]"),
+        ("test_b.py", 0, "test_b.py::test_one[0]"),
+    ]:
+        rebuilds.add_setup("db", scope_id=scope_id, param_index=param_index, test_id=test_id, duration=1.0)
+    rebuilds.add_setup("cache", scope_id="", param_index=0, test_id=None, duration=1.0)
+    rebuilds.add_teardown("db", 1.0)
+    rebuilds.add_teardown("unknown", 1.0)
+    return rebuilds
+
+
+def test_fixture_stats(rebuilds):
+    """Setting up a fixture again for a scope node is a rebuild, widening and grouping save setups."""
+    stats = rebuilds.fixtures["db"]
+    assert (stats.setups, stats.cost) == (4, 5.0)
+    assert stats.triggers == ["test_a.py::test_one[1]", "test_a.py::test_two[0]"]
+    assert stats.saved_by_widening == 2.5
+    assert stats.saved_by_grouping == 1.25
+
+
+def test_fixture_stats_empty():
+    assert FixtureStats().mean == 0.0
+
+
+def test_dump_load(rebuilds):
+    """Instantiations of workers are added up, scope nodes and parameters are merged per worker."""
+    merged = FixtureRebuilds()
+    merged.load(rebuilds.dump(), worker_id="gw0")
+    merged.load(rebuilds.dump(), worker_id="gw0")
+    stats = merged.fixtures["db"]
+    assert (stats.setups, stats.cost, len(stats.triggers)) == (8, 10.0, 4)
+    assert stats.instances == {("gw0", "test_a.py", 0), ("gw0", "test_a.py", 1), ("gw0", "test_b.py", 0)}
+    assert stats.scopes == {"test_a.py", "test_b.py"}
+    rebuilds.clear()
+    assert rebuilds.dump() == {}
+
+
+def test_discard_attempt(rebuilds):
+    """Instantiations of a retried attempt are undone, those of earlier attempts are kept."""
+    rebuilds.start_attempt()
+    rebuilds.add_setup("db", scope_id="test_c.py", param_index=0, test_id="test_c.py::test_one[0]", duration=1.0)
+    rebuilds.add_setup("db", scope_id="test_a.py", param_index=2, test_id="test_c.py::test_one[0]", duration=1.0)
+    rebuilds.discard_attempt()
+    stats = rebuilds.fixtures["db"]
+    assert (stats.setups, stats.cost) == (4, 5.0)
+    assert stats.triggers == ["test_a.py::test_one[1]", "test_a.py::test_two[0]"]
+    assert stats.instances == {("", "test_a.py", 0), ("", "test_a.py", 1), ("", "test_b.py", 0)}
+    assert stats.scopes == {"test_a.py", "test_b.py"}
+    rebuilds.discard_attempt()
+    assert stats.setups == 4
+
+
+def test_clear(rebuilds):
+    """Scope nodes set up before a dump are kept, so later rebuilds and teardowns are still accounted."""
+    rebuilds.clear()
+    rebuilds.add_teardown("db", 1.0)
+    rebuilds.add_setup("db", scope_id="test_a.py", param_index=1, test_id="test_a.py::test_two[1]", duration=1.0)
+    assert rebuilds.dump() == {"db": (1, 2.0, [("test_a.py", 1)], ["test_a.py::test_two[1]"])}
+
+
+def test_fixture_stats_workers(rebuilds):
+    """Every worker sets up its own instances, which no test order or scope can save."""
+    merged = FixtureRebuilds()
+    merged.load(rebuilds.dump(), worker_id="gw0")
+    merged.load(rebuilds.dump(), worker_id="gw1")
+    stats = merged.fixtures["db"]
+    assert stats.setups == 8
+    assert stats.saved_by_widening == 4 * stats.mean
+    assert stats.saved_by_grouping == 2 * stats.mean
+
+
+@pytest.mark.parametrize(("max_rows", "expected"), [(0, 4), (1, 3)])
+def test_get_rebuild_rows(rebuilds, max_rows, expected):
+    """Fixtures set up once are skipped, rebuild triggers follow their fixture."""
+    rows = get_rebuild_rows(rebuilds, max_rows=max_rows, format_seconds=str)
+    assert rows[:3] == [
+        ("total", "num", "widened", "grouped", "name"),
+        ("5.0", "4", "2.5", "1.25", "db"),
+        ("", "", "", "", "  rebuilt by test_a.py::test_one[1]"),
+    ]
+    assert len(rows) == expected
@@ -11,6 +11,7 @@ from pytest_durations.reporting import (
     report_column_fields,
     resolve_time_format,
 )
+from pytest_durations.trends import TrendT
 
 
 @pytest.fixture
@@ -24,7 +25,10 @@ def sample_measurements() -> dict[str, list[float]]:
 @pytest.fixture
 def expected_report_rows() -> list[ReportRowT]:
     return [
-        ReportRowT("total", "name", "num", "min", "med", "p90", "p95", "p99", "max"),
+        ReportRowT(
+            "total", "name", "num", "min", "med", "p90", "p95", "p99", "max",
+            "base", "diff", "ratio", "prev", "delta", "trend", "cold", "warm",
+        ),
         ReportRowT(
             "0:00:03.700000", "fixture2", "3",
             "0:00:01.100000", "0:00:01.200000",
@@ -56,8 +60,14 @@ def test_get_report_rows_empty_result():
     """Show header and zeroed footer rows only (empty report)."""
     result = get_report_rows(measurements={})
     assert result == [
-        ("total", "name", "num", "min", "med", "p90", "p95", "p99", "max"),
-        ("0:00:00", "grand total", "0", "0:00:00", "0:00:00", "0:00:00", "0:00:00", "0:00:00", "0:00:00"),
+        (
+            "total", "name", "num", "min", "med", "p90", "p95", "p99", "max",
+            "base", "diff", "ratio", "prev", "delta", "trend", "cold", "warm",
+        ),
+        (
+            "0:00:00", "grand total", "0", "0:00:00", "0:00:00", "0:00:00", "0:00:00", "0:00:00", "0:00:00",
+            "", "", "", "", "", "", "", "",
+        ),
     ]
 
 
@@ -77,7 +87,7 @@ def test_get_report_rows_with_rows_limit(sample_measurements, expected_report_ro
 
 def test_get_report_max_widths(expected_report_rows):
     result = get_report_max_widths(expected_report_rows)
-    assert result == (14, 11, 3, 14, 14, 14, 14, 14, 14)
+    assert result == (14, 11, 3, 14, 14, 14, 14, 14, 14, 4, 4, 5, 4, 5, 5, 4, 4)
 
 
 @pytest.mark.parametrize(
@@ -147,3 +157,50 @@ def test_get_report_rows_time_format_short(sample_measurements):
         ReportRowT("0:00:00", "fixture1", "3", "0:00:00", "0:00:00", "0:00:00", "0:00:00", "0:00:00", "0:00:00"),
         ReportRowT("0:00:04", "grand total", "6", "0:00:00", "0:00:00", "0:00:01", "0:00:01", "0:00:01", "0:00:01"),
     ]
+
+
+def test_get_report_rows_with_baseline():
+    """Baseline columns are filled for known names only."""
+    result = get_report_rows(
+        measurements={"faster": [0.5], "slower": [3.0], "new": [1.0]},
+        format_seconds=format_seconds_short,
+        baseline={"faster": 1.5, "slower": 2.0},
+    )
+    assert [(row.name, row.base, row.diff, row.ratio) for row in result] == [
+        ("name", "base", "diff", "ratio"),
+        ("slower", "0:00:02", "+0:00:01", "1.50x"),
+        ("new", "", "", ""),
+        ("faster", "0:00:01", "-0:00:01", "0.33x"),
+        ("grand total", "", "", ""),
+    ]
+
+
+def test_get_report_rows_with_trends():
+    """Trend columns are filled for names with timing data of previous runs only."""
+    result = get_report_rows(
+        measurements={"faster": [0.5], "slower": [3.0], "new": [1.0]},
+        format_seconds=format_seconds_short,
+        trends={"faster": TrendT(calls=2, total=3.0, ewma=1.0), "slower": TrendT(calls=1, total=2.0, ewma=2.5)},
+    )
+    assert [(row.name, row.prev, row.delta, row.trend) for row in result] == [
+        ("name", "prev", "delta", "trend"),
+        ("slower", "0:00:02", "+0:00:01", "+20%"),
+        ("new", "", "", ""),
+        ("faster", "0:00:01", "-0:00:01", "-50%"),
+        ("grand total", "", "", ""),
+    ]
+
+
+def test_get_report_rows_with_cold():
+    """Cold columns show the total of cold samples and the median of the other samples of every name."""
+    result = get_report_rows(
+        measurements={"lazy": [3.0, 1.0, 1.0, 2.0], "warm": [1.0, 1.0]},
+        format_seconds=format_seconds_short,
+        cold={"lazy": [3.0], "once": [1.0]},
+    )
+    assert [(row.name, row.cold, row.warm) for row in result] == [
+        ("name", "cold", "warm"),
+        ("lazy", "0:00:03", "0:00:01"),
+        ("warm", "", ""),
+        ("grand total", "0:00:03", ""),
+    ]
@@ -0,0 +1,43 @@
+import pytest
+
+from pytest_durations.retries import RetryCosts, get_retry_rows
+
+
+@pytest.fixture
+def retries():
+    """A flaky test passing in its third attempt and a test failing in every attempt."""
+    retries = RetryCosts()
+    assert retries.add_retry("test_a.py::test_flaky", duration=1.0) == 2
+    assert retries.add_retry("test_a.py::test_flaky", duration=2.0) == 3
+    retries.add_retry("test_a.py::test_broken", duration=0.5)
+    retries.add_failure("test_a.py::test_broken")
+    retries.add_failure("test_a.py::test_passed")
+    return retries
+
+
+def test_retry_costs(retries):
+    """Only retried tests are tracked, the outcome is the one of their final attempt."""
+    assert list(retries.tests) == ["test_a.py::test_flaky", "test_a.py::test_broken"]
+    assert retries.tests["test_a.py::test_flaky"].cost == 3.0
+    assert retries.tests["test_a.py::test_flaky"].failed is False
+    assert retries.tests["test_a.py::test_broken"].failed is True
+
+
+def test_retry_costs_dump_load(retries):
+    data = retries.dump()
+    assert data == {"test_a.py::test_flaky": ([1.0, 2.0], False), "test_a.py::test_broken": ([0.5], True)}
+    loaded = RetryCosts()
+    loaded.load(data)
+    loaded.load({"test_a.py::test_flaky": ([4.0], True)})
+    assert loaded.tests["test_a.py::test_flaky"].durations == [1.0, 2.0, 4.0]
+    assert loaded.tests["test_a.py::test_flaky"].failed is True
+    retries.clear()
+    assert retries.dump() == {}
+
+
+@pytest.mark.parametrize(("max_rows", "expected"), [(0, 4), (1, 3)])
+def test_get_retry_rows(retries, max_rows, expected):
+    rows = get_retry_rows(retries, max_rows=max_rows, format_seconds=str)
+    assert rows[:2] == [("total", "num", "final", "name"), ("3.0", "2", "passed", "test_a.py::test_flaky")]
+    assert rows[-1] == ("3.5", "3", "", "grand total")
+    assert len(rows) == expected
@@ -0,0 +1,93 @@
+from types import SimpleNamespace
+
+import pytest
+
+from pytest_durations.scheduling import DurationScheduling
+
+COLLECTION = ["test_a", "test_b", "test_c", "test_d", "test_e", "test_f"]
+DURATIONS = {"test_a": 1.0, "test_c": 3.0, "test_e": 5.0}
+
+
+class FakeNode:
+    def __init__(self, gateway_id):
+        self.gateway = SimpleNamespace(id=gateway_id)
+        self.sent = []
+        self.shutting_down = False
+
+    def send_runtest_some(self, indices):
+        self.sent.extend(indices)
+
+    def shutdown(self):
+        self.shutting_down = True
+
+
+@pytest.fixture
+def config(pytester):
+    return pytester.parseconfig("--tx=2*popen")
+
+
+@pytest.fixture
+def nodes():
+    return [FakeNode("gw0"), FakeNode("gw1")]
+
+
+def make_scheduler(config, nodes, collections, durations=DURATIONS):
+    scheduler = DurationScheduling(config, durations=durations)
+    for node, collection in zip(nodes, collections, strict=True):
+        scheduler.add_node(node)
+        scheduler.add_node_collection(node, collection)
+    return scheduler
+
+
+def test_schedule_longest_first(config, nodes):
+    """The slowest tests go to different nodes, tests without history follow in collection order."""
+    scheduler = make_scheduler(config, nodes, [COLLECTION, COLLECTION])
+    scheduler.schedule()
+    assert nodes[0].sent == [4, 0]
+    assert nodes[1].sent == [2, 1]
+    assert scheduler.pending == [3, 5]
+
+
+def test_schedule_known_durations_queue(config, nodes):
+    """Nodes get a single test with a known duration whenever they are about to run out of tests."""
+    durations = dict.fromkeys(COLLECTION, 1.0)
+    scheduler = make_scheduler(config, nodes, [COLLECTION, COLLECTION], durations=durations)
+    scheduler.schedule()
+    assert nodes[0].sent == [0, 2]
+    scheduler.schedule()
+    assert nodes[0].sent == [0, 2]
+    scheduler.mark_test_complete(nodes[0], 0)
+    assert nodes[0].sent == [0, 2, 4]
+    nodes[1].shutting_down = True
+    scheduler.mark_test_complete(nodes[1], 1)
+    assert nodes[1].sent == [1, 3]
+    assert scheduler.pending == [5]
+
+
+@pytest.mark.parametrize("options", [(), ("--maxschedchunk", "1")])
+def test_schedule_falls_back_to_load_scheduling(pytester, nodes, options):
+    """Without history the pending tests are sent in chunks, nodes shut down once nothing is pending."""
+    config = pytester.parseconfig("--tx=2*popen", *options)
+    scheduler = make_scheduler(config, nodes, [COLLECTION, COLLECTION], durations={})
+    scheduler.schedule()
+    assert nodes[0].sent == [0, 1]
+    assert nodes[1].sent == [2, 3]
+    scheduler.mark_test_complete(nodes[0], 0)
+    scheduler.mark_test_complete(nodes[0], 1)
+    assert nodes[0].sent == [0, 1, 4, 5]
+    scheduler.mark_test_complete(nodes[1], 2)
+    assert nodes[1].shutting_down is True
+
+
+def test_schedule_empty_collection(config, nodes):
+    scheduler = make_scheduler(config, nodes, [[], []])
+    scheduler.schedule()
+    assert scheduler.collection == []
+    assert nodes[0].sent == nodes[1].sent == []
+
+
+def test_schedule_different_collections(config, nodes):
+    scheduler = make_scheduler(config, nodes, [COLLECTION, COLLECTION[:1]])
+    scheduler.schedule()
+    assert scheduler.collection is None
+    assert nodes[0].sent == nodes[1].sent == []
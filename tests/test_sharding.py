@@ -0,0 +1,52 @@
+from types import SimpleNamespace
+
+import pytest
+
+from pytest_durations.helpers import get_test_grouping_func
+from pytest_durations.sharding import select_shard, split_shards
+from pytest_durations.types import GroupBy
+
+
+def test_split_shards():
+    """The heaviest keys are spread first, every next key goes to the lightest shard."""
+    weights = {"a": 1.0, "b": 5.0, "c": 4.0, "d": 3.0, "e": 3.0}
+    assert split_shards(weights, 2) == [["b", "e"], ["c", "d", "a"]]
+
+
+def test_split_shards_more_shards_than_keys():
+    assert split_shards({"a": 1.0}, 3) == [["a"], [], []]
+
+
+@pytest.fixture
+def items():
+    nodeids = ["test_a.py::test_1", "test_a.py::test_2", "test_b.py::test_1", "test_b.py::test_2", "test_c.py::test_1"]
+    return [SimpleNamespace(nodeid=nodeid) for nodeid in nodeids]
+
+
+@pytest.mark.parametrize(
+    ("group_by", "shard", "expected"),
+    [
+        (GroupBy.NONE, (1, 2), ["test_a.py::test_1", "test_b.py::test_1"]),
+        (GroupBy.NONE, (2, 2), ["test_a.py::test_2", "test_b.py::test_2", "test_c.py::test_1"]),
+        (GroupBy.MODULE, (1, 2), ["test_a.py::test_1", "test_a.py::test_2"]),
+        (GroupBy.MODULE, (2, 2), ["test_b.py::test_1", "test_b.py::test_2", "test_c.py::test_1"]),
+    ],
+)
+def test_select_shard(items, group_by, shard, expected):
+    """Unknown tests are predicted to take the mean duration, grouped tests stay together."""
+    durations = {"test_a.py::test_1": 6.0, "test_a.py::test_2": 1.0, "test_b.py::test_1": 2.0, "test_c.py::test_1": 3.0}
+    selected, deselected = select_shard(
+        items,
+        shard=shard,
+        durations=durations,
+        grouping_func=get_test_grouping_func(group_by=group_by),
+    )
+    assert [item.nodeid for item in selected] == expected
+    assert len(selected) + len(deselected) == len(items)
+
+
+def test_select_shard_without_history(items):
+    """Without any recorded durations the shards get the same number of tests."""
+    grouping_func = get_test_grouping_func(group_by=GroupBy.NONE)
+    selected, _ = select_shard(items, shard=(3, 3), durations={}, grouping_func=grouping_func)
+    assert [item.nodeid for item in selected] == ["test_b.py::test_1"]
@@ -0,0 +1,47 @@
+from pytest_durations.spool import MeasurementSpool, load_spool
+from pytest_durations.types import Category
+
+
+def test_spool_roundtrip(tmp_path):
+    """Only flushed samples reach the file, truncated samples are forgotten."""
+    filename = str(tmp_path / "gw0.jsonl")
+    spool = MeasurementSpool(filename)
+    spool.write(Category.TEST_CALL, "test_foo", 1.0)
+    spool.flush()
+    spool.truncate()
+    spool.write(Category.TEST_CALL, "test_bar", 2.0)
+    spool.write(Category.FIXTURE_SETUP, "fixture", 0.5)
+    spool.flush()
+    spool.write(Category.TEST_CALL, "test_baz", 3.0)
+    assert list(load_spool(filename)) == [
+        (Category.TEST_CALL, "test_bar", 2.0),
+        (Category.FIXTURE_SETUP, "fixture", 0.5),
+    ]
+    spool.close()
+    assert not spool.path.exists()
+
+
+def test_load_spool_partial_line(tmp_path):
+    path = tmp_path / "gw0.jsonl"
+    path.write_text('["test call", "test_foo", 1.0]\n["test call", "test_b')
+    assert list(load_spool(str(path))) == [(Category.TEST_CALL, "test_foo", 1.0)]
+
+
+def test_load_spool_missing(tmp_path):
+    assert list(load_spool(str(tmp_path / "gw0.jsonl"))) == []
+
+
+def test_spool_discard(tmp_path):
+    """Only the latest buffered sample is discarded, samples written to the file are kept."""
+    filename = str(tmp_path / "gw0.jsonl")
+    spool = MeasurementSpool(filename)
+    spool.write(Category.TEST_CALL, "test_foo", 1.0)
+    spool.flush()
+    spool.discard(Category.TEST_CALL, "test_foo", 1.0)
+    spool.write(Category.TEST_CALL, "test_bar", 2.0)
+    spool.write(Category.TEST_CALL, "test_baz", 3.0)
+    spool.discard(Category.TEST_CALL, "test_bar", 2.0)
+    spool.discard(Category.TEST_CALL, "test_baz", 3.0)
+    spool.flush()
+    assert list(load_spool(filename)) == [(Category.TEST_CALL, "test_foo", 1.0), (Category.TEST_CALL, "test_bar", 2.0)]
+    spool.close()
@@ -0,0 +1,36 @@
+import pytest
+
+from pytest_durations.timeline import SessionTimeline
+
+
+@pytest.fixture
+def timeline():
+    timeline = SessionTimeline(started=10.0)
+    timeline.session_started = 12.0
+    timeline.collection_started = 13.0
+    timeline.collection_finished = 16.0
+    timeline.loop_started = 16.5
+    timeline.tests = 20.0
+    timeline.loop_finished = 40.0
+    return timeline
+
+
+def test_get_phases(timeline):
+    """Time not covered by any phase is reported as gaps, so phases add up to the session time."""
+    phases = timeline.get_phases(now=41.0)
+    assert phases == {"startup": 2.0, "collection": 3.0, "tests": 20.0, "finish": 1.0, "gaps": 5.0}
+    assert sum(phases.values()) == 31.0
+
+
+def test_get_phases_distributed(timeline):
+    """Tests of pytest-xdist workers fill the whole test loop of the controller."""
+    assert timeline.get_phases(now=41.0, distributed=True)["tests"] == 23.5
+
+
+def test_get_phases_interrupted():
+    """Phases which have not run are skipped, the finish phase starts at the end of the latest one."""
+    timeline = SessionTimeline(started=10.0)
+    assert timeline.get_phases(now=11.0) == {"finish": 1.0, "gaps": 0.0}
+    timeline.session_started = 12.0
+    timeline.collection_started = 13.0
+    assert timeline.get_phases(now=14.0) == {"startup": 2.0, "finish": 2.0, "gaps": 0.0}
@@ -0,0 +1,74 @@
+import pytest
+
+from pytest_durations.helpers import get_test_grouping_func
+from pytest_durations.trends import (
+    TRENDS_VERSION,
+    KeyTrends,
+    TrendT,
+    get_grouped_trends,
+    load_trends,
+    save_trends,
+    update_trends,
+)
+from pytest_durations.types import Category, GroupBy
+
+
+@pytest.fixture
+def trends():
+    return {
+        Category.TEST_CALL: KeyTrends(
+            keys=["test_a.py::test_1", "test_a.py::test_2"],
+            calls=[1, 2],
+            totals=[1.0, 3.0],
+            ewmas=[2.0, 1.0],
+        ),
+    }
+
+
+def test_update_trends(trends):
+    """Measured keys replace the latest run data and move their averages, other keys are kept."""
+    measurements = {
+        Category.TEST_CALL: {"test_a.py::test_2": [2.0, 4.0], "test_b.py::test_1": [0.5], "test_b.py::test_2": []},
+        Category.TEST_SETUP: {"test_a.py::test_1": [0.1]},
+    }
+    update_trends(trends, measurements, alpha=0.5)
+    assert dict(trends[Category.TEST_CALL].items()) == {
+        "test_a.py::test_1": TrendT(calls=1, total=1.0, ewma=2.0),
+        "test_a.py::test_2": TrendT(calls=2, total=6.0, ewma=2.0),
+        "test_b.py::test_1": TrendT(calls=1, total=0.5, ewma=0.5),
+    }
+    assert dict(trends[Category.TEST_SETUP].items()) == {"test_a.py::test_1": TrendT(calls=1, total=0.1, ewma=0.1)}
+
+
+def test_trends_roundtrip(tmp_path, trends):
+    path = tmp_path / "trends.json"
+    save_trends(path, trends)
+    loaded = load_trends(path)
+    assert dict(loaded[Category.TEST_CALL].items()) == dict(trends[Category.TEST_CALL].items())
+    assert loaded[Category.TEST_CALL].index == {"test_a.py::test_1": 0, "test_a.py::test_2": 1}
+    assert list(load_trends(path, categories=(Category.TEST_CALL,))) == [Category.TEST_CALL]
+
+
+@pytest.mark.parametrize("content", [None, "{", f'{{"version": {TRENDS_VERSION + 1}, "categories": {{}}}}'])
+def test_load_trends_invalid(tmp_path, content):
+    """Missing, corrupted and incompatible files are ignored."""
+    path = tmp_path / "trends.json"
+    if content is not None:
+        path.write_text(content)
+    assert load_trends(path) == {}
+
+
+def test_get_grouped_trends(trends):
+    """Moving averages of a group are weighted by the number of calls."""
+    grouping_func = get_test_grouping_func(group_by=GroupBy.MODULE)
+    grouped = get_grouped_trends(trends[Category.TEST_CALL], grouping_func=grouping_func)
+    assert grouped == {"test_a.py": TrendT(calls=3, total=4.0, ewma=pytest.approx(4 / 3))}
+    assert grouped["test_a.py"].mean == pytest.approx(4 / 3)
+
+
+def test_trend_mean_without_calls():
+    assert TrendT(calls=0, total=0.0, ewma=0.0).mean == 0.0
+
+
+def test_get_ewmas(trends):
+    assert trends[Category.TEST_CALL].get_ewmas() == {"test_a.py::test_1": 2.0, "test_a.py::test_2": 1.0}
@@ -0,0 +1,45 @@
+"""Tests for xdist worker utilization."""
+import pytest
+
+from pytest_durations.reporting import format_seconds_short
+from pytest_durations.utilization import UtilizationT, WorkerStats, get_utilization, get_utilization_rows
+
+
+@pytest.fixture
+def workers():
+    busy = WorkerStats()
+    busy.add_report("test_a", 1.0)
+    busy.add_report("test_a", 2.0)
+    busy.add_report("test_b", 3.0)
+    busy.elapsed = 8.0
+    lazy = WorkerStats()
+    lazy.add_report("test_c", 2.0)
+    lazy.elapsed = 1.0
+    lazy.crashed = True
+    return {"gw1": lazy, "gw0": busy, "gw2": WorkerStats()}
+
+
+def test_worker_stats(workers):
+    assert workers["gw0"].tests == {"test_a": 3.0, "test_b": 3.0}
+    assert workers["gw0"].busy == 6.0
+    assert workers["gw0"].idle == 2.0
+    assert workers["gw1"].idle == 0.0
+
+
+def test_get_utilization(workers):
+    utilization = get_utilization(workers)
+    assert utilization == UtilizationT(critical="gw0", makespan=6.0, average=pytest.approx(8 / 3))
+    assert utilization.ratio == pytest.approx(2.25)
+
+
+def test_utilization_ratio_idle_workers():
+    assert get_utilization({"gw0": WorkerStats()}).ratio == 1.0
+
+
+def test_get_utilization_rows(workers):
+    assert get_utilization_rows(workers, format_seconds=format_seconds_short) == [
+        ("worker", "tests", "busy", "idle", "elapsed", "util"),
+        ("gw0", "2", "0:00:06", "0:00:02", "0:00:08", "75%"),
+        ("gw1 (crashed)", "1", "0:00:02", "0:00:00", "0:00:01", "200%"),
+        ("gw2", "0", "0:00:00", "0:00:00", "0:00:00", "-"),
+    ]
@@ -1,10 +1,25 @@
+from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import Mock, create_autospec
 
 import pytest
 import xdist.workermanage
+from _pytest.reports import TestReport
 
+from pytest_durations.budgets import BudgetViolationT
+from pytest_durations.cold import ColdSamples
+from pytest_durations.hooks import HookTimer
+from pytest_durations.openmetrics import DurationHistograms
+from pytest_durations.rebuilds import FixtureRebuilds
+from pytest_durations.retries import RetryCosts
+from pytest_durations.spool import MeasurementSpool, load_spool
 from pytest_durations.types import Category
-from pytest_durations.xdist import PytestDurationXdistMixin, dump_measurements
+from pytest_durations.xdist import (
+    PytestDurationXdistMixin,
+    dump_measurements,
+    load_measurements,
+    merge_measurements,
+)
 
 
 @pytest.fixture
@@ -17,10 +32,26 @@ def fake_node():
     return create_autospec(xdist.workermanage.WorkerController, instance=True)
 
 
+@pytest.fixture(autouse=True)
+def ticks(monkeypatch):
+    monkeypatch.setattr("pytest_durations.xdist.get_current_ticks", lambda: 10.0)
+
+
 @pytest.fixture
 def instance(measurements):
     instance = PytestDurationXdistMixin()
+    instance.worker_id = "gw0"
     instance.measurements = {Category.TEST_CALL: {}}
+    instance.histograms = None
+    instance.workers = {}
+    instance.spool = None
+    instance.budget_violations = []
+    instance.hooks = None
+    instance.rebuilds = FixtureRebuilds()
+    instance.marker_tags = {}
+    instance.retries = RetryCosts()
+    instance.outcomes = {}
+    instance.cold = None
     return instance
 
 
@@ -31,7 +62,17 @@ def measurements():
 
 @pytest.fixture
 def workeroutput(measurements):
-    return {"pytest_durations": dump_measurements(measurements)}
+    return {
+        "pytest_durations": {
+            "worker": ("gw0", 10.0),
+            "measurements": dump_measurements(measurements),
+            "budget_violations": [],
+            "rebuilds": {},
+            "marker_tags": {},
+            "retries": {},
+            "outcomes": {},
+        },
+    }
 
 
 def test_pytest_sessionfinish(fake_session, instance, measurements, workeroutput):
@@ -50,8 +91,251 @@ def test_pytest_testnodedown(fake_node, instance, measurements, workeroutput):
     fake_node.workeroutput = workeroutput
     instance.pytest_testnodedown(fake_node, None)
     assert instance.measurements == measurements
+    assert instance.workers["gw0"].elapsed == 10.0
 
 
 def test_pytest_testnodedown_noxdist(fake_node, instance, measurements):
     instance.pytest_testnodedown(fake_node, None)
     assert instance.measurements == {Category.TEST_CALL: {}}
+
+
+def test_pytest_histograms_roundtrip(fake_session, fake_node, instance):
+    """Worker histograms are sent along with measurements and merged on the controller."""
+    worker_histograms = DurationHistograms(buckets=(0.1, 1.0))
+    worker_histograms.observe(Category.TEST_CALL, "test_foo", 0.5)
+    instance.histograms = worker_histograms
+    fake_session.config.workeroutput = {}
+    instance.pytest_sessionfinish(fake_session, 0)
+
+    instance.histograms = DurationHistograms(buckets=(0.1, 1.0))
+    fake_node.workeroutput = fake_session.config.workeroutput
+    instance.pytest_testnodedown(fake_node, None)
+    instance.pytest_testnodedown(fake_node, None)
+    assert instance.histograms.counts == {Category.TEST_CALL: {"test_foo": [0, 2, 0]}}
+    assert instance.histograms.sums == {Category.TEST_CALL: {"test_foo": 1.0}}
+
+
+def test_pytest_hooks_roundtrip(fake_session, fake_node, instance):
+    """Worker hook counters are sent along with measurements and added up on the controller."""
+    instance.hooks = HookTimer()
+    instance.hooks.load([("runner", "pytest_runtest_setup", 2, 0.5)])
+    fake_session.config.workeroutput = {}
+    instance.pytest_sessionfinish(fake_session, 0)
+    assert instance.hooks.calls == {}
+
+    fake_node.workeroutput = fake_session.config.workeroutput
+    instance.pytest_testnodedown(fake_node, None)
+    instance.pytest_testnodedown(fake_node, None)
+    assert instance.hooks.dump() == [("runner", "pytest_runtest_setup", 4, 1.0)]
+
+
+def test_pytest_cold_roundtrip(fake_session, fake_node, instance):
+    """Worker cold samples are sent along with measurements and added up on the controller."""
+    instance.cold = ColdSamples(limit=1)
+    instance.cold.add(Category.TEST_CALL, "test_a.py::test_foo", 2.0)
+    instance.cold.add_test("test_a.py::test_foo", 3.0)
+    fake_session.config.workeroutput = {}
+    instance.pytest_sessionfinish(fake_session, 0)
+    assert instance.cold.samples == {}
+
+    fake_node.workeroutput = fake_session.config.workeroutput
+    instance.pytest_testnodedown(fake_node, None)
+    assert instance.cold.samples == {Category.TEST_CALL: {"test_a.py::test_foo": [2.0]}}
+    assert instance.cold.modules == {"test_a.py": ([3.0], [])}
+
+
+@pytest.mark.parametrize(("workerinput", "expected"), [({"workerid": "gw1"}, True), (None, False)])
+def test_pytest_configure(instance, workerinput, expected):
+    config = SimpleNamespace(getoption={"--pytest-durations-xdist-flush": 2.0}.get)
+    if workerinput is not None:
+        config.workerinput = workerinput
+    instance.pytest_configure(config)
+    assert instance.xdist_worker is expected
+    assert instance.worker_id == ("gw1" if expected else "gw0")
+    assert instance.flush_interval == 2.0
+    assert instance.started == instance.last_flush == 10.0
+    assert instance.spool is None
+
+
+def test_pytest_configure_spool(instance, tmp_path):
+    """Workers open their spool file in the directory passed by the controller."""
+    workerinput = {"workerid": "gw1", "pytest_durations_spool": str(tmp_path)}
+    config = SimpleNamespace(getoption={"--pytest-durations-xdist-flush": 2.0}.get, workerinput=workerinput)
+    instance.pytest_configure(config)
+    assert instance.spool.path == tmp_path / "gw1.jsonl"
+    instance.spool.close()
+
+
+def test_pytest_configure_spool_unavailable(instance, tmp_path):
+    """Remote workers which cannot reach the spool directory of the controller skip spooling."""
+    workerinput = {"workerid": "gw1", "pytest_durations_spool": str(tmp_path / "missing")}
+    config = SimpleNamespace(getoption={"--pytest-durations-xdist-flush": 2.0}.get, workerinput=workerinput)
+    instance.pytest_configure(config)
+    assert instance.spool is None
+
+
+def test_pytest_configure_node(instance, fake_node):
+    """All workers share a spool directory, which is removed at exit."""
+    fake_node.workerinput = {}
+    fake_node.config = SimpleNamespace(getoption={"--pytest-durations-xdist-spool": True}.get)
+    instance.pytest_configure_node(fake_node)
+    spool_dir = fake_node.workerinput["pytest_durations_spool"]
+    instance.pytest_configure_node(fake_node)
+    assert fake_node.workerinput["pytest_durations_spool"] == instance.spool_dir == spool_dir
+    instance.pytest_unconfigure(None)
+    assert not Path(spool_dir).exists()
+
+
+def test_pytest_configure_node_without_spool(instance, fake_node):
+    """Spooling is off by default."""
+    fake_node.workerinput = {}
+    fake_node.config = SimpleNamespace(getoption={"--pytest-durations-xdist-spool": False}.get)
+    instance.pytest_configure_node(fake_node)
+    assert fake_node.workerinput == {}
+    assert instance.spool_dir is None
+
+
+def test_pytest_unconfigure_without_spool(instance):
+    instance.pytest_unconfigure(None)
+    assert instance.spool_dir is None
+
+
+def test_pytest_testnodedown_crashed(fake_node, instance, tmp_path):
+    """Samples spooled by a crashed worker are recovered and the worker is marked as crashed."""
+    spool = MeasurementSpool(str(tmp_path / "gw1.jsonl"))
+    spool.write(Category.TEST_CALL, "test_foo", 0.5)
+    spool.flush()
+    instance.spool_dir = str(tmp_path)
+    instance.histograms = DurationHistograms(buckets=(1.0,))
+    fake_node.workerinput = {"workerid": "gw1"}
+    instance.pytest_testnodedown(fake_node, "crashed")
+    assert instance.measurements == {Category.TEST_CALL: {"test_foo": [0.5]}}
+    assert instance.histograms.counts == {Category.TEST_CALL: {"test_foo": [1, 0]}}
+    assert instance.workers["gw1"].crashed is True
+    spool.close()
+
+
+@pytest.fixture
+def report():
+    return create_autospec(TestReport, instance=True, when="teardown", outcome="passed")
+
+
+def test_pytest_runtest_logreport_worker_flush(instance, measurements, report):
+    """Worker moves measurements into a teardown report once the flush interval has passed."""
+    instance.xdist_worker = True
+    instance.flush_interval = 1.0
+    instance.measurements = measurements
+    instance.budget_violations = [BudgetViolationT(Category.TEST_CALL, "test_foo", 1.0, 0.5)]
+    instance.rebuilds.add_setup("db", scope_id="test_a.py", param_index=0, test_id="test_foo", duration=1.0)
+    instance.marker_tags = {"test_foo": "slow"}
+    instance.retries.add_retry("test_foo", duration=2.0)
+    instance.outcomes = {"test_foo": "failed"}
+    instance.pytest_runtest_logreport(report)
+    assert report.pytest_durations == {
+        "worker": ("gw0", 10.0),
+        "measurements": dump_measurements(measurements),
+        "budget_violations": [(Category.TEST_CALL, "test_foo", 1.0, 0.5)],
+        "rebuilds": {"db": (1, 1.0, [("test_a.py", 0)], [])},
+        "marker_tags": {"test_foo": "slow"},
+        "retries": {"test_foo": ([2.0], False)},
+        "outcomes": {"test_foo": "failed"},
+    }
+    assert instance.outcomes == {}
+    assert instance.measurements == {Category.TEST_CALL: {}}
+    assert instance.retries.tests == {}
+    assert instance.marker_tags == {}
+    assert instance.budget_violations == []
+    assert instance.rebuilds.dump() == {}
+    assert instance.rebuilds.fixtures["db"].scopes == {"test_a.py"}
+    assert instance.last_flush == 10.0
+
+
+@pytest.mark.parametrize(
+    ("last_flush", "spooled"),
+    [(0.0, []), (float("inf"), [(Category.TEST_CALL, "test_foo", 1.0)])],
+)
+def test_pytest_runtest_logreport_worker_spool(instance, report, tmp_path, last_flush, spooled):
+    """Worker spool is written after every test and truncated once its samples are sent."""
+    instance.xdist_worker = True
+    instance.last_flush = last_flush
+    instance.spool = MeasurementSpool(str(tmp_path / "gw0.jsonl"))
+    instance.spool.write(Category.TEST_CALL, "test_foo", 1.0)
+    instance.pytest_runtest_logreport(report)
+    assert list(load_spool(str(tmp_path / "gw0.jsonl"))) == spooled
+    instance.pytest_sessionfinish(SimpleNamespace(config=SimpleNamespace()), 0)
+    assert not (tmp_path / "gw0.jsonl").exists()
+
+
+@pytest.mark.parametrize(
+    ("when", "outcome", "last_flush"),
+    [("call", "passed", 0.0), ("teardown", "passed", float("inf")), ("teardown", "rerun", 0.0)],
+)
+def test_pytest_runtest_logreport_worker_no_flush(instance, report, when, outcome, last_flush):
+    """Worker keeps measurements on other reports, on reports of retried attempts or within the flush interval."""
+    instance.xdist_worker = True
+    measurements = instance.measurements
+    instance.last_flush = last_flush
+    report.when = when
+    report.outcome = outcome
+    instance.pytest_runtest_logreport(report)
+    assert "pytest_durations" not in vars(report)
+    assert instance.measurements is measurements
+
+
+def test_pytest_runtest_logreport_controller(instance, measurements, report):
+    """Controller merges and drops payloads of worker reports and accounts their durations per worker."""
+    report.pytest_durations = {
+        "worker": ("gw1", 5.0),
+        "measurements": dump_measurements(measurements),
+        "budget_violations": [(Category.TEST_CALL, "test_foo", 1.0, 0.5)],
+        "rebuilds": {"db": (1, 1.0, [("test_a.py", 0)], [])},
+        "marker_tags": {"test_foo": "slow"},
+        "retries": {"test_foo": ([2.0], True)},
+        "outcomes": {"test_foo": "failed"},
+    }
+    report.worker_id = "gw1"
+    report.nodeid = "test_foo"
+    report.duration = 1.5
+    instance.pytest_runtest_logreport(report)
+    instance.pytest_runtest_logreport(report)
+    assert instance.measurements == measurements
+    assert "pytest_durations" not in vars(report)
+    assert instance.workers["gw1"].tests == {"test_foo": 3.0}
+    assert instance.workers["gw1"].elapsed == 5.0
+    assert instance.budget_violations == [BudgetViolationT(Category.TEST_CALL, "test_foo", 1.0, 0.5)]
+    assert instance.rebuilds.fixtures["db"].instances == {("gw1", "test_a.py", 0)}
+    assert instance.marker_tags == {"test_foo": "slow"}
+    assert instance.retries.tests["test_foo"].durations == [2.0]
+    assert instance.outcomes == {"test_foo": "failed"}
+
+
+def test_dump_measurements():
+    """Every category is encoded as a key table, sample counts and packed samples."""
+    keys, counts, data = dump_measurements({Category.TEST_CALL: {"test_foo": [1.0, 2.0], "test_bar": []}})[
+        Category.TEST_CALL
+    ]
+    assert keys == ["test_foo", "test_bar"]
+    assert counts == [2, 0]
+    assert len(data) == 16
+
+
+def test_load_measurements():
+    destination = {Category.TEST_CALL: {"test_foo": [0.5]}, Category.TEST_SETUP: {}}
+    source = {Category.TEST_CALL: {"test_foo": [1.0, 2.0], "test_bar": [3.0], "test_baz": []}}
+    load_measurements(dump_measurements(source), destination)
+    assert destination == {
+        Category.TEST_CALL: {"test_foo": [0.5, 1.0, 2.0], "test_bar": [3.0], "test_baz": []},
+        Category.TEST_SETUP: {},
+    }
+
+
+def test_merge_measurements():
+    destination = {Category.TEST_CALL: {"test_foo": [0.5]}}
+    merge_measurements(
+        {Category.TEST_CALL: {"test_foo": [1.0], "test_bar": [3.0]}, Category.PARAM: {"x=1": [1.0]}},
+        destination,
+    )
+    assert destination == {
+        Category.TEST_CALL: {"test_foo": [0.5, 1.0], "test_bar": [3.0]},
+        Category.PARAM: {"x=1": [1.0]},
+    }